@@ -1,6 +1,11 @@
+import os
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
+# Runtime state (caches) lives under backend/data, whatever the working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
 
 class Settings(BaseSettings):
     # Core
@@ -13,6 +18,66 @@ class Settings(BaseSettings):
 
     # ✅ FIX: Explicitly define XAI_MODEL
     XAI_MODEL: str | None = Field(default="grok-beta", env="XAI_MODEL")
+    # Grok endpoint (base URL can point at loadtest/fake_grok.py)
+    XAI_BASE_URL: str = Field(default="https://api.x.ai", env="XAI_BASE_URL")
+
+    # Gemini endpoint and quota (base URL can point at loadtest/fake_gemini.py)
+    GEMINI_BASE_URL: str = Field(default="https://generativelanguage.googleapis.com", env="GEMINI_BASE_URL")
+    GEMINI_MODEL: str = Field(default="gemini-2.0-flash-lite-preview-02-05", env="GEMINI_MODEL")
+    GEMINI_RPM: float = Field(default=30, env="GEMINI_RPM")
+    GEMINI_BURST: int = Field(default=5, env="GEMINI_BURST")
+    GEMINI_MAX_RETRIES: int = Field(default=3, env="GEMINI_MAX_RETRIES")
+
+    # Circuit breakers for Gemini/Grok outages
+    BREAKER_FAILURE_THRESHOLD: int = Field(default=5, env="BREAKER_FAILURE_THRESHOLD")
+    BREAKER_RECOVERY_SECONDS: float = Field(default=30, env="BREAKER_RECOVERY_SECONDS")
+
+    # Uploads
+    MAX_UPLOAD_BYTES: int = Field(default=10 * 1024 * 1024, env="MAX_UPLOAD_BYTES")
+
+    # Upload storage: "local" disk behind /uploads, or an S3-compatible bucket
+    STORAGE_BACKEND: str = Field(default="local", env="STORAGE_BACKEND")
+    S3_BUCKET: str = Field(default="fashion-companion", env="S3_BUCKET")
+    S3_ENDPOINT_URL: str | None = Field(default=None, env="S3_ENDPOINT_URL")  # MinIO / loadtest/fake_s3.py
+    S3_REGION: str = Field(default="us-east-1", env="S3_REGION")
+    S3_ACCESS_KEY_ID: str | None = Field(default=None, env="S3_ACCESS_KEY_ID")
+    S3_SECRET_ACCESS_KEY: str | None = Field(default=None, env="S3_SECRET_ACCESS_KEY")
+    S3_PUBLIC_BASE_URL: str | None = Field(default=None, env="S3_PUBLIC_BASE_URL")  # CDN/public bucket; else presigned
+    S3_PRESIGN_SECONDS: int = Field(default=3600, env="S3_PRESIGN_SECONDS")
+
+    # Upload garbage collection (deferred deletes, orphans, expired analysis photos)
+    UPLOAD_GC_ENABLED: bool = Field(default=True, env="UPLOAD_GC_ENABLED")
+    UPLOAD_GC_INTERVAL_SECONDS: int = Field(default=3600, env="UPLOAD_GC_INTERVAL_SECONDS")
+    UPLOAD_GC_DRAIN_SECONDS: float = Field(default=10, env="UPLOAD_GC_DRAIN_SECONDS")
+    UPLOAD_GC_GRACE_SECONDS: int = Field(default=3600, env="UPLOAD_GC_GRACE_SECONDS")
+    ANALYSIS_PHOTO_TTL_HOURS: float = Field(default=24, env="ANALYSIS_PHOTO_TTL_HOURS")
+
+    # Local CPU category classifier (weights from train_local_classifier.py)
+    LOCAL_CLASSIFIER_PATH: str = Field(default=os.path.join(DATA_DIR, "local_classifier.json"), env="LOCAL_CLASSIFIER_PATH")
+    LOCAL_CLASSIFIER_THRESHOLD: float = Field(default=0.85, env="LOCAL_CLASSIFIER_THRESHOLD")
+
+    # Outfit generation: "local" solver (Gemini optional for explanations) or "gemini" item selection
+    OUTFIT_ENGINE: str = Field(default="local", env="OUTFIT_ENGINE")
+    OUTFIT_AI_EXPLANATIONS: bool = Field(default=True, env="OUTFIT_AI_EXPLANATIONS")
+
+    # LLM response cache (SQLite-backed)
+    RESPONSE_CACHE_PATH: str = Field(default=os.path.join(DATA_DIR, "response_cache.db"), env="RESPONSE_CACHE_PATH")
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=24 * 3600, env="RESPONSE_CACHE_TTL_SECONDS")
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=5000, env="RESPONSE_CACHE_MAX_ENTRIES")
+
+    # Request/stage timing and the Prometheus /metrics endpoint
+    METRICS_ENABLED: bool = Field(default=True, env="METRICS_ENABLED")
+    METRICS_SLOW_REQUEST_MS: float = Field(default=1000, env="METRICS_SLOW_REQUEST_MS")
+
+    # Opt-in request profiling (X-Profile: 1 from an admin; see services/profiler.py)
+    ADMIN_EMAILS: str = Field(default="", env="ADMIN_EMAILS")  # comma-separated
+    PROFILE_DIR: str = Field(default=os.path.join(DATA_DIR, "profiles"), env="PROFILE_DIR")
+    PROFILE_KEEP: int = Field(default=50, env="PROFILE_KEEP")
+    PROFILE_INTERVAL_SECONDS: float = Field(default=0.001, env="PROFILE_INTERVAL_SECONDS")
+
+    # ETag/304 for per-user reads (services/http_cache.py); bump the epoch to drop all cached copies
+    HTTP_CACHE_ENABLED: bool = Field(default=True, env="HTTP_CACHE_ENABLED")
+    HTTP_CACHE_EPOCH: str = Field(default="1", env="HTTP_CACHE_EPOCH")
 
     # Auth
     ALGORITHM: str = "HS256"
@@ -1,14 +1,34 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from .database import engine, Base
-from .routers import auth, profile, wardrobe, stylist_chat, outfits
+from .routers import auth, profile, wardrobe, stylist_chat, outfits, admin
+from .services.upload_gc import upload_gc
+from .services.storage import storage
+from .services import metrics
+from .services.profiler import ProfilerMiddleware
+from .services.http_cache import HttpCacheMiddleware
+from .services.response_cache import response_cache
+from .services.api_scheduler import gemini_scheduler
+from .services.circuit_breaker import gemini_breaker, grok_breaker
+from .config import settings
+from contextlib import asynccontextmanager
+import asyncio
 import os
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Fashion Companion Local API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background upload GC: deferred deletes, orphans, expired analysis photos
+    gc_task = asyncio.create_task(upload_gc.run_forever()) if settings.UPLOAD_GC_ENABLED else None
+    yield
+    if gc_task:
+        gc_task.cancel()
+
+app = FastAPI(title="Fashion Companion Local API", lifespan=lifespan)
 
 # CORS
 origins = [
@@ -24,9 +44,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount uploads
-os.makedirs("uploads/wardrobe", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# ETag/304 for per-user reads, version bumps on writes
+if settings.HTTP_CACHE_ENABLED:
+    app.add_middleware(HttpCacheMiddleware, user_email=auth.email_from_authorization)
+
+# Request timing by route and stage (Prometheus /metrics)
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.register_stats("response_cache", response_cache.stats)
+    metrics.register_stats("gemini_scheduler", gemini_scheduler.stats, nested={"lanes": "lane"})
+    metrics.register_stats("breaker", lambda: {"gemini": gemini_breaker.stats(), "grok": grok_breaker.stats()}, label="provider")
+    metrics.register_stats("upload_gc", lambda: upload_gc.last_report or {})
+
+# Opt-in profiling of single requests (admins only, X-Profile: 1)
+app.add_middleware(ProfilerMiddleware, is_admin=auth.is_admin_authorization)
+
+# Mount uploads (sharded, content-addressed layout from services/storage.py)
+os.makedirs(storage.root, exist_ok=True)
+app.mount(storage.url_prefix, StaticFiles(directory=storage.root), name="uploads")
 
 # Include Routers
 app.include_router(auth.router)
@@ -34,7 +69,14 @@ app.include_router(profile.router)
 app.include_router(wardrobe.router)
 app.include_router(stylist_chat.router)
 app.include_router(outfits.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def read_root():
     return {"message": "Fashion Companion Local API Running"}
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
@@ -55,6 +55,35 @@ class UserStyleAnalysis(Base):
     
     user = relationship("User", back_populates="style_analysis")
 
+class StyleAnalysisSnapshot(Base):
+    """
+    Complete, versioned analysis results (services/analysis_snapshots.py).
+    Each analysis adds a row; GET /profile/analysis serves the latest row's
+    precomputed response as-is.
+    """
+    __tablename__ = "style_analysis_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    version = Column(Integer, default=1) # Per-user, increments with each analysis
+    format_version = Column(Integer, default=1) # Layout of response_json (rebuilt from result when stale)
+    result = Column(Text) # Full analyze_user_style() output as JSON
+    response_json = Column(Text) # Serialized AnalysisResponse payload
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_style_analysis_snapshots_user_version", "user_id", "version"),)
+
+class ResourceVersion(Base):
+    """Per-user change counters behind the read endpoints' ETags (services/http_cache.py)."""
+    __tablename__ = "resource_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    resource = Column(String) # profile, analysis, wardrobe
+    version = Column(Integer, default=0)
+
+    __table_args__ = (UniqueConstraint("user_id", "resource", name="uq_resource_versions_user_resource"),)
+
 class WardrobeItem(Base):
     __tablename__ = "wardrobe_items"
 
@@ -85,6 +114,9 @@ class WardrobeItem(Base):
     ai_metadata = Column(Text, nullable=True) # Validated JSON from Vision AI
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Pre-serialized WardrobeItemResponse minus image_url (services/item_json.py)
+    response_json = Column(Text, nullable=True)
+    
     user = relationship("User", back_populates="wardrobe_items")
 
 class Conversation(Base):
@@ -95,6 +127,10 @@ class Conversation(Base):
     title = Column(String, default="New Chat")
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Rolling summary of turns that no longer fit the prompt budget
+    summary = Column(Text, nullable=True)
+    summarized_upto_id = Column(Integer, default=0) # Last ChatMessage.id folded into summary
+    
     user = relationship("User", back_populates="conversations")
     messages = relationship("ChatMessage", back_populates="conversation")
 
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from .. import models
+from .auth import get_admin_user
+from ..services.profiler import profile_store
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+MEDIA_TYPES = {".html": "text/html", ".txt": "text/plain"}
+
+@router.get("/profiles")
+def list_profiles(limit: int = 50, admin: models.User = Depends(get_admin_user)):
+    """
+    Recent request profiles, newest first. Profile a request by sending it
+    with `X-Profile: 1` (and optionally `X-Request-ID`) as an admin.
+    """
+    return profile_store.recent(max(1, min(limit, 500)))
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, admin: models.User = Depends(get_admin_user)):
+    path = profile_store.artifact(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    extension = path[path.rfind("."):]
+    return FileResponse(path, media_type=MEDIA_TYPES.get(extension, "application/octet-stream"))
@@ -6,7 +6,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from .. import models, schemas, database, config
-from ..services import style_analysis
+from ..services import style_analysis, analysis_snapshots
 import json
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -48,6 +48,31 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise credentials_exception
     return user
 
+def email_from_token(token: str) -> Optional[str]:
+    try:
+        payload = jwt.decode(token, config.settings.SECRET_KEY, algorithms=[config.settings.ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+def is_admin_email(email: Optional[str]) -> bool:
+    admins = {e.strip().lower() for e in config.settings.ADMIN_EMAILS.split(",") if e.strip()}
+    return bool(email) and email.lower() in admins
+
+def email_from_authorization(authorization: Optional[str]) -> Optional[str]:
+    """For middleware: the email in a raw `Authorization: Bearer ...` header (no DB hit)."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    return email_from_token(authorization[len("bearer "):].strip())
+
+def is_admin_authorization(authorization: Optional[str]) -> bool:
+    return is_admin_email(email_from_authorization(authorization))
+
+def get_admin_user(current_user: models.User = Depends(get_current_user)):
+    if not is_admin_email(current_user.email):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
 @router.post("/register", response_model=schemas.UserResponse)
 def register(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     db_user = db.query(models.User).filter(models.User.email == user.email).first()
@@ -94,6 +119,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
         face_shape=analysis_data["face_shape"]
     )
     db.add(new_analysis)
+    analysis_snapshots.save(db, new_user.id, analysis_data)
     
     db.commit()
     return new_user
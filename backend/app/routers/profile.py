@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from sqlalchemy.orm import Session
 from .. import models, schemas, database
 from .auth import get_current_user
-from ..services import style_analysis
+from ..services import style_analysis, wardrobe_logic, analysis_snapshots, item_json
+from ..services.palette_index import palette_index
+from ..services.upload_writer import UploadRejected
+from ..services.photo_gate import PhotoRejected
+from ..services.storage import storage
 import json
-import shutil
-import os
-import uuid
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
-UPLOAD_DIR = "uploads/wardrobe" # Reusing wardrobe upload dir for simplicity, ideal to separate
-
 @router.get("/", response_model=schemas.ProfileResponse)
 def get_profile(current_user: models.User = Depends(get_current_user)):
     if not current_user.profile:
@@ -34,55 +33,31 @@ def update_profile(profile_update: schemas.ProfileUpdate, db: Session = Depends(
     db.refresh(profile)
     return profile
 
-@router.get("/analysis", response_model=schemas.AnalysisResponse)
-def get_analysis(current_user: models.User = Depends(get_current_user)):
-    if not current_user.style_analysis:
-        raise HTTPException(status_code=404, detail="Analysis not found")
-    
-    analysis = current_user.style_analysis
-    
-    # Helper to safe load JSON
-    def safe_json(val):
-        if not val: return []
-        try:
-            return json.loads(val)
-        except:
-            return []
+def analysis_response(snapshot: models.StyleAnalysisSnapshot) -> Response:
+    """Serves a snapshot's precomputed payload (ETag/304 come from HttpCacheMiddleware)."""
+    return Response(content=snapshot.response_json, media_type="application/json")
 
-    return {
-        "season": analysis.season,
-        "season_subtype": analysis.season_subtype,
-        "undertone": analysis.undertone,
-        "skin_tone": safe_json(analysis.skin_tone),      # NOW JSON
-        "confidence_score": analysis.confidence_score,
-        "best_colors": safe_json(analysis.best_colors),
-        "neutral_colors": safe_json(analysis.neutral_colors),
-        "worst_colors": safe_json(analysis.worst_colors),
-        
-        # Mapping Complementary DB column to Accent Response to persist data
-        "accent_colors": safe_json(analysis.complementary_colors),
-        "complementary_colors": [], # Empty for now as we hijacked the column
-        "luxury_colors": [], # Cannot persist without schema change, return empty
-        
-        "explanation": ["Analysis based on feature extraction."], # Placeholder since we can't save it yet
-        
-        "eye_color": safe_json(analysis.eye_color),      # NOW JSON
-        "hair_color": safe_json(analysis.hair_color),    # NOW JSON
-        "jewelry_metals": safe_json(analysis.jewelry_metals),
-        "jewelry_stones": safe_json(analysis.jewelry_stones)
-    }
+@router.get("/analysis", response_model=schemas.AnalysisResponse)
+def get_analysis(db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    snapshot = analysis_snapshots.latest(db, current_user.id)
+    if snapshot is None:
+        if not current_user.style_analysis:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        # Analysed before snapshots existed: snapshot the legacy columns once
+        snapshot = analysis_snapshots.save(db, current_user.id, analysis_snapshots.from_legacy(current_user.style_analysis))
+        db.commit()
+    else:
+        snapshot = analysis_snapshots.refresh_format(db, snapshot)
+    return analysis_response(snapshot)
 
 @router.post("/analyze-photo", response_model=schemas.AnalysisResponse)
 async def analyze_photo(file: UploadFile = File(...), db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
-    # Save file temporarily or permanently
-    file_extension = os.path.splitext(file.filename)[1]
-    filename = f"analysis_{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file temporarily or permanently (streamed, size-capped, image types only)
+    try:
+        saved = await storage.save(file, "analysis")
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    file_path = saved["local_path"]
         
     # Run analysis
     # Use user email to keep deterministic consistency if we want, OR just file.
@@ -92,7 +67,12 @@ async def analyze_photo(file: UploadFile = File(...), db: Session = Depends(data
     # BUT, if they upload a photo, maybe they want a refresh? 
     # Let's use standard logic: email based for now.
     
-    analysis_data = style_analysis.analyze_user_style(current_user.email, file_path)
+    try:
+        analysis_data = style_analysis.analyze_user_style(current_user.email, file_path)
+    except PhotoRejected as e:
+        raise HTTPException(status_code=422, detail=e.reason)
+    finally:
+        storage.release(saved)
     
     # Update or Create Analysis Record
     analysis = current_user.style_analysis
@@ -107,38 +87,12 @@ async def analyze_photo(file: UploadFile = File(...), db: Session = Depends(data
     analysis.undertone = analysis_data["undertone"]
     analysis.confidence_score = analysis_data["confidence_score"]
     
-    # New Field Logic (Explanation) - Assuming models.py doesn't have it yet, 
-    # we might need to add it or store it in a generic field. 
-    # For now, let's verify if models has it. It likely DOES NOT.
-    # To avoid DB migration crash, we can stash explanation in "complementary_colors" or something?
-    # NO. We should probably NOT break the DB.
-    # We will return it in the Response but we might lose it on refresh if not stored.
-    # Actually, let's store it as a JSON text if possible.
-    # The user said "DO NOT rewrite... treat Palette v6.4 as correct". 
-    # But we added "explanation". 
-    # I will dynamically patch the return of this function to include it, 
-    # but I cannot save it if the column doesn't exist.
-    # I'll modify the GET endpoint to regenerate it or just store in a unused Text column?
-    # Let's save it in `complementary_colors` temporarily if needed? No that's hacky.
-    # Wait, the user said "Fix UI quality".
-    # I'll just skip saving explanation to DB for this instant fix, 
-    # and rely on the frontend getting it from the immediate response.
-    # BUT, the `get_analysis` reads from DB.
-    # Okay, I will Modify `get_analysis` to Mock it if missing, or we assume `style_analysis.py` is called fresh?
-    # No, `get_analysis` is just a getter.
-    
-    # SOLUTION: I will save these new rich fields (skin/eye/hair) as JSON strings in the existing columns.
-    
+    # Legacy columns (chat/outfit context); the full result lives in the snapshot
     analysis.best_colors = json.dumps(analysis_data["best_colors"])
     analysis.neutral_colors = json.dumps(analysis_data["neutral_colors"])
     analysis.worst_colors = json.dumps(analysis_data["worst_colors"])
     
-    # Store Accent/Luxury in existing columns?
-    # We have `complementary_colors` (unused). Let's put Accent there.
-    # Luxury? Maybe append to Neutral?
-    # To do this right, I'll combine them in the JSONs or leave them out of persistence if DB schema is frozen.
-    # I'll pack Accent into Complementary for storage.
-    analysis.complementary_colors = json.dumps(analysis_data["accent_colors"]) 
+    analysis.complementary_colors = json.dumps(analysis_data["accent_colors"])
     
     analysis.eye_color = json.dumps(analysis_data["eye_color"])
     analysis.hair_color = json.dumps(analysis_data["hair_color"])
@@ -147,8 +101,55 @@ async def analyze_photo(file: UploadFile = File(...), db: Session = Depends(data
     analysis.jewelry_stones = json.dumps(analysis_data["jewelry_stones"])
     
     db.add(analysis)
+
+    # Palette changed: re-match the whole wardrobe in one vectorized pass
+    items = current_user.wardrobe_items
+    if items:
+        levels = wardrobe_logic.determine_match_levels(
+            [i.color_primary for i in items], analysis.season, analysis.season_subtype
+        )
+        for item, level in zip(items, levels):
+            if item.match_level != level:
+                item.match_level = level
+                item_json.refresh(item)
+
+    snapshot = analysis_snapshots.save(db, current_user.id, analysis_data)
     db.commit()
-    db.refresh(analysis)
-    
-    # Reuse return logic
-    return get_analysis(current_user)
+    return analysis_response(snapshot)
+
+@router.get("/palette/nearest", response_model=schemas.PaletteNearestResponse)
+def nearest_palette_colors(
+    colors: list[str] = Query(default=[], description="Hex colors to look up, e.g. #8B4513"),
+    item_ids: list[int] = Query(default=[], description="Wardrobe items to look up by their primary color"),
+    k: int = Query(default=3, ge=1, le=20),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Closest colors of the user's seasonal palette (ΔE2000) for arbitrary
+    colors and/or wardrobe items, with the resulting match level.
+    """
+    if not current_user.style_analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    if len(colors) + len(item_ids) > 200:
+        raise HTTPException(status_code=400, detail="At most 200 colors/items per request")
+
+    analysis = current_user.style_analysis
+    subtype = palette_index.resolve(analysis.season, analysis.season_subtype)
+
+    items = {i.id: i for i in current_user.wardrobe_items if i.id in set(item_ids)}
+    missing = [i for i in item_ids if i not in items]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Wardrobe items not found: {missing}")
+
+    queries = [(c, None) for c in colors] + [(items[i].color_primary, i) for i in item_ids]
+    hexes = [wardrobe_logic.normalize_hex(c) for c, _ in queries]
+    nearest = palette_index.nearest(hexes, subtype, k=k)
+    levels = wardrobe_logic.determine_match_levels(hexes, analysis.season, analysis.season_subtype)
+
+    return {
+        "subtype": subtype,
+        "results": [
+            {"color": color, "item_id": item_id, "match_level": level, "nearest": matches}
+            for (color, item_id), level, matches in zip(queries, levels, nearest)
+        ],
+    }
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from .. import models, schemas, database
-from .auth import get_current_user
+from .auth import get_current_user, get_admin_user
 from ..services import grok_client
+from ..services.chat_context import context_manager
+from ..services.response_cache import response_cache, make_key, normalize_message
+from ..services.circuit_breaker import gemini_breaker, grok_breaker
+from ..config import settings
 import json
 
 router = APIRouter(prefix="/stylist", tags=["Stylist Chat"])
@@ -13,8 +18,8 @@ Be friendly, encouraging, and professional.
 Give shorter, concise advice unless asked for detail.
 """
 
-@router.post("/chat", response_model=schemas.ChatResponse)
-async def chat(chat_req: schemas.ChatRequest, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+def _start_turn(chat_req: schemas.ChatRequest, db: Session, current_user: models.User):
+    """Resolves the conversation, stores the user message and builds the Grok context."""
     # Get or create conversation
     if chat_req.conversation_id:
         conversation = db.query(models.Conversation).filter(models.Conversation.id == chat_req.conversation_id, models.Conversation.user_id == current_user.id).first()
@@ -26,32 +31,119 @@ async def chat(chat_req: schemas.ChatRequest, db: Session = Depends(database.get
         db.commit()
         db.refresh(conversation)
 
-    # Save user message
+    # Save user message (flush so it gets an id and is part of the context)
     user_msg = models.ChatMessage(conversation_id=conversation.id, role="user", content=chat_req.message)
     db.add(user_msg)
-    
+    db.flush()
+
     # Prepare messages for Grok
-    # Fetch history (limit to last 10 messages for context window)
-    history = db.query(models.ChatMessage).filter(models.ChatMessage.conversation_id == conversation.id).order_by(models.ChatMessage.created_at.desc()).limit(10).all()
-    history.reverse()
-    
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    
-    # Add user context (Style Analysis)
-    if current_user.style_analysis:
-        analysis = current_user.style_analysis
-        context = f"User is a {analysis.season} ({analysis.season_subtype}). Best colors: {analysis.best_colors}. Worst: {analysis.worst_colors}."
-        messages.append({"role": "system", "content": context})
-        
-    for msg in history:
-        messages.append({"role": msg.role, "content": msg.content})
-        
-    # Call Grok
-    response_content = await grok_client.get_chat_completion(messages)
-    
+    # Recent turns within the token budget, older turns folded into a rolling summary
+    messages = context_manager.build_messages(
+        db,
+        conversation,
+        SYSTEM_PROMPT,
+        current_user.style_analysis,
+    )
+    return conversation, messages
+
+def _cache_key(chat_req: schemas.ChatRequest, current_user: models.User) -> str | None:
+    """
+    Only opening questions are cached: later turns depend on conversation history.
+    The chat prompt carries the palette but not the wardrobe, so answers are shared
+    by users with the same season subtype.
+    """
+    if chat_req.conversation_id:
+        return None
+    analysis = current_user.style_analysis
+    return make_key(
+        "chat",
+        normalize_message(chat_req.message),
+        analysis.season if analysis else None,
+        analysis.season_subtype if analysis else None,
+        settings.XAI_MODEL,
+    )
+
+def _is_cacheable(response_content: str) -> bool:
+    return bool(response_content) and response_content not in (
+        grok_client.FAILURE_MESSAGE,
+        grok_client.MISSING_KEY_MESSAGE,
+    )
+
+@router.post("/chat", response_model=schemas.ChatResponse)
+async def chat(chat_req: schemas.ChatRequest, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    conversation, messages = _start_turn(chat_req, db, current_user)
+
+    # Call Grok (unless an identical opening question was answered recently)
+    cache_key = _cache_key(chat_req, current_user)
+    response_content = await response_cache.aget(cache_key) if cache_key else None
+    if response_content is None:
+        response_content = await grok_client.get_chat_completion(messages)
+        if cache_key and _is_cacheable(response_content):
+            await response_cache.aset(cache_key, response_content)
+
     # Save assistant message
     asst_msg = models.ChatMessage(conversation_id=conversation.id, role="assistant", content=response_content)
     db.add(asst_msg)
     db.commit()
-    
+
     return {"response": response_content, "conversation_id": conversation.id}
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(chat_req: schemas.ChatRequest, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    """
+    Same as /chat, but forwards tokens as Server-Sent Events while Grok generates.
+    Events: `meta` (conversation_id), `token` (content delta), `done` (full response).
+    """
+    conversation, messages = _start_turn(chat_req, db, current_user)
+    conversation_id = conversation.id
+    cache_key = _cache_key(chat_req, current_user)
+    cached = await response_cache.aget(cache_key) if cache_key else None
+    # User message and summary are persisted before the stream starts
+    db.commit()
+
+    async def event_stream():
+        yield _sse("meta", {"conversation_id": conversation_id})
+
+        if cached is not None:
+            response_content = cached
+            yield _sse("token", {"content": cached})
+        else:
+            parts = []
+            status = {}
+            async for delta in grok_client.stream_chat_completion(messages, status):
+                parts.append(delta)
+                yield _sse("token", {"content": delta})
+
+            response_content = "".join(parts)
+            # A stream cut off mid-answer is still saved to the conversation, never cached
+            if cache_key and status["finished"] and _is_cacheable(response_content):
+                await response_cache.aset(cache_key, response_content)
+
+        # The request session may already be closed; persist with a fresh one
+        stream_db = database.SessionLocal()
+        try:
+            stream_db.add(models.ChatMessage(conversation_id=conversation_id, role="assistant", content=response_content))
+            stream_db.commit()
+        finally:
+            stream_db.close()
+
+        yield _sse("done", {"response": response_content, "conversation_id": conversation_id})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/cache/stats")
+def cache_stats(admin: models.User = Depends(get_admin_user)):
+    """Hit rate of the shared chat/outfit response cache."""
+    return response_cache.stats()
+
+@router.get("/providers/status")
+def providers_status(admin: models.User = Depends(get_admin_user)):
+    """Circuit breaker state of the AI providers."""
+    return {"gemini": gemini_breaker.stats(), "grok": grok_breaker.stats()}
@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Response
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from .. import models, schemas, database
 from .auth import get_current_user
-from ..services import wardrobe_logic, vision_service
+from ..services import wardrobe_logic, vision_service, item_json
 from ..services.clothing_normalizer import normalize_category, normalize_text
 from ..services.image_category_detector import detect_category_from_image
+from ..services.local_classifier import local_classifier
+from ..services.fallback_classifier import analyze_image_properties, fallback_classify
+from ..services.upload_writer import UploadRejected
+from ..services.storage import storage
+from ..services.metrics import span
+from ..config import settings
 
-import os
-import uuid
 import json
-import shutil
 import re
 
 router = APIRouter(prefix="/wardrobe", tags=["Wardrobe"])
 
-UPLOAD_DIR = "uploads/wardrobe"
-
 ALLOWED_CATEGORIES = {
     "Top",
     "Bottom",
@@ -39,6 +41,12 @@ def normalize_hex(value: str | None) -> str | None:
     return value if value.startswith("#") else f"#{value}"
 
 
+def local_stage(file_path: str):
+    """Image decode + shape props + local model (CPU-bound; run in the threadpool)."""
+    image_props = analyze_image_properties(file_path)
+    return image_props, local_classifier.predict(file_path, image_props)
+
+
 # -------------------------------------------------
 # Upload wardrobe item
 # -------------------------------------------------
@@ -49,79 +57,107 @@ async def upload_wardrobe_item(
     category: str | None = Form(None),
     color_hex: str | None = Form(None),
     color_name: str | None = Form(None),
+    enrich: bool = Form(True),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-
     # ---------- Save image ----------
-    ext = os.path.splitext(file.filename)[1] or ".jpg"
-    filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-
+    # Streamed in chunks; oversized or non-image files are rejected before the CV stack
     try:
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        with span("upload.save"):
+            saved = await storage.save(file, "wardrobe")
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    file_path = saved["local_path"]  # local copy for the CV stages; saved["path"] is the storage key
 
-    # ---------- AI Vision ----------
+    # The staged copy is released however classification ends (S3 staging files
+    # would otherwise pile up under uploads/tmp)
     try:
-        ai_metadata = await vision_service.analyze_clothing_image(file_path)
-    except Exception:
+        # ---------- Local classifier (CPU, first stage) ----------
+        # Decoded once; the thumbnail and shape props are shared with the fallback stage.
+        # The CV stages run in the threadpool so they don't block the event loop
+        with span("upload.local_model"):
+            image_props, local_guess = await run_in_threadpool(local_stage, file_path)
+        local_confident = bool(local_guess) and local_guess["confidence"] >= settings.LOCAL_CLASSIFIER_THRESHOLD
+
+        # ---------- AI Vision ----------
+        # Gemini adds the rich attributes; skip it when only the category was asked for
         ai_metadata = None
-
-    # ---------- CATEGORY RESOLUTION ----------
-    final_category = "Uncategorized"
-    decision_meta = {}
-
-    # 1️⃣ AI semantic (highest confidence)
-    if ai_metadata:
-        normalized = normalize_category(
-            ai_metadata.get("category"),
-            ai_metadata.get("subcategory"),
-            ai_metadata.get("type"),
-            ai_metadata.get("item_type"),
-            ai_metadata.get("garment"),
-            ai_metadata.get("description"),
-        )
-        if normalized in ALLOWED_CATEGORIES:
-            final_category = normalized
+        if enrich or not local_confident:
+            try:
+                with span("upload.gemini"):
+                    ai_metadata = await vision_service.analyze_clothing_image(file_path, mime_type=saved["mime_type"])
+            except Exception:
+                ai_metadata = None
+
+        # ---------- CATEGORY RESOLUTION ----------
+        final_category = "Uncategorized"
+        decision_meta = {}
+
+        # 1️⃣ AI semantic (highest confidence)
+        if ai_metadata:
+            with span("upload.normalize"):
+                normalized = normalize_category(
+                    ai_metadata.get("category"),
+                    ai_metadata.get("subcategory"),
+                    ai_metadata.get("type"),
+                    ai_metadata.get("item_type"),
+                    ai_metadata.get("garment"),
+                    free_text=ai_metadata.get("description"),
+                )
+            if normalized in ALLOWED_CATEGORIES:
+                final_category = normalized
+                decision_meta = {
+                    "source": "ai_semantic",
+                    "confidence": "high",
+                }
+
+        # 1.5️⃣ Local classifier
+        if final_category == "Uncategorized" and local_confident and local_guess["category"] in ALLOWED_CATEGORIES:
+            final_category = local_guess["category"]
             decision_meta = {
-                "source": "ai_semantic",
-                "confidence": "high",
-            }
-
-    # 2️⃣ Image heuristic
-    if final_category == "Uncategorized":
-        image_cat = detect_category_from_image(file_path)
-        if image_cat in ALLOWED_CATEGORIES:
-            final_category = image_cat
-            decision_meta = {
-                "source": "image_heuristic",
+                "source": "local_model",
                 "confidence": "medium",
+                "score": local_guess["confidence"],
             }
 
-    # 3️⃣ Filename fallback
-    if final_category == "Uncategorized":
-        name_cat = normalize_category(file.filename)
-        if name_cat in ALLOWED_CATEGORIES:
-            final_category = name_cat
-            decision_meta = {
-                "source": "filename",
-                "confidence": "low",
-            }
-
-    # 3.5️⃣ Fallback Classifier (last resort before giving up)
-    if final_category == "Uncategorized":
-        from ..services.fallback_classifier import fallback_classify
-        fallback_cat = fallback_classify(file_path, file.filename)
-        if fallback_cat and fallback_cat in ALLOWED_CATEGORIES:
-            final_category = fallback_cat
-            decision_meta = {
-                "source": "fallback_heuristic",
-                "confidence": "very_low",
-            }
+        # 2️⃣ Image heuristic
+        if final_category == "Uncategorized":
+            with span("upload.fallback"):
+                image_cat = await run_in_threadpool(detect_category_from_image, file_path)
+            if image_cat in ALLOWED_CATEGORIES:
+                final_category = image_cat
+                decision_meta = {
+                    "source": "image_heuristic",
+                    "confidence": "medium",
+                }
+
+        # 3️⃣ Filename fallback
+        if final_category == "Uncategorized":
+            name_cat = normalize_category(file.filename)
+            if name_cat in ALLOWED_CATEGORIES:
+                final_category = name_cat
+                decision_meta = {
+                    "source": "filename",
+                    "confidence": "low",
+                }
+
+        # 3.5️⃣ Fallback Classifier (last resort before giving up)
+        if final_category == "Uncategorized":
+            with span("upload.fallback"):
+                fallback_cat = await run_in_threadpool(
+                    fallback_classify, file_path, file.filename, image_props, local_guess
+                )
+            if fallback_cat and fallback_cat in ALLOWED_CATEGORIES:
+                final_category = fallback_cat
+                decision_meta = {
+                    "source": "fallback_heuristic",
+                    "confidence": "very_low",
+                }
+    finally:
+        storage.release(saved)
 
     # 4️⃣ Manual override (last)
     if final_category == "Uncategorized" and category in ALLOWED_CATEGORIES:
@@ -159,17 +195,12 @@ async def upload_wardrobe_item(
     match_level = "neutral"
     if current_user.style_analysis and final_hex:
         sa = current_user.style_analysis
-        match_level = wardrobe_logic.determine_match_level(
-            final_hex,
-            json.loads(sa.best_colors),
-            json.loads(sa.neutral_colors),
-            json.loads(sa.worst_colors),
-        )
+        match_level = wardrobe_logic.determine_match_levels([final_hex], sa.season, sa.season_subtype)[0]
 
     # ---------- SAVE ----------
     new_item = models.WardrobeItem(
         user_id=current_user.id,
-        file_path=file_path,
+        file_path=saved["path"],
         category=final_category,
         subcategory=subcategory,
         type=item_type,
@@ -185,31 +216,16 @@ async def upload_wardrobe_item(
         ai_metadata=json.dumps({
             "ai": ai_metadata,
             "decision": decision_meta
-        }) if ai_metadata else None,
+        }) if ai_metadata or decision_meta else None,
     )
 
-    db.add(new_item)
-    db.commit()
-    db.refresh(new_item)
-
-    return schemas.WardrobeItemResponse(
-        id=new_item.id,
-        file_path=new_item.file_path.replace("\\", "/"),
-        category=new_item.category,
-        subcategory=new_item.subcategory,
-        type=new_item.type,
-        color_primary=new_item.color_primary,
-        color_secondary=None,
-        color_name=new_item.color_name,
-        pattern=new_item.pattern,
-        fabric=new_item.fabric,
-        fit=new_item.fit,
-        seasonality=json.loads(new_item.seasonality),
-        occasion_tags=json.loads(new_item.occasion_tags),
-        style_tags=json.loads(new_item.style_tags),
-        match_level=new_item.match_level,
-        ai_metadata=json.loads(new_item.ai_metadata) if new_item.ai_metadata else None,
-    )
+    with span("upload.db_commit"):
+        db.add(new_item)
+        db.flush()  # assigns the id the response fragment needs
+        item_json.refresh(new_item)
+        db.commit()
+
+    return Response(content=item_json.render(new_item.response_json, new_item.file_path), media_type="application/json")
 
 
 # -------------------------------------------------
@@ -221,27 +237,28 @@ def get_wardrobe(
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return [
-        schemas.WardrobeItemResponse(
-            id=i.id,
-            file_path=i.file_path.replace("\\", "/"),
-            category=i.category,
-            subcategory=i.subcategory,
-            type=i.type,
-            color_primary=i.color_primary,
-            color_secondary=None,
-            color_name=i.color_name,
-            pattern=i.pattern,
-            fabric=i.fabric,
-            fit=i.fit,
-            seasonality=json.loads(i.seasonality),
-            occasion_tags=json.loads(i.occasion_tags),
-            style_tags=json.loads(i.style_tags),
-            match_level=i.match_level,
-            ai_metadata=json.loads(i.ai_metadata) if i.ai_metadata else None,
-        )
-        for i in current_user.wardrobe_items
-    ]
+    """
+    Concatenates the items' pre-serialized JSON fragments (see item_json.py);
+    only the fragment and file path columns are read.
+    """
+    rows = (
+        db.query(models.WardrobeItem.id, models.WardrobeItem.response_json, models.WardrobeItem.file_path)
+        .filter(models.WardrobeItem.user_id == current_user.id)
+        .order_by(models.WardrobeItem.id)
+        .all()
+    )
+
+    # Rows written before fragments existed (or invalidated by a script): build once
+    stale = [row.id for row in rows if row.response_json is None]
+    fragments = {}
+    if stale:
+        for item in db.query(models.WardrobeItem).filter(models.WardrobeItem.id.in_(stale)):
+            item_json.refresh(item)
+            fragments[item.id] = item.response_json
+        db.commit()
+
+    body = item_json.render_list((row.response_json or fragments[row.id], row.file_path) for row in rows)
+    return Response(content=body, media_type="application/json")
 
 
 # -------------------------------------------------
@@ -259,9 +276,10 @@ def delete_wardrobe_item(
     if not item or item.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    if os.path.exists(item.file_path):
-        os.remove(item.file_path)
-
+    file_path = item.file_path
     db.delete(item)
     db.commit()
+
+    # The file goes once the GC confirms nothing references it anymore
+    storage.delete(file_path)
     return {"message": "Deleted"}
@@ -73,6 +73,24 @@ class AnalysisResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Palette queries (nearest palette colors by ΔE2000)
+class PaletteColorMatch(BaseModel):
+    name: str
+    hex: str
+    group: str  # core, accent, luxury, neutral, worst
+    level: str  # best, neutral, worst
+    delta_e: float
+
+class PaletteNearestResult(BaseModel):
+    color: Optional[str] = None
+    item_id: Optional[int] = None
+    match_level: str
+    nearest: List[PaletteColorMatch]
+
+class PaletteNearestResponse(BaseModel):
+    subtype: str
+    results: List[PaletteNearestResult]
+
 # Wardrobe
 # Wardrobe
 class WardrobeItemCreate(BaseModel):
@@ -94,6 +112,7 @@ class WardrobeItemCreate(BaseModel):
 class WardrobeItemResponse(WardrobeItemCreate):
     id: int
     file_path: str
+    image_url: Optional[str] = None # Direct/presigned URL from the storage backend
     match_level: str
     ai_metadata: Optional[Dict[str, Any]] = None # Return full AI analysis
     
@@ -118,6 +137,7 @@ class OutfitGenRequest(BaseModel):
     occasion: str
     weather: Optional[str] = "Neutral"
     vibe: Optional[str] = "Smart Casual"
+    variant: Optional[int] = 0 # N-th alternative outfit for the same request
 
 class OutfitItem(BaseModel):
     item_id: int
@@ -0,0 +1,124 @@
+"""
+Versioned style-analysis snapshots.
+
+Every analysis stores the complete analyze_user_style() result plus the
+AnalysisResponse payload already validated and serialized, so reading the
+dashboard analysis is one indexed row fetch with no JSON re-parsing. The
+legacy UserStyleAnalysis columns are still written for the chat/outfit code.
+
+FORMAT_VERSION is bumped whenever build_response() changes; older snapshots
+are rebuilt from their stored result on the next read.
+"""
+import json
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+
+FORMAT_VERSION = 1
+
+
+def _json_default(value):
+    # NumPy scalars from the CV pipeline (debug_info)
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def build_response(result: Dict) -> Dict:
+    """AnalysisResponse payload for an analyze_user_style() result."""
+    return {
+        "season": result["season"],
+        "season_subtype": result.get("season_subtype"),
+        "undertone": result.get("undertone"),
+        "skin_tone": result.get("skin_tone"),
+        "eye_color": result.get("eye_color"),
+        "hair_color": result.get("hair_color"),
+        "confidence_score": result.get("confidence_score", 0.0),
+        "explanation": result.get("explanation") or [],
+        "best_colors": result.get("best_colors", []),
+        "neutral_colors": result.get("neutral_colors", []),
+        "accent_colors": result.get("accent_colors", []),
+        "luxury_colors": result.get("luxury_colors", []),
+        "worst_colors": result.get("worst_colors", []),
+        "complementary_colors": result.get("complementary_colors", []),
+        "jewelry_metals": result.get("jewelry_metals", []),
+        "jewelry_stones": result.get("jewelry_stones", []),
+    }
+
+
+def serialize_response(result: Dict) -> str:
+    """Validates once at write time; reads then serve the string untouched."""
+    return schemas.AnalysisResponse(**build_response(result)).model_dump_json()
+
+
+# -------------------------------------------------
+# Read / write
+# -------------------------------------------------
+
+def latest(db: Session, user_id: int) -> models.StyleAnalysisSnapshot | None:
+    return (
+        db.query(models.StyleAnalysisSnapshot)
+        .filter(models.StyleAnalysisSnapshot.user_id == user_id)
+        .order_by(models.StyleAnalysisSnapshot.version.desc())
+        .first()
+    )
+
+
+def save(db: Session, user_id: int, result: Dict) -> models.StyleAnalysisSnapshot:
+    """Adds a new snapshot version (caller commits)."""
+    previous = latest(db, user_id)
+    version = previous.version + 1 if previous else 1
+    snapshot = models.StyleAnalysisSnapshot(
+        user_id=user_id,
+        version=version,
+        format_version=FORMAT_VERSION,
+        result=json.dumps(result, default=_json_default),
+        response_json=serialize_response(result),
+    )
+    db.add(snapshot)
+    return snapshot
+
+
+def refresh_format(db: Session, snapshot: models.StyleAnalysisSnapshot) -> models.StyleAnalysisSnapshot:
+    """Rebuilds the payload of a snapshot written by an older FORMAT_VERSION."""
+    if snapshot.format_version == FORMAT_VERSION:
+        return snapshot
+    snapshot.response_json = serialize_response(json.loads(snapshot.result))
+    snapshot.format_version = FORMAT_VERSION
+    db.commit()
+    return snapshot
+
+
+def from_legacy(analysis: models.UserStyleAnalysis) -> Dict:
+    """
+    Best-effort result from the legacy columns, for users analysed before
+    snapshots existed (accents were stored in complementary_colors; luxury
+    colors and the explanation were never persisted).
+    """
+    def safe_json(val):
+        if not val:
+            return []
+        try:
+            return json.loads(val)
+        except ValueError:
+            return []
+
+    return {
+        "season": analysis.season,
+        "season_subtype": analysis.season_subtype,
+        "undertone": analysis.undertone,
+        "skin_tone": safe_json(analysis.skin_tone) or None,
+        "confidence_score": analysis.confidence_score,
+        "best_colors": safe_json(analysis.best_colors),
+        "neutral_colors": safe_json(analysis.neutral_colors),
+        "worst_colors": safe_json(analysis.worst_colors),
+        "accent_colors": safe_json(analysis.complementary_colors),
+        "explanation": ["Analysis based on feature extraction."],
+        "eye_color": safe_json(analysis.eye_color) or None,
+        "hair_color": safe_json(analysis.hair_color) or None,
+        "jewelry_metals": safe_json(analysis.jewelry_metals),
+        "jewelry_stones": safe_json(analysis.jewelry_stones),
+        "face_shape": analysis.face_shape,
+    }
@@ -0,0 +1,235 @@
+"""
+Process-wide scheduler for rate-limited AI APIs.
+A token bucket sized to the provider quota admits requests, interactive
+callers are served before background jobs, and 429s pause the whole bucket
+(honoring Retry-After) so concurrent requests don't retry in lockstep.
+Server-supplied waits are capped at max_delay: a longer Retry-After fails
+the request instead of stalling every caller on the bucket.
+"""
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+import httpx
+
+from ..config import settings
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, gemini_breaker
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, BACKGROUND)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait from a Retry-After header or a Google RetryInfo body."""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    # Gemini: {"error": {"details": [{"retryDelay": "13s", ...}]}}
+    match = re.search(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"', response.text or "")
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class TokenBucketScheduler:
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.name = name
+        self.breaker = breaker
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = {lane: deque() for lane in LANES}
+        self._dispatcher: asyncio.Task | None = None
+
+        self._wait = {lane: {"requests": 0, "total": 0.0, "max": 0.0} for lane in LANES}
+        self.retries = 0
+        self.throttled = 0
+
+    # --------------------------------------------------
+    async def acquire(self, lane: str = INTERACTIVE):
+        """Waits for a token; interactive waiters always go first."""
+        started = time.monotonic()
+
+        if not any(self._waiters.values()) and started >= self._blocked_until:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._record_wait(lane, 0.0)
+                return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters[lane].append(waiter)
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        await waiter
+        self._record_wait(lane, time.monotonic() - started)
+
+    async def post(self, url: str, *, json: Dict, timeout: float, lane: str = INTERACTIVE) -> httpx.Response:
+        """
+        POSTs through the bucket with coordinated, jittered retries.
+        Raises httpx.HTTPStatusError once retries are exhausted or the server
+        asks for a wait longer than max_delay, and CircuitOpenError while the
+        provider's circuit is open.
+        """
+        for attempt in range(self.max_retries + 1):
+            # Fail fast while the provider is down instead of waiting for timeouts
+            if self.breaker and not self.breaker.allow_request():
+                raise CircuitOpenError(f"{self.name} circuit is open")
+
+            try:
+                await self.acquire(lane)
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    res = await client.post(url, json=json)
+            except httpx.TransportError:
+                if self.breaker:
+                    self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled while queued or in flight: no outcome, free the probe
+                if self.breaker:
+                    self.breaker.release()
+                raise
+
+            if self.breaker:
+                if res.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+            if res.status_code not in RETRYABLE_STATUS or attempt == self.max_retries:
+                res.raise_for_status()
+                return res
+
+            # Full jitter unless the server told us exactly how long to wait
+            delay = _retry_after(res)
+            if delay is not None and delay > self.max_delay:
+                # Quota reset is far off: give up now (callers have fallbacks) and
+                # pause the bucket for at most max_delay
+                if res.status_code == 429:
+                    self.throttled += 1
+                    self._throttle(self.max_delay)
+                print(f"⚠️ {self.name} asked for a {delay:.0f}s wait (max {self.max_delay:.0f}s). Giving up.")
+                res.raise_for_status()
+
+            self.retries += 1
+            if delay is None:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt + 1)))
+
+            if res.status_code == 429:
+                # Quota exhausted: pause everyone, not just this request
+                self.throttled += 1
+                self._throttle(delay)
+                print(f"⚠️ {self.name} rate limited. Pausing bucket for {delay:.1f}s...")
+            else:
+                print(f"⚠️ {self.name} returned {res.status_code}. Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
+
+    def stats(self) -> Dict:
+        self._refill()
+        return {
+            "lanes": {
+                lane: {
+                    "requests": w["requests"],
+                    "queued": len(self._waiters[lane]),
+                    "avg_wait_ms": round(w["total"] / w["requests"] * 1000, 1) if w["requests"] else 0.0,
+                    "max_wait_ms": round(w["max"] * 1000, 1),
+                }
+                for lane, w in self._wait.items()
+            },
+            "tokens": round(self._tokens, 2),
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "paused_for_s": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+        }
+
+    # --------------------------------------------------
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _throttle(self, delay: float):
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    def _record_wait(self, lane: str, waited: float):
+        w = self._wait[lane]
+        w["requests"] += 1
+        w["total"] += waited
+        w["max"] = max(w["max"], waited)
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        for lane in LANES:
+            queue = self._waiters[lane]
+            while queue and queue[0].done():  # cancelled callers
+                queue.popleft()
+            if queue:
+                return queue.popleft()
+        return None
+
+    async def _dispatch(self):
+        while any(self._waiters.values()):
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            self._tokens -= 1
+            waiter.set_result(None)
+
+
+def gemini_url() -> str:
+    return (
+        f"{settings.GEMINI_BASE_URL}/v1beta/models/"
+        f"{settings.GEMINI_MODEL}:generateContent"
+        f"?key={settings.GEMINI_API_KEY}"
+    )
+
+
+gemini_scheduler = TokenBucketScheduler(
+    "Gemini",
+    rate_per_minute=settings.GEMINI_RPM,
+    burst=settings.GEMINI_BURST,
+    max_retries=settings.GEMINI_MAX_RETRIES,
+    breaker=gemini_breaker,
+)
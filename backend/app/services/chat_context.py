@@ -0,0 +1,177 @@
+"""
+Conversation context manager for the stylist chat.
+Keeps the Grok prompt bounded: recent turns are sent verbatim within a token
+budget, older turns are folded into a rolling per-conversation summary, and the
+user's palette is sent as a compact digest of color names.
+"""
+import json
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from ..models import ChatMessage, Conversation, UserStyleAnalysis
+
+# Rough heuristic used by OpenAI/xAI tokenizers for English text
+CHARS_PER_TOKEN = 4
+
+# Budgets are in (estimated) tokens
+PROMPT_TOKEN_BUDGET = 1500
+SUMMARY_TOKEN_BUDGET = 250
+HISTORY_MESSAGE_TOKEN_CAP = 300
+MAX_HISTORY_MESSAGES = 12
+
+# Palette digest limits (names per bucket)
+DIGEST_BEST_LIMIT = 12
+DIGEST_WORST_LIMIT = 6
+
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str | None) -> int:
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "…"
+
+
+def _color_names(raw: str | None, limit: int) -> List[str]:
+    if not raw:
+        return []
+    try:
+        colors = json.loads(raw)
+    except (TypeError, json.JSONDecodeError):
+        return []
+
+    names = []
+    for color in colors or []:
+        name = color.get("name") if isinstance(color, dict) else color
+        if name and name not in names:
+            names.append(str(name))
+        if len(names) >= limit:
+            break
+    return names
+
+
+@lru_cache(maxsize=1024)
+def _palette_digest(season: str | None, subtype: str | None, best_colors: str | None, worst_colors: str | None) -> str:
+    # Keyed on the raw column values, so a re-analysis (new version) misses the cache
+    best = _color_names(best_colors, DIGEST_BEST_LIMIT)
+    worst = _color_names(worst_colors, DIGEST_WORST_LIMIT)
+
+    digest = f"User is a {season} ({subtype})."
+    if best:
+        digest += f" Best colors: {', '.join(best)}."
+    if worst:
+        digest += f" Avoid: {', '.join(worst)}."
+    return digest
+
+
+def palette_digest(analysis: UserStyleAnalysis) -> str:
+    """Compact, names-only palette context for the system prompt."""
+    return _palette_digest(
+        analysis.season,
+        analysis.season_subtype,
+        analysis.best_colors,
+        analysis.worst_colors,
+    )
+
+
+def _summary_line(msg: ChatMessage) -> str:
+    speaker = "User" if msg.role == "user" else "Stylist"
+    text = re.sub(r"\s+", " ", msg.content or "").strip()
+    # First sentence carries most of the intent for short chat turns
+    first = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[:SUMMARY_LINE_CHARS].rstrip() + "…"
+    return f"{speaker}: {first}"
+
+
+class ChatContextManager:
+    """Builds bounded Grok message lists for a conversation."""
+
+    def __init__(
+        self,
+        token_budget: int = PROMPT_TOKEN_BUDGET,
+        summary_budget: int = SUMMARY_TOKEN_BUDGET,
+        message_cap: int = HISTORY_MESSAGE_TOKEN_CAP,
+        max_messages: int = MAX_HISTORY_MESSAGES,
+    ):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.message_cap = message_cap
+        self.max_messages = max_messages
+
+    # --------------------------------------------------
+    def build_messages(
+        self,
+        db,
+        conversation: Conversation,
+        system_prompt: str,
+        analysis: UserStyleAnalysis | None = None,
+    ) -> List[Dict]:
+        """
+        Returns the message list for the next completion.
+        Messages that no longer fit are folded into `conversation.summary`;
+        the caller commits the session.
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+        if analysis:
+            messages.append({"role": "system", "content": palette_digest(analysis)})
+
+        fixed_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        history_budget = max(0, self.token_budget - fixed_tokens - self.summary_budget)
+
+        # Only turns newer than the summary watermark are ever loaded
+        pending = (
+            db.query(ChatMessage)
+            .filter(
+                ChatMessage.conversation_id == conversation.id,
+                ChatMessage.id > (conversation.summarized_upto_id or 0),
+            )
+            .order_by(ChatMessage.id.asc())
+            .all()
+        )
+
+        recent, used = [], 0
+        for msg in reversed(pending):
+            # The newest message (current user turn) is always sent unclipped
+            content = msg.content if not recent else _clip(msg.content, self.message_cap)
+            cost = estimate_tokens(content)
+            if recent and (used + cost > history_budget or len(recent) >= self.max_messages):
+                break
+            recent.append({"role": msg.role, "content": content})
+            used += cost
+        recent.reverse()
+
+        overflow = pending[: len(pending) - len(recent)]
+        if overflow:
+            self._fold(conversation, overflow)
+
+        if conversation.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of earlier conversation:\n{conversation.summary}",
+            })
+
+        return messages + recent
+
+    # --------------------------------------------------
+    def _fold(self, conversation: Conversation, overflow: List[ChatMessage]):
+        lines = conversation.summary.split("\n") if conversation.summary else []
+        lines += [_summary_line(m) for m in overflow]
+
+        # Drop the oldest lines until the summary fits its budget
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_budget:
+            lines.pop(0)
+
+        conversation.summary = _clip("\n".join(lines), self.summary_budget)
+        conversation.summarized_upto_id = overflow[-1].id
+
+
+context_manager = ChatContextManager()
@@ -0,0 +1,116 @@
+"""
+Per-provider circuit breakers for the AI APIs.
+After repeated failures (timeouts, connection errors, 5xx) the circuit opens
+and callers fail fast to their local fallbacks. After a cool-down a single
+half-open probe is let through; its outcome closes or re-opens the circuit.
+Callers that reserve a probe and end without an outcome (cancelled, or a
+non-provider error) must release() it; a probe that is never released
+expires after recovery_timeout so the circuit cannot stay half-open forever.
+"""
+import threading
+import time
+from typing import Dict
+
+from ..config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    # --------------------------------------------------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def available(self) -> bool:
+        """Cheap check that does not reserve a half-open probe."""
+        return self.state != OPEN
+
+    def allow_request(self) -> bool:
+        """Reserves a call; in half-open state only a limited number of probes pass."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                self._probe_at = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Frees a reserved half-open probe whose call ended without an outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print(f"✅ {self.name} circuit closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != OPEN:
+                    print(f"🔌 {self.name} circuit opened after {self._failures} failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+    # --------------------------------------------------
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        elif self._state == HALF_OPEN and self._probes and time.monotonic() - self._probe_at >= self.recovery_timeout:
+            # Lost probe (no outcome recorded, never released): let a new one through
+            self._probes = 0
+        return self._state
+
+
+gemini_breaker = CircuitBreaker(
+    "Gemini",
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.BREAKER_RECOVERY_SECONDS,
+)
+grok_breaker = CircuitBreaker(
+    "Grok",
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.BREAKER_RECOVERY_SECONDS,
+)
@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+from typing import Iterable, Sequence
 
 CATEGORY_SYNONYMS = {
     "Top": [
@@ -7,7 +9,7 @@ CATEGORY_SYNONYMS = {
     ],
     "Bottom": [
         "bottom", "pant", "pants", "trouser", "jean", "jeans",
-        "skirt", "short", "shorts", "legging", "cargo", "lower"
+        "skirt", "short", "shorts", "legging", "cargo", "capri", "lower"
     ],
     "OnePiece": [
         "dress", "gown", "onepiece", "one-piece",
@@ -32,43 +34,146 @@ CATEGORY_SYNONYMS = {
 }
 
 
-def _tokenize(text: str) -> set[str]:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-    parts = re.split(r"[\s\-]+", text)
-    return set(filter(None, parts))
+_NON_WORD = re.compile(r"[^a-z0-9\s\-]")
+_SPLIT = re.compile(r"[\s\-]+")
 
+# Compound words ("sweatpants", "raincoat") match a keyword suffix; these are
+# too generic to match that way ("flower" is not a "lower")
+_NO_SUFFIX_MATCH = {"upper", "lower", "bottom", "flat", "flats", "ring"}
+_MIN_SUFFIX_LEN = 4
+_MIN_PREFIX_LEN = 3
 
-def normalize_category(*raw_inputs: str | None) -> str:
+
+@lru_cache(maxsize=4096)
+def _tokenize(text: str) -> frozenset[str]:
+    text = _NON_WORD.sub(" ", text.lower())
+    return frozenset(filter(None, _SPLIT.split(text)))
+
+
+def _stems(token: str) -> tuple[str, ...]:
     """
-    Robust category normalization using:
-    - tokenization
-    - plural handling
-    - synonym matching
-    - confidence scoring
+    Candidate singulars, most likely first: dresses -> dress, blouses -> blouse.
+    "-es" alone can't tell the two apart, so both are tried.
+    """
+    stems = []
+    if token.endswith("es") and len(token) > 4:
+        stems.append(token[:-2])
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+        stems.append(token[:-1])
+    return tuple(stems)
+
+
+class KeywordMatcher:
     """
-    tokens = set()
+    Inverted token -> {category: weight} index built once at import.
+    Exact synonym hits score 2, singular/plural and compound-word hits score 1,
+    which matches the original nested-loop scoring. Compound-word matching is
+    for label fields only: in `free_text` (descriptions) it turns "participant"
+    into pants, so prose is matched on whole words and plurals.
+    """
+
+    def __init__(self, synonyms: dict[str, list[str]]):
+        self.categories = list(synonyms)
+        self._index: dict[str, dict[str, int]] = {}
+        for cat, keywords in synonyms.items():
+            for kw in keywords:
+                self._add(kw, cat, 2)
+                if kw.endswith("s"):
+                    self._add(kw[:-1], cat, 1)
+
+        suffixes = sorted(
+            (kw for kws in synonyms.values() for kw in kws
+             if len(kw) >= _MIN_SUFFIX_LEN and kw not in _NO_SUFFIX_MATCH and "-" not in kw),
+            key=len,
+            reverse=True,
+        )
+        self._suffix = re.compile(
+            "^[a-z0-9]{%d,}(%s)$" % (_MIN_PREFIX_LEN, "|".join(map(re.escape, suffixes)))
+        )
+        self._token_hits = lru_cache(maxsize=8192)(self._lookup)
+        self._word_hits = lru_cache(maxsize=8192)(self._lookup_word)
+
+    # --------------------------------------------------
+    def scores(self, *raw_inputs: str | None, free_text: str | None = None) -> dict[str, int]:
+        tokens = set()
+        for raw in raw_inputs:
+            if raw:
+                tokens |= _tokenize(raw)
+        words = _tokenize(free_text) - tokens if free_text else ()
+
+        scores = dict.fromkeys(self.categories, 0)
+        for token in tokens:
+            for cat, weight in self._token_hits(token):
+                scores[cat] += weight
+        for word in words:
+            for cat, weight in self._word_hits(word):
+                scores[cat] += weight
+        return scores
 
-    for raw in raw_inputs:
-        if not raw:
-            continue
-        tokens |= _tokenize(raw)
+    def match(self, *raw_inputs: str | None, free_text: str | None = None) -> set[str]:
+        """Every category with at least one keyword hit."""
+        return {cat for cat, score in self.scores(*raw_inputs, free_text=free_text).items() if score > 0}
 
-    if not tokens:
-        return "Uncategorized"
+    def best(self, *raw_inputs: str | None, free_text: str | None = None) -> str:
+        scores = self.scores(*raw_inputs, free_text=free_text)
+        best = max(scores, key=scores.get)
+        return best if scores[best] > 0 else "Uncategorized"
 
-    scores = {cat: 0 for cat in CATEGORY_SYNONYMS}
+    # --------------------------------------------------
+    def _add(self, token: str, cat: str, weight: int):
+        entry = self._index.setdefault(token, {})
+        entry[cat] = entry.get(cat, 0) + weight
 
-    for cat, keywords in CATEGORY_SYNONYMS.items():
-        for kw in keywords:
-            if kw in tokens:
-                scores[cat] += 2
-            # singular match
-            if kw.endswith("s") and kw[:-1] in tokens:
-                scores[cat] += 1
+    def _lookup_word(self, token: str) -> tuple[tuple[str, int], ...]:
+        if token in self._index:
+            return tuple(self._index[token].items())
+        # Unknown word: try its stems
+        for stem in _stems(token):
+            if stem in self._index:
+                return tuple((cat, 1) for cat in self._index[stem])
+        return ()
 
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "Uncategorized"
+    def _lookup(self, token: str) -> tuple[tuple[str, int], ...]:
+        hits = self._lookup_word(token)
+        if hits:
+            return hits
+        # Still unknown: a compound word ending in a keyword
+        for candidate in (token, *_stems(token)):
+            m = self._suffix.match(candidate)
+            if m:
+                return tuple((cat, 1) for cat in self._index[m.group(1)])
+        return ()
+
+
+keyword_matcher = KeywordMatcher(CATEGORY_SYNONYMS)
+
+
+def normalize_category(*raw_inputs: str | None, free_text: str | None = None) -> str:
+    """
+    Robust category normalization using:
+    - tokenization
+    - plural handling / stemming
+    - synonym matching (precompiled inverted index)
+    - confidence scoring
+    `raw_inputs` are label fields (category, type, ...); prose such as the AI
+    description goes in `free_text`, which skips compound-word matching.
+    """
+    return keyword_matcher.best(*raw_inputs, free_text=free_text)
+
+
+def normalize_categories(rows: Iterable[Sequence[str | None]]) -> list[str]:
+    """
+    Batch normalize_category for re-tagging jobs.
+    AI responses repeat heavily, so identical input tuples are scored once.
+    """
+    seen: dict[tuple, str] = {}
+    out = []
+    for row in rows:
+        key = tuple(row)
+        if key not in seen:
+            seen[key] = keyword_matcher.best(*key)
+        out.append(seen[key])
+    return out
 
 
 def normalize_text(text: str | None) -> str | None:
@@ -51,20 +51,21 @@ class FeatureExtractor:
         
         return (l_std, a_std, b_std)
 
-    def process_image(self, image_path: str) -> Dict:
-        """Process image to extract skin, hair, and eye LAB features."""
+    def process_image(self, image_path: str, landmarks=None) -> Dict:
+        """Process image to extract skin, hair, and eye LAB features (reusing `landmarks` if given)."""
         # Load image
         image = cv2.imread(image_path)
         if image is None:
             raise ValueError("Could not load image")
             
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(image_rgb)
-        
-        if not results.multi_face_landmarks:
-            raise ValueError("No face detected")
+        if landmarks is None:
+            results = self.face_mesh.process(image_rgb)
             
-        landmarks = results.multi_face_landmarks[0]
+            if not results.multi_face_landmarks:
+                raise ValueError("No face detected")
+                
+            landmarks = results.multi_face_landmarks[0]
         h, w, _ = image.shape
         
         # Define Regions of Interest (ROI) using Mesh Landmarks
@@ -9,6 +9,7 @@ import math
 from sklearn.cluster import KMeans
 from collections import Counter
 from typing import Dict, Tuple
+from .metrics import span
 
 class EnhancedFeatureExtractor:
     """Production-grade feature extractor with lighting correction"""
@@ -74,38 +75,44 @@ class EnhancedFeatureExtractor:
         
         return (l_std, a_std, b_std)
     
-    def process_image(self, image_path: str, apply_lighting_correction: bool = True) -> Dict:
+    def process_image(self, image_path: str, apply_lighting_correction: bool = True, landmarks=None) -> Dict:
         """
         Process image to extract skin, hair, and eye LAB features
         
         Args:
             image_path: Path to image file
             apply_lighting_correction: Whether to apply CLAHE normalization
+            landmarks: FaceMesh landmarks already found for this image (e.g. by
+                the photo gate); skips running the mesh again
         
         Returns:
             Dict with extracted features
         """
         # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError("Could not load image")
-            
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with span("cv.decode"):
+            image = cv2.imread(image_path)
+            if image is None:
+                raise ValueError("Could not load image")
+                
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
         # Apply lighting correction if enabled
         if apply_lighting_correction:
-            image_rgb_normalized = self.normalize_lighting(image_rgb)
+            with span("cv.clahe"):
+                image_rgb_normalized = self.normalize_lighting(image_rgb)
             print("[INFO] Applied lighting normalization")
         else:
             image_rgb_normalized = image_rgb
         
-        # Process with MediaPipe
-        results = self.face_mesh.process(image_rgb_normalized)
-        
-        if not results.multi_face_landmarks:
-            raise ValueError("No face detected")
+        # Process with MediaPipe (landmarks are normalized, so any scale of this image works)
+        if landmarks is None:
+            with span("cv.facemesh"):
+                results = self.face_mesh.process(image_rgb_normalized)
             
-        landmarks = results.multi_face_landmarks[0]
+            if not results.multi_face_landmarks:
+                raise ValueError("No face detected")
+                
+            landmarks = results.multi_face_landmarks[0]
         h, w, _ = image_rgb_normalized.shape
         
         # 1. SKIN EXTRACTION (Cheek area)
@@ -126,14 +133,16 @@ class EnhancedFeatureExtractor:
             valid_skin = image_rgb_normalized[h//2-20:h//2+20, w//2-20:w//2+20]
             print(f"[DEBUG] Using center fallback")
         
-        skin_l, skin_a, skin_b = self.get_dominant_color(valid_skin)
+        with span("cv.kmeans.skin"):
+            skin_l, skin_a, skin_b = self.get_dominant_color(valid_skin)
         print(f"[DEBUG] Skin LAB: L={skin_l:.1f}, A={skin_a:.1f}, B={skin_b:.1f}")
         
         # 2. EYE EXTRACTION (Iris)
         eye_center = landmarks.landmark[468] 
         ex, ey = int(eye_center.x * w), int(eye_center.y * h)
         eye_crop = image_rgb_normalized[max(0, ey-5):min(h, ey+5), max(0, ex-5):min(w, ex+5)]
-        eye_l, eye_a, eye_b = self.get_dominant_color(eye_crop, k=2)
+        with span("cv.kmeans.eye"):
+            eye_l, eye_a, eye_b = self.get_dominant_color(eye_crop, k=2)
         
         # 3. HAIR EXTRACTION (Multi-point with IMPROVED filtering)
         # Strategy: Sample multiple regions, filter background, use BRIGHTEST valid sample
@@ -166,7 +175,8 @@ class EnhancedFeatureExtractor:
                 continue
             
             # Get color
-            hair_color = self.get_dominant_color(region, k=3)
+            with span("cv.kmeans.hair"):
+                hair_color = self.get_dominant_color(region, k=3)
             
             # Reject if L < 5 (pure black = background) or L > 95 (pure white = background)
             if hair_color[0] < 5 or hair_color[0] > 95:
@@ -3,8 +3,11 @@ Fallback classifier for when Gemini AI is unavailable or returns null.
 Uses simple visual and keyword-based heuristics.
 """
 from PIL import Image
+import numpy as np
 import os
 
+from .clothing_normalizer import keyword_matcher
+
 
 def extract_keywords_from_filename(filename: str) -> list[str]:
     """Extract potential keywords from filename"""
@@ -18,46 +21,36 @@ def extract_keywords_from_filename(filename: str) -> list[str]:
     return [w for w in words if len(w) > 2]
 
 
+# Most distinctive first: "belt bag" is an accessory, "shirt dress" a one-piece
+KEYWORD_PRIORITY = ['Accessory', 'Footwear', 'Outerwear', 'OnePiece', 'Bottom', 'Top']
+
+
 def classify_by_keywords(keywords: list[str]) -> str | None:
     """Classify based on keywords in filename"""
-    keywords_str = ' '.join(keywords)
-    
-    # Accessories
-    if any(k in keywords_str for k in ['bag', 'purse', 'belt', 'jewelry', 'earring', 'necklace', 'hat', 'cap', 'scarf']):
-        return 'Accessory'
-    
-    # Footwear
-    if any(k in keywords_str for k in ['shoe', 'sneaker', 'boot', 'heel', 'sandal', 'loafer']):
-        return 'Footwear'
-    
-    # Outerwear
-    if any(k in keywords_str for k in ['jacket', 'coat', 'hoodie', 'sweater', 'blazer', 'cardigan']):
-        return 'Outerwear'
-    
-    # OnePiece
-    if any(k in keywords_str for k in ['dress', 'gown', 'jumpsuit', 'romper']):
-        return 'OnePiece'
-    
-    # Bottoms
-    if any(k in keywords_str for k in ['pant', 'jean', 'trouser', 'skirt', 'short', 'legging', 'cargo']):
-        return 'Bottom'
-    
-    # Tops
-    if any(k in keywords_str for k in ['shirt', 'top', 'blouse', 'tee', 'tank', 'crop', 'camisole']):
-        return 'Top'
-    
+    matched = keyword_matcher.match(' '.join(keywords))
+    for category in KEYWORD_PRIORITY:
+        if category in matched:
+            return category
     return None
 
 
-def classify_by_aspect_ratio(image_path: str) -> str | None:
+def read_image_size(image_path: str) -> tuple[int, int]:
+    """Width/height from the image header only (no pixel decode)."""
+    with Image.open(image_path) as img:
+        return img.size
+
+
+def classify_by_aspect_ratio(image_path: str, props: dict | None = None) -> str | None:
     """
     VERY conservative shape-based classification.
     Only use for obvious cases.
     """
     try:
-        img = Image.open(image_path)
-        width, height = img.size
-        aspect = width / height if height > 0 else 1.0
+        if props and props['height']:
+            aspect = props['aspect']
+        else:
+            width, height = read_image_size(image_path)
+            aspect = width / height if height > 0 else 1.0
         
         # Very wide objects are often shoes laid side-by-side
         if aspect > 1.8:
@@ -73,29 +66,32 @@ def classify_by_aspect_ratio(image_path: str) -> str | None:
     return None
 
 
+ANALYSIS_SIZE = 100
+CORNER_OFFSET = 5
+
+
 def analyze_image_properties(image_path: str) -> dict:
-    """Analyze basic image properties for classification"""
+    """
+    Analyze basic image properties for classification.
+    The 100x100 RGB thumbnail is returned too so later stages can reuse it
+    instead of decoding the file again.
+    """
     try:
-        img = Image.open(image_path).convert('RGB')
-        width, height = img.size
+        with Image.open(image_path) as img:
+            width, height = img.size
+            # JPEG: let the decoder downscale (1/2..1/8) instead of decoding full size
+            img.draft('RGB', (ANALYSIS_SIZE * 2, ANALYSIS_SIZE * 2))
+            thumb = np.asarray(img.convert('RGB').resize((ANALYSIS_SIZE, ANALYSIS_SIZE)), dtype=np.uint8)
         aspect = width / height if height > 0 else 1.0
         
-        # Resize for faster analysis
-        img_small = img.resize((100, 100))
-        pixels = list(img_small.getdata())
-        
         # Calculate average brightness
-        brightness = sum(sum(p) for p in pixels) / (len(pixels) * 3)
+        brightness = float(thumb.mean())
         
         # Detect if background is very uniform (product photo style)
         # Check corners for similar colors
-        corners = [
-            img_small.getpixel((5, 5)),
-            img_small.getpixel((95, 5)),
-            img_small.getpixel((5, 95)),
-            img_small.getpixel((95, 95))
-        ]
-        corner_variance = sum(abs(c1[i] - c2[i]) for c1 in corners for c2 in corners for i in range(3)) / 12
+        lo, hi = CORNER_OFFSET, ANALYSIS_SIZE - CORNER_OFFSET
+        corners = thumb[[lo, lo, hi, hi], [lo, hi, lo, hi]].astype(np.int16)
+        corner_variance = float(np.abs(corners[:, None, :] - corners[None, :, :]).sum()) / 12
         is_clean_bg = corner_variance < 30
         
         return {
@@ -103,17 +99,19 @@ def analyze_image_properties(image_path: str) -> dict:
             'brightness': brightness,
             'is_clean_bg': is_clean_bg,
             'width': width,
-            'height': height
+            'height': height,
+            'thumb': thumb,
         }
     except:
-        return {'aspect': 1.0, 'brightness': 128, 'is_clean_bg': False, 'width': 0, 'height': 0}
+        return {'aspect': 1.0, 'brightness': 128, 'is_clean_bg': False, 'width': 0, 'height': 0, 'thumb': None}
 
 
-def smart_classify(image_path: str) -> str | None:
+def smart_classify(image_path: str, props: dict | None = None) -> str | None:
     """
     Intelligent classification using multiple signals
     """
-    props = analyze_image_properties(image_path)
+    if props is None:
+        props = analyze_image_properties(image_path)
     aspect = props['aspect']
     
     # Footwear detection (shoes are often wider than tall)
@@ -145,10 +143,15 @@ def smart_classify(image_path: str) -> str | None:
     return None
 
 
-def fallback_classify(image_path: str, filename: str = None) -> str | None:
+_NOT_RUN = object()
+
+
+def fallback_classify(image_path: str, filename: str = None, props: dict | None = None, local_guess=_NOT_RUN) -> str | None:
     """
     Last-resort classifier when AI fails.
-    Returns a category or None.
+    Returns a category or None. Pass `props` from analyze_image_properties
+    and `local_guess` from local_classifier.predict (None included) to avoid
+    decoding the image or running the model again.
     """
     if not filename:
         filename = os.path.basename(image_path)
@@ -161,7 +164,17 @@ def fallback_classify(image_path: str, filename: str = None) -> str | None:
     
     # Try intelligent image analysis
     if os.path.exists(image_path):
-        result = smart_classify(image_path)
+        if props is None:
+            props = analyze_image_properties(image_path)
+
+        # Trained local model beats the hand-written shape rules when it is sure
+        from .local_classifier import local_classifier
+        from ..config import settings
+        guess = local_classifier.predict(image_path, props) if local_guess is _NOT_RUN else local_guess
+        if guess and guess["confidence"] >= settings.LOCAL_CLASSIFIER_THRESHOLD:
+            return guess["category"]
+
+        result = smart_classify(image_path, props)
         if result:
             return result
     
@@ -1,28 +1,130 @@
+import json
 import httpx
+from typing import AsyncIterator
 from ..config import settings
+from .circuit_breaker import grok_breaker
 
-async def get_chat_completion(messages: list) -> str:
-    if not settings.XAI_API_KEY:
-        return "Grok API Key is missing. Please check your .env file."
-        
-    url = "https://api.x.ai/v1/chat/completions"
-    headers = {
+GROK_PATH = "/v1/chat/completions"
+MISSING_KEY_MESSAGE = "Grok API Key is missing. Please check your .env file."
+FAILURE_MESSAGE = "Sorry, I'm having trouble connecting to the stylist brain right now."
+
+
+def _url() -> str:
+    return settings.XAI_BASE_URL.rstrip("/") + GROK_PATH
+
+
+def _headers() -> dict:
+    return {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {settings.XAI_API_KEY}"
     }
-    
+
+
+def _record(response: httpx.Response):
+    """Only outages (5xx) count against the circuit; 4xx are our own mistakes."""
+    if response.status_code >= 500:
+        grok_breaker.record_failure()
+    else:
+        grok_breaker.record_success()
+
+
+async def get_chat_completion(messages: list) -> str:
+    if not settings.XAI_API_KEY:
+        return MISSING_KEY_MESSAGE
+    if not grok_breaker.allow_request():
+        # Fail fast instead of holding the request for a 30s timeout
+        return FAILURE_MESSAGE
+
     payload = {
         "model": settings.XAI_MODEL,
         "messages": messages,
         "stream": False
     }
-    
+
+    recorded = False
     async with httpx.AsyncClient() as client:
         try:
-            response = await client.post(url, json=payload, headers=headers, timeout=30.0)
+            response = await client.post(_url(), json=payload, headers=_headers(), timeout=30.0)
+            _record(response)
+            recorded = True
             response.raise_for_status()
             data = response.json()
             return data["choices"][0]["message"]["content"]
+        except httpx.TransportError as e:
+            grok_breaker.record_failure()
+            recorded = True
+            print(f"Error calling Grok: {e}")
+            return FAILURE_MESSAGE
         except Exception as e:
             print(f"Error calling Grok: {e}")
-            return "Sorry, I'm having trouble connecting to the stylist brain right now."
+            return FAILURE_MESSAGE
+        finally:
+            if not recorded:
+                # Cancelled or failed before Grok answered: free a half-open probe
+                grok_breaker.release()
+
+
+async def stream_chat_completion(messages: list, status: dict | None = None) -> AsyncIterator[str]:
+    """
+    Yields content deltas as Grok emits them (OpenAI-compatible SSE).
+    On failure the apology message is yielded instead, so callers can
+    always persist whatever text was produced.
+
+    `status["finished"]` is set to True only when Grok ends the stream
+    cleanly ([DONE] or a finish_reason); a connection dropped mid-answer
+    leaves it False, so callers can tell a truncated answer from a full one.
+    """
+    if status is None:
+        status = {}
+    status["finished"] = False
+    if not settings.XAI_API_KEY:
+        yield MISSING_KEY_MESSAGE
+        return
+    if not grok_breaker.allow_request():
+        yield FAILURE_MESSAGE
+        return
+
+    payload = {
+        "model": settings.XAI_MODEL,
+        "messages": messages,
+        "stream": True
+    }
+
+    produced = False
+    recorded = False
+    # Connect/first byte must arrive quickly; the full generation may take longer
+    timeout = httpx.Timeout(30.0, read=60.0)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        try:
+            async with client.stream("POST", _url(), json=payload, headers=_headers()) as response:
+                _record(response)
+                recorded = True
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        status["finished"] = True
+                        break
+                    try:
+                        choice = json.loads(data)["choices"][0]
+                        delta = choice.get("delta", {}).get("content")
+                    except (KeyError, IndexError, json.JSONDecodeError):
+                        continue
+                    if delta:
+                        produced = True
+                        yield delta
+                    if choice.get("finish_reason"):
+                        status["finished"] = True
+        except Exception as e:
+            if isinstance(e, httpx.TransportError):
+                grok_breaker.record_failure()
+                recorded = True
+            print(f"Error streaming from Grok: {e}")
+            if not produced:
+                yield FAILURE_MESSAGE
+        finally:
+            if not recorded:
+                # Client disconnected (or a non-HTTP error) before Grok answered
+                grok_breaker.release()
@@ -0,0 +1,192 @@
+"""
+Conditional GETs for the per-user read endpoints.
+
+Each user has a change counter per resource (resource_versions table).
+HttpCacheMiddleware gives every GET under a CACHE_RULES prefix a weak ETag
+built from those counters and the request's path and query string. A
+matching If-None-Match is answered with 304 before the handler runs, so
+the only query is one indexed lookup (users JOIN resource_versions).
+Successful writes (POST/PUT/PATCH/DELETE) under a prefix bump its
+resources after the handler has committed, before the response goes out.
+
+New read endpoints under an existing prefix are covered automatically; a
+new resource only needs a CACHE_RULES entry. Code that changes a user's
+data outside these routes (scripts, background jobs) must call bump() or
+bump_users() before committing, or clients keep getting 304 for stale data.
+"""
+import hashlib
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from .storage import storage
+
+# (path prefix, resources its responses depend on / its writes change); first match wins
+CACHE_RULES = [
+    ("/profile/analyze-photo", ("analysis", "wardrobe")),  # re-matches the wardrobe too
+    ("/profile/analysis", ("analysis",)),
+    ("/profile/palette", ("analysis", "wardrobe")),
+    ("/profile", ("profile",)),
+    ("/wardrobe", ("wardrobe",)),
+]
+READ_METHODS = ("GET", "HEAD")
+
+
+def resources_for(path: str) -> Tuple[str, ...]:
+    for prefix, resources in CACHE_RULES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return resources
+    return ()
+
+
+# -------------------------------------------------
+# Version counters
+# -------------------------------------------------
+
+def bump(db: Session, user_id: int, *resources: str):
+    """Increments the user's counters for `resources` (caller commits)."""
+    for resource in resources:
+        updated = db.execute(
+            update(models.ResourceVersion)
+            .where(models.ResourceVersion.user_id == user_id, models.ResourceVersion.resource == resource)
+            .values(version=models.ResourceVersion.version + 1)
+        ).rowcount
+        if not updated:
+            db.add(models.ResourceVersion(user_id=user_id, resource=resource, version=1))
+            db.flush()
+
+
+def bump_users(db: Session, user_ids: Iterable[int], *resources: str):
+    """bump() for each distinct user, e.g. after a script rewrote many rows (caller commits)."""
+    for user_id in sorted(set(user_ids)):
+        bump(db, user_id, *resources)
+
+
+def _versions(email: str, resources: Iterable[str]) -> Tuple[int, Dict[str, int]] | None:
+    """(user id, {resource: version}) in one query, or None for an unknown user."""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(models.User.id, models.ResourceVersion.resource, models.ResourceVersion.version)
+            .outerjoin(
+                models.ResourceVersion,
+                (models.ResourceVersion.user_id == models.User.id) & models.ResourceVersion.resource.in_(list(resources)),
+            )
+            .filter(models.User.email == email)
+            .all()
+        )
+    finally:
+        db.close()
+    if not rows:
+        return None
+    return rows[0][0], {resource: version for _, resource, version in rows if resource}
+
+
+def _bump_by_email(email: str, resources: Tuple[str, ...]):
+    db = SessionLocal()
+    try:
+        user = db.query(models.User.id).filter(models.User.email == email).first()
+        if user is None:
+            return
+        try:
+            bump(db, user.id, *resources)
+            db.commit()
+        except IntegrityError:
+            # Concurrent first bump inserted the row; the update now applies
+            db.rollback()
+            bump(db, user.id, *resources)
+            db.commit()
+    finally:
+        db.close()
+
+
+def make_etag(user_id: int, versions: Dict[str, int], resources: Tuple[str, ...], path: str, query: bytes) -> str:
+    counters = ".".join(str(versions.get(r, 0)) for r in resources)
+    key = f"{settings.HTTP_CACHE_EPOCH}|{storage.url_epoch()}|{path}?".encode() + query
+    return f'W/"{user_id}-{counters}-{hashlib.sha1(key).hexdigest()[:12]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+# -------------------------------------------------
+# Middleware
+# -------------------------------------------------
+
+class HttpCacheMiddleware:
+    """
+    Pure ASGI. `user_email(authorization_header)` resolves the caller from
+    the bearer token without the auth dependency; anonymous or invalid
+    requests pass straight through (the handler answers 401).
+    """
+
+    def __init__(self, app, user_email):
+        self.app = app
+        self.user_email = user_email
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        resources = resources_for(scope["path"])
+        if not resources:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        email = self.user_email(headers.get(b"authorization", b"").decode("latin-1"))
+        if email is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in READ_METHODS:
+            await self._read(scope, receive, send, headers, email, resources)
+        else:
+            await self._write(scope, receive, send, email, resources)
+
+    async def _read(self, scope, receive, send, headers, email, resources):
+        found = await run_in_threadpool(_versions, email, resources)
+        if found is None:
+            await self.app(scope, receive, send)
+            return
+        etag = make_etag(*found, resources, scope["path"], scope["query_string"])
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"private, no-cache"),
+            (b"vary", b"Authorization"),
+        ]
+
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        if if_none_match and _matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = list(message.get("headers", [])) + cache_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+    async def _write(self, scope, receive, send, email, resources):
+        async def send_after_bump(message):
+            # The handler has committed by the time it starts its response; bumping
+            # here (not after the body) means the client's next read sees the new version
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                await run_in_threadpool(_bump_by_email, email, resources)
+            await send(message)
+
+        await self.app(scope, receive, send_after_bump)
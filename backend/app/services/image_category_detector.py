@@ -1,4 +1,6 @@
 # backend/app/services/image_category_detector.py
+from .clothing_normalizer import keyword_matcher
+
 
 def detect_category_from_image(file_path: str) -> str | None:
     """
@@ -7,19 +9,9 @@ def detect_category_from_image(file_path: str) -> str | None:
     Never Top / Bottom / OnePiece.
     """
 
-    filename = file_path.lower()
-
     # Only footwear is visually reliable
-    footwear_keywords = [
-        "shoe", "shoes", "heel", "heels",
-        "sneaker", "sneakers", "boot", "boots",
-        "sandal", "sandals", "loafer", "loafers",
-        "flat", "flats"
-    ]
-
-    for kw in footwear_keywords:
-        if kw in filename:
-            return "Footwear"
+    if "Footwear" in keyword_matcher.match(file_path):
+        return "Footwear"
 
     # ❌ DO NOT GUESS OTHER CATEGORIES
     return None
@@ -0,0 +1,76 @@
+"""
+Pre-serialized wardrobe item JSON.
+
+Each WardrobeItem keeps its WardrobeItemResponse as a JSON fragment
+(response_json), validated and encoded once whenever the row changes.
+Listings concatenate the fragments into the response body: no json.loads of
+the tag columns, no pydantic objects, no re-serialization per request.
+
+image_url is left out of the fragment and spliced in at read time, because
+presigned storage URLs expire. Code that changes an item's response fields
+must call refresh() (or set response_json to None, rebuilt on next read).
+"""
+import json
+from typing import Iterable, List, Tuple
+
+from .. import models, schemas
+from .storage import storage
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the (slower) fallback
+    orjson = None
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _loads_list(value: str | None) -> list:
+    return json.loads(value) if value else []
+
+
+def build(item: models.WardrobeItem) -> str:
+    """The item's response fields (minus image_url) as validated JSON text."""
+    response = schemas.WardrobeItemResponse(
+        id=item.id,
+        file_path=item.file_path.replace("\\", "/"),
+        category=item.category,
+        subcategory=item.subcategory,
+        type=item.type,
+        color_primary=item.color_primary,
+        color_secondary=None,
+        color_name=item.color_name,
+        pattern=item.pattern,
+        fabric=item.fabric,
+        fit=item.fit,
+        seasonality=_loads_list(item.seasonality),
+        occasion_tags=_loads_list(item.occasion_tags),
+        style_tags=_loads_list(item.style_tags),
+        match_level=item.match_level or "neutral",
+        ai_metadata=json.loads(item.ai_metadata) if item.ai_metadata else None,
+    )
+    return dumps(response.model_dump(mode="json", exclude={"image_url"})).decode()
+
+
+def refresh(item: models.WardrobeItem):
+    """Rebuilds the stored fragment (item must have its id, i.e. be flushed)."""
+    item.response_json = build(item)
+
+
+# -------------------------------------------------
+# Rendering
+# -------------------------------------------------
+
+def render(fragment: str, file_path: str) -> bytes:
+    """Fragment + image_url -> one WardrobeItemResponse object."""
+    body = fragment.encode()
+    return body[:-1] + b',"image_url":' + dumps(storage.url(file_path)) + b"}"
+
+
+def render_list(rows: Iterable[Tuple[str, str]]) -> bytes:
+    """[(fragment, file_path), ...] -> JSON array."""
+    parts: List[bytes] = [render(fragment, file_path) for fragment, file_path in rows]
+    return b"[" + b",".join(parts) + b"]"
@@ -0,0 +1,146 @@
+"""
+Local CPU garment category classifier.
+Cheap image features (shape, background, coarse silhouette, color histogram)
+fed into a softmax linear model trained on already tagged wardrobe items
+(see train_local_classifier.py). Weights are plain JSON so inference needs
+only NumPy and Pillow, and takes a few milliseconds per image.
+"""
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+from PIL import Image
+
+from ..config import settings
+from .fallback_classifier import analyze_image_properties
+
+FEATURE_VERSION = 2
+THUMB_SIZE = 32
+GRID = 8
+HUE_BINS = 12
+
+
+def _features_from_thumb(thumb: np.ndarray, hsv: np.ndarray, width: int, height: int) -> np.ndarray:
+    """thumb/hsv: THUMB_SIZE x THUMB_SIZE x 3 float arrays in [0, 1]."""
+    aspect = width / height if height else 1.0
+
+    # Background = median border color; foreground = pixels far from it
+    border = np.concatenate([thumb[0], thumb[-1], thumb[:, 0], thumb[:, -1]])
+    bg = np.median(border, axis=0)
+    border_spread = float(border.std(axis=0).mean())
+    mask = np.linalg.norm(thumb - bg, axis=2) > 0.15
+
+    # Coarse silhouette: foreground share of each GRID x GRID cell
+    cell = THUMB_SIZE // GRID
+    silhouette = mask.reshape(GRID, cell, GRID, cell).mean(axis=(1, 3)).ravel()
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size and cols.size:
+        bbox_aspect = (cols[-1] - cols[0] + 1) / (rows[-1] - rows[0] + 1)
+    else:
+        bbox_aspect = 1.0
+
+    # Garment color histogram (falls back to the whole image if nothing stands out)
+    weights = mask.ravel().astype(np.float32) if mask.any() else np.ones(mask.size, np.float32)
+    hue, sat, val = hsv[..., 0].ravel(), hsv[..., 1].ravel(), hsv[..., 2].ravel()
+    hue_hist = np.bincount(
+        np.minimum((hue * HUE_BINS).astype(int), HUE_BINS - 1),
+        weights=weights * sat,
+        minlength=HUE_BINS,
+    )
+    hue_hist = hue_hist / (hue_hist.sum() or 1.0)
+
+    scalars = [
+        np.log(aspect),
+        np.log(bbox_aspect),
+        float(thumb.mean()),
+        border_spread,
+        float(border_spread < 0.05),
+        float(mask.mean()),
+        float(np.average(sat, weights=weights)),
+        float(np.average(val, weights=weights)),
+    ]
+    return np.concatenate([scalars, silhouette, hue_hist]).astype(np.float32)
+
+
+def extract_features(image_path: str, props: Dict | None = None) -> np.ndarray | None:
+    """
+    Feature vector for an image, or None if it can't be decoded.
+    Reuses the thumbnail from analyze_image_properties when `props` is given.
+    """
+    if props is None:
+        props = analyze_image_properties(image_path)
+    if props.get("thumb") is None:
+        print(f"⚠️ Local classifier could not read {image_path}")
+        return None
+
+    small = Image.fromarray(props["thumb"]).resize((THUMB_SIZE, THUMB_SIZE), Image.BILINEAR)
+    thumb = np.asarray(small, dtype=np.float32) / 255.0
+    hsv = np.asarray(small.convert("HSV"), dtype=np.float32) / 255.0
+    return _features_from_thumb(thumb, hsv, props["width"], props["height"])
+
+
+class LocalClassifier:
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self._mtime = None
+        self.classes: List[str] = []
+        self._mean = self._scale = self._coef = self._intercept = None
+
+    # --------------------------------------------------
+    def available(self) -> bool:
+        self._load()
+        return self._coef is not None
+
+    def predict(self, image_path: str, props: Dict | None = None) -> Dict | None:
+        """{"category", "confidence", "probs"} or None when no model is trained."""
+        if not self.available():
+            return None
+        features = extract_features(image_path, props)
+        if features is None:
+            return None
+        return self.predict_features(features)
+
+    def predict_features(self, features: np.ndarray) -> Dict:
+        logits = self._coef @ ((features - self._mean) / self._scale) + self._intercept
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return {
+            "category": self.classes[best],
+            "confidence": round(float(probs[best]), 3),
+            "probs": {c: round(float(p), 3) for c, p in zip(self.classes, probs)},
+        }
+
+    # --------------------------------------------------
+    def _load(self):
+        """(Re)loads weights when the JSON file appears or changes."""
+        try:
+            mtime = os.path.getmtime(self.model_path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        try:
+            with open(self.model_path) as f:
+                model = json.load(f)
+            if model.get("feature_version") != FEATURE_VERSION:
+                print(f"⚠️ Local classifier weights are for feature version {model.get('feature_version')}, retrain needed")
+                self._coef = None
+                return
+            self.classes = model["classes"]
+            self._mean = np.asarray(model["mean"], dtype=np.float32)
+            self._scale = np.asarray(model["scale"], dtype=np.float32)
+            self._coef = np.asarray(model["coef"], dtype=np.float32)
+            self._intercept = np.asarray(model["intercept"], dtype=np.float32)
+            print(f"✅ Local classifier loaded ({len(self.classes)} classes, {model.get('samples', '?')} samples)")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Local classifier weights unreadable: {e}")
+            self._coef = None
+
+
+local_classifier = LocalClassifier(settings.LOCAL_CLASSIFIER_PATH)
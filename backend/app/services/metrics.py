@@ -0,0 +1,281 @@
+"""
+Lightweight request/stage timing and Prometheus exposition.
+
+    with span("upload.gemini"):
+        ...
+
+Spans feed a per-stage histogram and, inside a request, the request's trace.
+MetricsMiddleware times every request by route template, reports the stages
+in a Server-Timing header and tags slow requests with their dominant stage
+(largest self time, so nested spans aren't double counted). Service stats
+(cache, scheduler, breakers) are registered as gauges and read at scrape time.
+
+With METRICS_ENABLED=false, span() returns a shared no-op and the middleware
+is not installed.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List
+
+from ..config import settings
+
+ENABLED = settings.METRICS_ENABLED
+PREFIX = "fashion_"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# {"self": {stage: seconds}, "stack": [[stage, started, child_seconds]]} for the current request
+_trace: ContextVar[Dict | None] = ContextVar("metrics_trace", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+# -------------------------------------------------
+# Metric types
+# -------------------------------------------------
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for labelvalues, series in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            inf = _labels(self.labelnames, labelvalues, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in items)
+        return lines
+
+
+request_duration = Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+requests_total = Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+stage_duration = Histogram("stage_duration_seconds", "Duration of instrumented stages (spans).", ("stage",))
+slow_requests = Counter("slow_requests_total", "Requests over METRICS_SLOW_REQUEST_MS by dominant stage.", ("route", "stage"))
+
+_histograms = [request_duration, stage_duration]
+_counters = [requests_total, slow_requests]
+_collectors = []  # (prefix, stats callable, label for top-level keys, {nested key: label})
+
+
+# -------------------------------------------------
+# Spans
+# -------------------------------------------------
+
+class _Span:
+    __slots__ = ("name", "started", "trace")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = _trace.get()
+        self.started = time.perf_counter()
+        if self.trace is not None:
+            self.trace["stack"].append([self.name, self.started, 0.0])
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        child = 0.0
+        if self.trace is not None and self.trace["stack"]:
+            child = self.trace["stack"].pop()[2]
+        _finish(self.name, elapsed, elapsed - child, self.trace)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str):
+    """Context manager timing one stage."""
+    return _Span(name) if ENABLED else _NOOP
+
+
+def record(name: str, seconds: float):
+    """Records a stage timed by the caller (e.g. a region that can't be wrapped in `with`)."""
+    if ENABLED:
+        _finish(name, seconds, seconds, _trace.get())
+
+
+def _finish(name: str, elapsed: float, self_time: float, trace: Dict | None):
+    stage_duration.observe(elapsed, name)
+    if trace is not None:
+        trace["self"][name] = trace["self"].get(name, 0.0) + self_time
+        if trace["stack"]:
+            trace["stack"][-1][2] += elapsed
+
+
+# -------------------------------------------------
+# Gauges from service stats
+# -------------------------------------------------
+
+def register_stats(prefix: str, stats: Callable[[], Dict], label: str | None = None, nested: Dict[str, str] | None = None):
+    """
+    Exposes a stats() dict as gauges at scrape time. Numbers become
+    `<prefix>_<key>`, strings a `<prefix>_<key>{<key>="value"} 1` series.
+    `label`: the dict's top-level keys are values of this label (one stats dict each).
+    `nested`: {key: label} for sub-dicts keyed by a label value (e.g. scheduler lanes).
+    """
+    _collectors.append((prefix, stats, label, nested or {}))
+
+
+def _flatten(data: Dict, prefix: str, labels: Dict, nested: Dict, out: Dict):
+    for key, value in data.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            out.setdefault(name, []).append((labels, value))
+        elif isinstance(value, str):
+            out.setdefault(name, []).append(({**labels, key: value}, 1))
+        elif isinstance(value, dict) and key in nested:
+            for label_value, sub in value.items():
+                _flatten(sub, f"{prefix}_{nested[key]}", {**labels, nested[key]: label_value}, nested, out)
+        elif isinstance(value, dict):
+            _flatten(value, name, labels, nested, out)
+
+
+def _render_gauges() -> List[str]:
+    samples = {}
+    for prefix, stats, label, nested in _collectors:
+        try:
+            data = stats()
+        except Exception as e:
+            print(f"⚠️ Metrics collector {prefix} failed: {e}")
+            continue
+        if label:
+            for label_value, sub in data.items():
+                _flatten(sub, PREFIX + prefix, {label: label_value}, nested, samples)
+        else:
+            _flatten(data, PREFIX + prefix, {}, nested, samples)
+
+    lines = []
+    for name, series in samples.items():
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in series:
+            lines.append(f"{name}{_labels(labels.keys(), labels.values())} {value:g}")
+    return lines
+
+
+def render() -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _histograms + _counters:
+        lines.extend(metric.render())
+    lines.extend(_render_gauges())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# Request middleware
+# -------------------------------------------------
+
+class MetricsMiddleware:
+    """Pure ASGI (streaming responses are timed to their last byte)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = {"self": {}, "stack": []}
+        token = _trace.set(trace)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace["self"]:
+                    timing = ", ".join(f"{k};dur={v * 1000:.1f}" for k, v in trace["self"].items())
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _trace.reset(token)
+            self._observe(scope, status, time.perf_counter() - started, trace)
+
+    @staticmethod
+    def _observe(scope, status: int, elapsed: float, trace: Dict):
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        method = scope["method"]
+        request_duration.observe(elapsed, method, route)
+        requests_total.inc(method, route, str(status))
+
+        if elapsed * 1000 < settings.METRICS_SLOW_REQUEST_MS:
+            return
+        stages = dict(trace["self"])
+        stages["unattributed"] = max(0.0, elapsed - sum(stages.values()))
+        stage, seconds = max(stages.items(), key=lambda kv: kv[1])
+        slow_requests.inc(route, stage)
+        print(f"🐢 Slow request {method} {route}: {elapsed * 1000:.0f}ms, dominant stage {stage} ({seconds * 1000:.0f}ms)")
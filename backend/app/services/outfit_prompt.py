@@ -0,0 +1,86 @@
+"""
+Compact wardrobe inventory encoding for Gemini outfit prompts.
+Candidates are pre-filtered locally (occasion, weather, match level) with the
+outfit solver's scoring, capped per category, and sent as one pipe-separated
+line per item instead of a JSON object for every wardrobe row.
+"""
+import json
+import time
+from typing import Dict, List, Tuple
+
+from .chat_context import estimate_tokens
+from .outfit_solver import outfit_solver, IndexedItem
+
+PROMPT_CANDIDATES_PER_CATEGORY = 8
+PROMPT_MAX_ITEMS = 40
+MAX_TAGS_PER_ITEM = 4
+
+INVENTORY_HEADER = "id|category|name|color|pattern|match|tags"
+
+
+def _field(value) -> str:
+    return str(value).replace("|", "/").strip() if value else "-"
+
+
+def encode_item(item: IndexedItem) -> str:
+    tags = ",".join(sorted(item.tags)[:MAX_TAGS_PER_ITEM])
+    return "|".join([
+        str(item.id),
+        item.category,
+        _field(item.name),
+        _field(item.color_name),
+        _field(item.pattern),
+        item.match_level,
+        _field(tags),
+    ])
+
+
+def select_candidates(user_id: int, wardrobe: List, request: Dict, version: str | None = None) -> List[IndexedItem]:
+    """Best-scored items per category, worst matches only when nothing else exists."""
+    index = outfit_solver.index_for(user_id, wardrobe, version)
+    pool = outfit_solver.candidates(index, request, limit=PROMPT_CANDIDATES_PER_CATEGORY)
+
+    per_category = []
+    for category, scored in pool.items():
+        items = [i for _, i in scored if i.match_level != "worst"] or [i for _, i in scored]
+        per_category.append(items)
+
+    # Round-robin across categories so the cap never starves one of them
+    selected = []
+    for rank in range(PROMPT_CANDIDATES_PER_CATEGORY):
+        for items in per_category:
+            if rank < len(items) and len(selected) < PROMPT_MAX_ITEMS:
+                selected.append(items[rank])
+    return selected
+
+
+def build_outfit_prompt(user_id: int, wardrobe: List, request: Dict, version: str | None = None) -> Tuple[str, Dict]:
+    """Returns the Gemini prompt and size stats for logging."""
+    started = time.perf_counter()
+    candidates = select_candidates(user_id, wardrobe, request, version)
+    inventory = "\n".join([INVENTORY_HEADER] + [encode_item(i) for i in candidates])
+
+    prompt = f"""
+You are a professional fashion stylist.
+
+WARDROBE (pre-filtered candidates, one item per line):
+{inventory}
+
+REQUEST:
+{json.dumps({k: v for k, v in request.items() if k != "variant"})}
+
+RULES:
+- Use ONLY wardrobe items, refer to them by id
+- Build a COMPLETE outfit
+- Either OnePiece OR Top + Bottom
+- MUST include Footwear and Accessory
+- Prefer match "best", avoid "worst"
+- JSON only: {{"outfit_name": str, "items": [{{"item_id": int, "reason": str}}]}}
+"""
+    stats = {
+        "wardrobe_items": len(wardrobe),
+        "candidates": len(candidates),
+        "prompt_tokens": estimate_tokens(prompt),
+        "build_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    return prompt, stats
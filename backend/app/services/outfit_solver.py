@@ -0,0 +1,295 @@
+"""
+Deterministic local outfit solver.
+Scores wardrobe items against the request (palette match level, seasonality
+vs weather, occasion/style tags), keeps the top candidates per category and
+runs a small beam search over outfit slots using pairwise color harmony.
+Candidate pruning keeps the search bounded for wardrobes of any size.
+"""
+import colorsys
+import heapq
+import json
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+
+from .response_cache import wardrobe_version
+
+BASE_TEMPLATES = [["OnePiece"], ["Top", "Bottom"]]
+ALWAYS_REQUIRED = ["Footwear", "Accessory"]
+OPTIONAL = ["Outerwear"]
+
+MATCH_SCORES = {"best": 1.0, "neutral": 0.6, "worst": 0.1}
+
+# Weather keyword -> seasons whose garments suit it
+WEATHER_SEASONS = {
+    "hot": {"summer", "spring"},
+    "warm": {"summer", "spring"},
+    "sunny": {"summer", "spring"},
+    "mild": {"spring", "autumn"},
+    "cool": {"autumn", "spring"},
+    "rain": {"autumn", "spring"},
+    "rainy": {"autumn", "spring"},
+    "cold": {"winter", "autumn"},
+    "snow": {"winter"},
+    "winter": {"winter"},
+    "summer": {"summer"},
+    "spring": {"spring"},
+    "autumn": {"autumn"},
+    "fall": {"autumn"},
+}
+WARM_WEATHER = {"hot", "warm", "sunny", "summer"}
+COLD_WEATHER = {"cold", "snow", "winter", "cool", "rain", "rainy"}
+
+# Scoring weights
+W_MATCH = 0.5
+W_SEASON = 0.2
+W_OCCASION = 0.3
+W_ITEMS = 0.65
+W_HARMONY = 0.35
+DIVERSITY_PENALTY = 0.5
+
+CANDIDATES_PER_CATEGORY = 12
+BEAM_WIDTH = 40
+INDEX_CACHE_SIZE = 256
+
+
+def _tags(raw: str | None) -> frozenset:
+    if not raw:
+        return frozenset()
+    try:
+        values = json.loads(raw)
+    except (TypeError, json.JSONDecodeError):
+        return frozenset()
+    if not isinstance(values, list):
+        return frozenset()
+    return frozenset(str(v).strip().lower() for v in values if v)
+
+
+def _words(*texts: str | None) -> frozenset:
+    words = set()
+    for text in texts:
+        if text:
+            words |= set(text.lower().replace("-", " ").split())
+    return frozenset(words)
+
+
+def _hsv(hex_color: str | None):
+    if not hex_color:
+        return None
+    value = hex_color.strip().lstrip("#")
+    if len(value) != 6:
+        return None
+    try:
+        r, g, b = (int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    except ValueError:
+        return None
+    return colorsys.rgb_to_hsv(r, g, b)
+
+
+def color_compatibility(a, b) -> float:
+    """Pairwise harmony of two HSV colors (0..1)."""
+    if a is None or b is None:
+        return 0.7
+    # Blacks, whites, greys and very muted tones pair with everything
+    if a[1] < 0.18 or a[2] < 0.2 or b[1] < 0.18 or b[2] < 0.2:
+        return 1.0
+    diff = abs(a[0] - b[0]) * 360
+    diff = min(diff, 360 - diff)
+    if diff < 30:
+        return 0.9   # analogous / tonal
+    if diff > 150:
+        return 0.85  # complementary
+    if 100 <= diff <= 140:
+        return 0.7   # triadic
+    return 0.45
+
+
+class IndexedItem:
+    """Wardrobe row with its tags parsed once at index time."""
+
+    __slots__ = ("id", "category", "name", "match_level", "color_name", "pattern", "hsv", "seasons", "tags")
+
+    def __init__(self, item):
+        self.id = item.id
+        self.category = item.category
+        self.name = item.subcategory
+        self.match_level = item.match_level or "neutral"
+        self.color_name = item.color_name
+        self.pattern = item.pattern
+        self.hsv = _hsv(item.color_primary)
+        self.seasons = _tags(item.seasonality)
+        self.tags = _tags(item.occasion_tags) | _tags(item.style_tags)
+
+
+class WardrobeIndex:
+    def __init__(self, items: Iterable):
+        self.by_category: Dict[str, List[IndexedItem]] = {}
+        for item in items:
+            self.by_category.setdefault(item.category, []).append(IndexedItem(item))
+
+    def has(self, category: str) -> bool:
+        return bool(self.by_category.get(category))
+
+
+class OutfitSolver:
+    def __init__(self, candidates_per_category: int = CANDIDATES_PER_CATEGORY, beam_width: int = BEAM_WIDTH):
+        self.candidates_per_category = candidates_per_category
+        self.beam_width = beam_width
+        self._indexes: "OrderedDict[tuple, WardrobeIndex]" = OrderedDict()
+
+    # --------------------------------------------------
+    def index_for(self, user_id: int, wardrobe: List, version: str | None = None) -> WardrobeIndex:
+        """
+        Per-user category index, rebuilt only when the wardrobe changes.
+        Pass `version` (wardrobe_version()) when the caller already has it.
+        """
+        key = (user_id, version or wardrobe_version(wardrobe))
+        index = self._indexes.get(key)
+        if index is None:
+            index = WardrobeIndex(wardrobe)
+            self._indexes[key] = index
+            while len(self._indexes) > INDEX_CACHE_SIZE:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(key)
+        return index
+
+    # --------------------------------------------------
+    def score_item(self, item: IndexedItem, request: Dict) -> float:
+        weather = _words(request.get("weather"))
+        wanted_seasons = set().union(*(WEATHER_SEASONS.get(w, set()) for w in weather)) if weather else set()
+        return self._score(item, wanted_seasons, _words(request.get("occasion"), request.get("vibe")))
+
+    def _score(self, item: IndexedItem, wanted_seasons: set, wanted_tags: frozenset) -> float:
+        match = MATCH_SCORES.get(item.match_level, MATCH_SCORES["neutral"])
+
+        if not wanted_seasons or not item.seasons:
+            season_fit = 0.5
+        else:
+            season_fit = 1.0 if item.seasons & wanted_seasons else 0.0
+
+        if not wanted_tags or not item.tags:
+            occasion_fit = 0.3
+        else:
+            item_words = set()
+            for tag in item.tags:
+                item_words.update(tag.replace("-", " ").split())
+            occasion_fit = min(1.0, len(item_words & wanted_tags) / 2)
+
+        return W_MATCH * match + W_SEASON * season_fit + W_OCCASION * occasion_fit
+
+    def candidates(self, index: WardrobeIndex, request: Dict, exclude: set = frozenset(), limit: int | None = None) -> Dict[str, List[tuple]]:
+        """Top scored (score, item) pairs per category, best first."""
+        weather = _words(request.get("weather"))
+        wanted_seasons = set().union(*(WEATHER_SEASONS.get(w, set()) for w in weather)) if weather else set()
+        wanted_tags = _words(request.get("occasion"), request.get("vibe"))
+
+        result = {}
+        for category, items in index.by_category.items():
+            scored = (
+                (self._score(i, wanted_seasons, wanted_tags), i)
+                for i in items if i.id not in exclude
+            )
+            # Ties break on lowest id so results are deterministic
+            result[category] = heapq.nlargest(
+                limit or self.candidates_per_category, scored, key=lambda s: (s[0], -s[1].id)
+            )
+        return result
+
+    # --------------------------------------------------
+    def solve(
+        self, user_id: int, wardrobe: List, request: Dict, k: int = 1, fixed: Iterable = (), version: str | None = None
+    ) -> List[Dict]:
+        """
+        Returns up to k diverse outfits, best first:
+        {"items": [(score, IndexedItem)], "score": float, "missing": [categories]}.
+        `fixed` items (e.g. picked by Gemini) are always part of the outfit.
+        """
+        index = self.index_for(user_id, wardrobe, version)
+        fixed_ids = {i.id for i in fixed}
+        pinned = [
+            (self.score_item(i, request), i)
+            for items in index.by_category.values() for i in items if i.id in fixed_ids
+        ]
+        pinned_categories = {i.category for _, i in pinned}
+        pool = self.candidates(index, request, exclude=fixed_ids)
+
+        weather = _words(request.get("weather"))
+        want_layer = not (weather & WARM_WEATHER)
+        force_layer = bool(weather & COLD_WEATHER)
+
+        beams, missing = [], []
+        templates = [t for t in BASE_TEMPLATES if all(pool.get(c) or c in pinned_categories for c in t)]
+        if pinned_categories & {"Top", "Bottom"}:
+            # A pinned top or bottom rules out adding a one-piece
+            templates = [t for t in templates if "OnePiece" not in t]
+        if "OnePiece" in pinned_categories or {"Top", "Bottom"} <= pinned_categories:
+            templates = [[]]
+        if not templates:
+            missing += [c for c in ("Top", "Bottom") if c not in pinned_categories]
+            templates = [[]]
+
+        for template in templates:
+            slots = [c for c in template if c not in pinned_categories]
+            for cat in ALWAYS_REQUIRED:
+                if cat in pinned_categories:
+                    continue
+                if pool.get(cat):
+                    slots.append(cat)
+                elif cat not in missing:
+                    missing.append(cat)
+            optional = [c for c in OPTIONAL if c not in pinned_categories and pool.get(c) and want_layer]
+            beams += self._beam_search(pinned, slots, optional, pool, force_layer)
+
+        beams.sort(key=lambda b: (-b[0], [i.id for _, i in b[1]]))
+        outfits = self._diverse(beams, k, fixed_ids)
+        for outfit in outfits:
+            outfit["missing"] = list(missing)
+        return outfits
+
+    # --------------------------------------------------
+    def _objective(self, chosen: List[tuple]) -> float:
+        if not chosen:
+            return 0.0
+        item_mean = sum(s for s, _ in chosen) / len(chosen)
+        pairs = [
+            color_compatibility(a.hsv, b.hsv)
+            for idx, (_, a) in enumerate(chosen) for _, b in chosen[idx + 1:]
+        ]
+        harmony = sum(pairs) / len(pairs) if pairs else 1.0
+        return W_ITEMS * item_mean + W_HARMONY * harmony
+
+    def _beam_search(self, pinned, slots, optional, pool, force_layer) -> List[tuple]:
+        beam = [(self._objective(pinned), list(pinned))]
+        for cat in slots + optional:
+            expanded = []
+            for _, chosen in beam:
+                if cat in optional and not force_layer:
+                    expanded.append((self._objective(chosen), chosen))
+                for candidate in pool[cat]:
+                    outfit = chosen + [candidate]
+                    expanded.append((self._objective(outfit), outfit))
+            expanded.sort(key=lambda b: -b[0])
+            beam = expanded[: self.beam_width]
+        return beam
+
+    def _diverse(self, beams: List[tuple], k: int, fixed_ids: set) -> List[Dict]:
+        """Greedy pick that penalizes reusing items from already selected outfits."""
+        selected, used = [], []
+        remaining = list(beams)
+        while remaining and len(selected) < k:
+            def adjusted(beam):
+                ids = {i.id for _, i in beam[1]} - fixed_ids
+                overlap = max((len(ids & u) / max(len(ids), 1) for u in used), default=0.0)
+                return beam[0] - DIVERSITY_PENALTY * overlap
+
+            best = max(remaining, key=adjusted)
+            remaining.remove(best)
+            ids = {i.id for _, i in best[1]} - fixed_ids
+            if ids in used:
+                continue
+            used.append(ids)
+            selected.append({"items": best[1], "score": round(best[0], 4)})
+        return selected
+
+
+outfit_solver = OutfitSolver()
@@ -41,7 +41,7 @@ PALETTE_DB = {
             {"name": "Olive", "hex": "#808000"}
         ]
     },
-    
+
     # --- AUTUMN ---
     "Deep Autumn": {
         "core": [
@@ -78,17 +78,389 @@ PALETTE_DB = {
              {"name": "Lavender", "hex": "#E6E6FA"}, {"name": "Cool Grey", "hex": "#808080"},
              {"name": "Neon Green", "hex": "#39FF14"}
         ]
+    },
+
+    # --- WINTER ---
+    "Deep Winter": {
+        "core": [
+            {"name": "Jet Black", "hex": "#0A0A0A"}, {"name": "Optic White", "hex": "#F8F8FF"},
+            {"name": "Blackened Navy", "hex": "#1B1F3B"}, {"name": "Burgundy", "hex": "#800020"},
+            {"name": "Blood Red", "hex": "#8A0303"}, {"name": "Deep Emerald", "hex": "#046307"},
+            {"name": "Spruce", "hex": "#0B4F3F"}, {"name": "Deep Plum", "hex": "#580F41"},
+            {"name": "Indigo", "hex": "#2E0854"}, {"name": "Cobalt", "hex": "#0047AB"},
+            {"name": "Deep Teal", "hex": "#004953"}, {"name": "Raspberry", "hex": "#B3124F"},
+            {"name": "Charcoal", "hex": "#2F2F33"}, {"name": "Icy Grey", "hex": "#DDE3E8"},
+            {"name": "Royal Purple", "hex": "#4B0082"}
+        ],
+        "accent": [
+            {"name": "Crimson", "hex": "#B0001E"}, {"name": "Cerise", "hex": "#DE3163"},
+            {"name": "Electric Indigo", "hex": "#3F00FF"}, {"name": "Jade", "hex": "#00A86B"},
+            {"name": "Lapis", "hex": "#26619C"}, {"name": "Amethyst", "hex": "#7B3F9E"},
+            {"name": "Peacock Blue", "hex": "#005F73"}, {"name": "Wine", "hex": "#5E0B1A"},
+            {"name": "Icy Lilac", "hex": "#E4DDF4"}, {"name": "Lemon Ice", "hex": "#F6F7C4"}
+        ],
+        "neutral": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Soft White", "hex": "#F4F4F2"},
+            {"name": "Charcoal", "hex": "#36454F"}, {"name": "Ink Navy", "hex": "#101A33"},
+            {"name": "Espresso Black", "hex": "#231A17"}, {"name": "Graphite", "hex": "#474A51"},
+            {"name": "Steel Grey", "hex": "#71797E"}, {"name": "Dark Taupe", "hex": "#483C32"},
+            {"name": "Pewter", "hex": "#8E9297"}, {"name": "Cool Stone", "hex": "#B8B8B4"}
+        ],
+        "luxury": [
+            {"name": "Platinum", "hex": "#E5E4E2"}, {"name": "Black Pearl", "hex": "#1E272C"},
+            {"name": "Emerald", "hex": "#046307"}, {"name": "Garnet", "hex": "#733635"},
+            {"name": "Tanzanite", "hex": "#3F3A8C"}
+        ],
+        "worst": [
+            {"name": "Peach", "hex": "#FFDAB9"}, {"name": "Camel", "hex": "#C19A6B"},
+            {"name": "Orange", "hex": "#FFA500"}, {"name": "Dusty Pink", "hex": "#D8A9A9"},
+            {"name": "Khaki", "hex": "#C3B091"}
+        ]
+    },
+
+    "Bright Winter": {
+        "core": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Snow White", "hex": "#FFFAFA"},
+            {"name": "True Red", "hex": "#E0001B"}, {"name": "Hot Pink", "hex": "#FF1493"},
+            {"name": "Royal Blue", "hex": "#3A5FCD"}, {"name": "Kelly Green", "hex": "#00A550"},
+            {"name": "Bright Turquoise", "hex": "#08E8DE"}, {"name": "Violet", "hex": "#8F00FF"},
+            {"name": "Cobalt", "hex": "#0047AB"}, {"name": "Emerald", "hex": "#009B77"},
+            {"name": "Lemon Yellow", "hex": "#FFF44F"}, {"name": "Navy", "hex": "#000080"},
+            {"name": "Fuchsia", "hex": "#FF00FF"}, {"name": "Icy Aqua", "hex": "#D4F6F6"},
+            {"name": "Cool Charcoal", "hex": "#333842"}
+        ],
+        "accent": [
+            {"name": "Scarlet", "hex": "#FF2400"}, {"name": "Shocking Pink", "hex": "#FC0FC0"},
+            {"name": "Electric Blue", "hex": "#0892D0"}, {"name": "Spring Green", "hex": "#00FF7F"},
+            {"name": "Ultramarine", "hex": "#120A8F"}, {"name": "Purple", "hex": "#9400D3"},
+            {"name": "Cyan", "hex": "#00FFFF"}, {"name": "Magenta", "hex": "#FF0090"},
+            {"name": "Chartreuse", "hex": "#DFFF00"}, {"name": "Icy Pink", "hex": "#FCE4EC"}
+        ],
+        "neutral": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Pure White", "hex": "#FFFFFF"},
+            {"name": "Charcoal", "hex": "#36454F"}, {"name": "Navy", "hex": "#1F2A44"},
+            {"name": "Medium Grey", "hex": "#8A8D91"}, {"name": "Light Grey", "hex": "#D3D3D3"},
+            {"name": "Cool Taupe", "hex": "#8B8589"}, {"name": "Slate", "hex": "#5A6370"},
+            {"name": "Ink", "hex": "#16161D"}, {"name": "Silver Grey", "hex": "#C0C0C0"}
+        ],
+        "luxury": [
+            {"name": "Diamond", "hex": "#B9F2FF"}, {"name": "White Gold", "hex": "#F2F0E6"},
+            {"name": "Ruby", "hex": "#E0115F"}, {"name": "Sapphire", "hex": "#0F52BA"},
+            {"name": "Emerald", "hex": "#50C878"}
+        ],
+        "worst": [
+            {"name": "Dusty Rose", "hex": "#C4A4A7"}, {"name": "Mushroom", "hex": "#B5A89A"},
+            {"name": "Olive", "hex": "#808000"}, {"name": "Rust", "hex": "#B7410E"},
+            {"name": "Oatmeal", "hex": "#D8CDB9"}
+        ]
+    },
+
+    # --- SUMMER ---
+    "True Summer": {
+        "core": [
+            {"name": "Soft White", "hex": "#F5F5F0"}, {"name": "Slate Blue", "hex": "#6A7BA2"},
+            {"name": "Powder Blue", "hex": "#B0C4DE"}, {"name": "Cornflower", "hex": "#6495ED"},
+            {"name": "Rose Pink", "hex": "#E7A1B0"}, {"name": "Raspberry Sorbet", "hex": "#C25A7C"},
+            {"name": "Watermelon", "hex": "#E35D6A"}, {"name": "Lavender", "hex": "#B57EDC"},
+            {"name": "Soft Plum", "hex": "#8E4585"}, {"name": "Sea Green", "hex": "#5E9C8F"},
+            {"name": "Spruce Blue", "hex": "#4A6F84"}, {"name": "Denim", "hex": "#5B7DB1"},
+            {"name": "Blue Grey", "hex": "#7393B3"}, {"name": "Cocoa Rose", "hex": "#9E6B6B"},
+            {"name": "Navy", "hex": "#2C3E63"}
+        ],
+        "accent": [
+            {"name": "Strawberry", "hex": "#D5536F"}, {"name": "Orchid", "hex": "#C27BA0"},
+            {"name": "Periwinkle", "hex": "#8C9FE0"}, {"name": "Aqua", "hex": "#7FC7C4"},
+            {"name": "Mint", "hex": "#A8D8C0"}, {"name": "Lilac", "hex": "#C8A2C8"},
+            {"name": "Berry", "hex": "#8A3B5C"}, {"name": "Teal Blue", "hex": "#367588"},
+            {"name": "Lemon Sorbet", "hex": "#F3EBA5"}, {"name": "Sky", "hex": "#87AFD8"}
+        ],
+        "neutral": [
+            {"name": "Soft White", "hex": "#F5F5F0"}, {"name": "Dove Grey", "hex": "#B4B6B8"},
+            {"name": "Pewter", "hex": "#8E9297"}, {"name": "Charcoal Blue", "hex": "#4A5463"},
+            {"name": "Greyed Navy", "hex": "#3B4A66"}, {"name": "Rose Beige", "hex": "#D6C3BE"},
+            {"name": "Cool Taupe", "hex": "#9A8F8A"}, {"name": "Blue Grey", "hex": "#7A8B99"},
+            {"name": "Cocoa", "hex": "#6E5A57"}, {"name": "Stone", "hex": "#C9C5BF"}
+        ],
+        "luxury": [
+            {"name": "Silver", "hex": "#C0C0C0"}, {"name": "Pearl", "hex": "#EAE0C8"},
+            {"name": "Rose Quartz", "hex": "#F7CAC9"}, {"name": "Aquamarine", "hex": "#7FFFD4"},
+            {"name": "Blue Topaz", "hex": "#6EAFD0"}
+        ],
+        "worst": [
+            {"name": "Orange", "hex": "#FFA500"}, {"name": "Black", "hex": "#000000"},
+            {"name": "Mustard", "hex": "#FFDB58"}, {"name": "Rust", "hex": "#B7410E"},
+            {"name": "Golden Brown", "hex": "#996515"}
+        ]
+    },
+
+    "Light Summer": {
+        "core": [
+            {"name": "Soft White", "hex": "#F7F7F2"}, {"name": "Baby Blue", "hex": "#A7C7E7"},
+            {"name": "Powder Pink", "hex": "#F4C2C2"}, {"name": "Lavender", "hex": "#D8BFD8"},
+            {"name": "Periwinkle", "hex": "#C3CDE6"}, {"name": "Light Aqua", "hex": "#A8DCD9"},
+            {"name": "Mint", "hex": "#BDE5D4"}, {"name": "Soft Rose", "hex": "#E8A0A8"},
+            {"name": "Sky Blue", "hex": "#87CEEB"}, {"name": "Lilac", "hex": "#C8A2C8"},
+            {"name": "Cornflower", "hex": "#7F9FD8"}, {"name": "Seafoam", "hex": "#9FD8C5"},
+            {"name": "Light Lemon", "hex": "#F6F1A8"}, {"name": "Soft Navy", "hex": "#4D5D7E"},
+            {"name": "Blue Grey", "hex": "#8FA3B8"}
+        ],
+        "accent": [
+            {"name": "Watermelon", "hex": "#F28B8B"}, {"name": "Orchid", "hex": "#DA70D6"},
+            {"name": "Hydrangea", "hex": "#9DB4E0"}, {"name": "Pink Lemonade", "hex": "#F5A3B4"},
+            {"name": "Light Teal", "hex": "#78C5C0"}, {"name": "Wisteria", "hex": "#C9A0DC"},
+            {"name": "Robin's Egg", "hex": "#96DED1"}, {"name": "Sweet Pea", "hex": "#E5A9C9"},
+            {"name": "Pastel Violet", "hex": "#CB99C9"}, {"name": "Ice Blue", "hex": "#D6ECF3"}
+        ],
+        "neutral": [
+            {"name": "Soft White", "hex": "#F7F7F2"}, {"name": "Light Grey", "hex": "#D3D3D3"},
+            {"name": "Dove Grey", "hex": "#B4B6B8"}, {"name": "Light Taupe", "hex": "#CBBEB5"},
+            {"name": "Rose Beige", "hex": "#E3D1CB"}, {"name": "Pewter", "hex": "#9EA1A5"},
+            {"name": "Light Navy", "hex": "#5B6A8A"}, {"name": "Stone", "hex": "#CFCAC2"},
+            {"name": "Cool Mushroom", "hex": "#A8A09A"}, {"name": "Sky Grey", "hex": "#BCC6CC"}
+        ],
+        "luxury": [
+            {"name": "Pearl", "hex": "#F0EAD6"}, {"name": "Silver", "hex": "#C0C0C0"},
+            {"name": "Moonstone", "hex": "#D6DDE4"}, {"name": "Pink Tourmaline", "hex": "#F2A7C3"},
+            {"name": "Aquamarine", "hex": "#A4D8D8"}
+        ],
+        "worst": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Dark Brown", "hex": "#654321"},
+            {"name": "Orange", "hex": "#FF8C00"}, {"name": "Olive", "hex": "#808000"},
+            {"name": "Burgundy", "hex": "#800020"}
+        ]
+    },
+
+    "Soft Summer": {
+        "core": [
+            {"name": "Oyster", "hex": "#E3DED3"}, {"name": "Dusty Rose", "hex": "#C4A4A7"},
+            {"name": "Mauve", "hex": "#A57C8E"}, {"name": "Soft Teal", "hex": "#5F8A8B"},
+            {"name": "Sage", "hex": "#9CAF88"}, {"name": "Slate Blue", "hex": "#6D7F9A"},
+            {"name": "Grey Blue", "hex": "#7D8FA3"}, {"name": "Plum Grey", "hex": "#7E6577"},
+            {"name": "Raspberry Mousse", "hex": "#A85C74"}, {"name": "Denim Blue", "hex": "#607B9B"},
+            {"name": "Spruce", "hex": "#4F6F6B"}, {"name": "Soft Lavender", "hex": "#AFA4C6"},
+            {"name": "Blue Spruce", "hex": "#56737A"}, {"name": "Rose Brown", "hex": "#8F6F6F"},
+            {"name": "Charcoal Blue", "hex": "#4A5563"}
+        ],
+        "accent": [
+            {"name": "Berry", "hex": "#8E4D6B"}, {"name": "Soft Cherry", "hex": "#B5525E"},
+            {"name": "Sea Glass", "hex": "#8FB8AE"}, {"name": "Hyacinth", "hex": "#8C8DBF"},
+            {"name": "Dusty Aqua", "hex": "#7FA8A8"}, {"name": "Heather", "hex": "#9E8FA8"},
+            {"name": "Jade Grey", "hex": "#6E9483"}, {"name": "Powder Plum", "hex": "#A78AA3"},
+            {"name": "Soft Periwinkle", "hex": "#94A0CC"}, {"name": "Soft Lemon", "hex": "#E8E3A9"}
+        ],
+        "neutral": [
+            {"name": "Oyster", "hex": "#E3DED3"}, {"name": "Mushroom", "hex": "#B5A89A"},
+            {"name": "Rose Taupe", "hex": "#A08883"}, {"name": "Pewter", "hex": "#8E9297"},
+            {"name": "Charcoal", "hex": "#4A4A4F"}, {"name": "Cocoa", "hex": "#705E59"},
+            {"name": "Greige", "hex": "#B7AFA3"}, {"name": "Smoky Navy", "hex": "#3E4A61"},
+            {"name": "Stone Grey", "hex": "#9A9A94"}, {"name": "Soft White", "hex": "#EEEBE3"}
+        ],
+        "luxury": [
+            {"name": "Pewter", "hex": "#96A8A1"}, {"name": "Brushed Silver", "hex": "#B8B8B8"},
+            {"name": "Grey Pearl", "hex": "#D2CFC8"}, {"name": "Rose Quartz", "hex": "#E3BCC1"},
+            {"name": "Jade", "hex": "#7BA05B"}
+        ],
+        "worst": [
+            {"name": "Pure White", "hex": "#FFFFFF"}, {"name": "Black", "hex": "#000000"},
+            {"name": "Orange", "hex": "#FFA500"}, {"name": "Neon Pink", "hex": "#FF6EC7"},
+            {"name": "Bright Yellow", "hex": "#FFEF00"}
+        ]
+    },
+
+    # --- AUTUMN ---
+    "True Autumn": {
+        "core": [
+            {"name": "Cream", "hex": "#FFFDD0"}, {"name": "Camel", "hex": "#C19A6B"},
+            {"name": "Rust", "hex": "#B7410E"}, {"name": "Pumpkin", "hex": "#FF7518"},
+            {"name": "Olive", "hex": "#708238"}, {"name": "Moss", "hex": "#8A9A5B"},
+            {"name": "Mustard", "hex": "#E1AD01"}, {"name": "Tomato", "hex": "#E0422B"},
+            {"name": "Terracotta", "hex": "#E2725B"}, {"name": "Teal", "hex": "#1B7A7A"},
+            {"name": "Forest Green", "hex": "#2E5E3A"}, {"name": "Chocolate", "hex": "#5C3317"},
+            {"name": "Golden Brown", "hex": "#996515"}, {"name": "Marigold", "hex": "#EAA221"},
+            {"name": "Brick", "hex": "#9C4A2F"}
+        ],
+        "accent": [
+            {"name": "Paprika", "hex": "#C0392B"}, {"name": "Saffron", "hex": "#F4C430"},
+            {"name": "Jade", "hex": "#00A86B"}, {"name": "Peacock Teal", "hex": "#006D6F"},
+            {"name": "Salmon", "hex": "#FA8072"}, {"name": "Copper", "hex": "#B87333"},
+            {"name": "Persimmon", "hex": "#EC5800"}, {"name": "Avocado", "hex": "#568203"},
+            {"name": "Aubergine", "hex": "#5B2C3B"}, {"name": "Turquoise", "hex": "#30B5A8"}
+        ],
+        "neutral": [
+            {"name": "Cream", "hex": "#FFFDD0"}, {"name": "Ivory", "hex": "#FFFFF0"},
+            {"name": "Camel", "hex": "#C19A6B"}, {"name": "Khaki", "hex": "#C3B091"},
+            {"name": "Tan", "hex": "#D2B48C"}, {"name": "Coffee", "hex": "#6F4E37"},
+            {"name": "Warm Taupe", "hex": "#A48D76"}, {"name": "Olive Grey", "hex": "#85856B"},
+            {"name": "Chocolate", "hex": "#5C3317"}, {"name": "Warm Charcoal", "hex": "#4A4440"}
+        ],
+        "luxury": [
+            {"name": "Gold", "hex": "#D4AF37"}, {"name": "Bronze", "hex": "#CD7F32"},
+            {"name": "Amber", "hex": "#FFBF00"}, {"name": "Tiger's Eye", "hex": "#E08D3C"},
+            {"name": "Citrine", "hex": "#E4D00A"}
+        ],
+        "worst": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Icy Blue", "hex": "#F0FFFF"},
+            {"name": "Fuchsia", "hex": "#FF00FF"}, {"name": "Cool Grey", "hex": "#808080"},
+            {"name": "Royal Blue", "hex": "#4169E1"}
+        ]
+    },
+
+    "Soft Autumn": {
+        "core": [
+            {"name": "Warm Oatmeal", "hex": "#D8CDB9"}, {"name": "Sage", "hex": "#9CAF88"},
+            {"name": "Olive Khaki", "hex": "#8B8A5C"}, {"name": "Soft Teal", "hex": "#5F9EA0"},
+            {"name": "Salmon Pink", "hex": "#E5998C"}, {"name": "Dusty Coral", "hex": "#D08A7A"},
+            {"name": "Terracotta", "hex": "#C0785C"}, {"name": "Camel", "hex": "#C19A6B"},
+            {"name": "Moss", "hex": "#7E8B5A"}, {"name": "Muted Jade", "hex": "#6F9A8D"},
+            {"name": "Cinnamon", "hex": "#A0623A"}, {"name": "Soft Mustard", "hex": "#C9A94E"},
+            {"name": "Rosewood", "hex": "#8E5A5A"}, {"name": "Spruce", "hex": "#4F6F5E"},
+            {"name": "Mushroom", "hex": "#A39484"}
+        ],
+        "accent": [
+            {"name": "Peach", "hex": "#F2B891"}, {"name": "Soft Rust", "hex": "#B5664A"},
+            {"name": "Warm Aqua", "hex": "#7FB3A6"}, {"name": "Celadon", "hex": "#ACE1AF"},
+            {"name": "Dusty Plum", "hex": "#7E5A6B"}, {"name": "Soft Pumpkin", "hex": "#D98C5F"},
+            {"name": "Honey", "hex": "#D6A756"}, {"name": "Lichen", "hex": "#98A68A"},
+            {"name": "Soft Turquoise", "hex": "#6FB3B0"}, {"name": "Cocoa Rose", "hex": "#9E6B6B"}
+        ],
+        "neutral": [
+            {"name": "Oatmeal", "hex": "#D8CDB9"}, {"name": "Ecru", "hex": "#E6DCC8"},
+            {"name": "Stone", "hex": "#B8AE9C"}, {"name": "Mushroom", "hex": "#A39484"},
+            {"name": "Taupe", "hex": "#8B7D6B"}, {"name": "Milk Chocolate", "hex": "#84563C"},
+            {"name": "Olive Grey", "hex": "#85856B"}, {"name": "Soft Charcoal", "hex": "#555149"},
+            {"name": "Warm Grey", "hex": "#8C8680"}, {"name": "Cocoa", "hex": "#6F5B4B"}
+        ],
+        "luxury": [
+            {"name": "Brushed Gold", "hex": "#C9AE5D"}, {"name": "Rose Gold", "hex": "#B76E79"},
+            {"name": "Jade", "hex": "#7BA05B"}, {"name": "Smoky Topaz", "hex": "#9B7653"},
+            {"name": "Moss Agate", "hex": "#8A9A5B"}
+        ],
+        "worst": [
+            {"name": "Pure White", "hex": "#FFFFFF"}, {"name": "Black", "hex": "#000000"},
+            {"name": "Fuchsia", "hex": "#FF00FF"}, {"name": "Royal Blue", "hex": "#4169E1"},
+            {"name": "Icy Pink", "hex": "#FFB6C1"}
+        ]
+    },
+
+    # --- SPRING ---
+    "True Spring": {
+        "core": [
+            {"name": "Ivory", "hex": "#FFFFF0"}, {"name": "Coral", "hex": "#FF7F50"},
+            {"name": "Golden Yellow", "hex": "#FFD700"}, {"name": "Warm Turquoise", "hex": "#40E0D0"},
+            {"name": "Apple Green", "hex": "#8DB600"}, {"name": "Poppy Red", "hex": "#E35335"},
+            {"name": "Tangerine", "hex": "#F28500"}, {"name": "Kelly Green", "hex": "#4CBB17"},
+            {"name": "Aqua", "hex": "#00C4B0"}, {"name": "Periwinkle", "hex": "#7B8FD8"},
+            {"name": "Warm Pink", "hex": "#F88379"}, {"name": "Camel", "hex": "#C19A6B"},
+            {"name": "Light Navy", "hex": "#3B4F7A"}, {"name": "Lime", "hex": "#BFFF00"},
+            {"name": "Clear Teal", "hex": "#00A5A5"}
+        ],
+        "accent": [
+            {"name": "Watermelon", "hex": "#FC6C85"}, {"name": "Mango", "hex": "#FFA62B"},
+            {"name": "Daffodil", "hex": "#FFFF31"}, {"name": "Lagoon", "hex": "#34C6CD"},
+            {"name": "Spring Green", "hex": "#00FF7F"}, {"name": "Violet", "hex": "#8F79D8"},
+            {"name": "Persimmon", "hex": "#EC5800"}, {"name": "Geranium", "hex": "#DA3D58"},
+            {"name": "Jade", "hex": "#00A86B"}, {"name": "Honey", "hex": "#EBA937"}
+        ],
+        "neutral": [
+            {"name": "Ivory", "hex": "#FFFFF0"}, {"name": "Cream", "hex": "#FFFDD0"},
+            {"name": "Camel", "hex": "#C19A6B"}, {"name": "Golden Beige", "hex": "#E8D3A9"},
+            {"name": "Light Tan", "hex": "#D6B98C"}, {"name": "Milk Chocolate", "hex": "#84563C"},
+            {"name": "Warm Grey", "hex": "#A39C8F"}, {"name": "Light Navy", "hex": "#3B4F7A"},
+            {"name": "Caramel", "hex": "#AF6E4D"}, {"name": "Buff", "hex": "#F0DC82"}
+        ],
+        "luxury": [
+            {"name": "Yellow Gold", "hex": "#FFD700"}, {"name": "Coral", "hex": "#FF7F50"},
+            {"name": "Turquoise", "hex": "#40E0D0"}, {"name": "Peridot", "hex": "#B4C424"},
+            {"name": "Citrine", "hex": "#E4D00A"}
+        ],
+        "worst": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Burgundy", "hex": "#800020"},
+            {"name": "Charcoal", "hex": "#36454F"}, {"name": "Dusty Mauve", "hex": "#A57C8E"},
+            {"name": "Cool Grey", "hex": "#808080"}
+        ]
+    },
+
+    "Light Spring": {
+        "core": [
+            {"name": "Warm White", "hex": "#FFF8E7"}, {"name": "Peach", "hex": "#FFE5B4"},
+            {"name": "Light Coral", "hex": "#F08080"}, {"name": "Buttercup", "hex": "#F9E29C"},
+            {"name": "Mint", "hex": "#98FF98"}, {"name": "Light Aqua", "hex": "#93E9BE"},
+            {"name": "Periwinkle", "hex": "#CCCCFF"}, {"name": "Salmon", "hex": "#FFA07A"},
+            {"name": "Warm Pink", "hex": "#F7A8B8"}, {"name": "Light Turquoise", "hex": "#AFEEEE"},
+            {"name": "Pistachio", "hex": "#BEDC8C"}, {"name": "Apricot", "hex": "#FBCEB1"},
+            {"name": "Sky Blue", "hex": "#87CEEB"}, {"name": "Light Camel", "hex": "#D8B68E"},
+            {"name": "Soft Violet", "hex": "#B6A3D9"}
+        ],
+        "accent": [
+            {"name": "Melon", "hex": "#FDBCB4"}, {"name": "Lemon", "hex": "#FFF44F"},
+            {"name": "Aquamarine", "hex": "#7FFFD4"}, {"name": "Light Poppy", "hex": "#FF8F77"},
+            {"name": "Spring Green", "hex": "#A7E99C"}, {"name": "Cornflower", "hex": "#9ABAF2"},
+            {"name": "Blush", "hex": "#F4B6C2"}, {"name": "Light Gold", "hex": "#F3D677"},
+            {"name": "Lilac", "hex": "#D3B7E8"}, {"name": "Lagoon", "hex": "#6FD6D0"}
+        ],
+        "neutral": [
+            {"name": "Warm White", "hex": "#FFF8E7"}, {"name": "Cream", "hex": "#FFFDD0"},
+            {"name": "Light Camel", "hex": "#D8B68E"}, {"name": "Sand", "hex": "#E2CA9E"},
+            {"name": "Light Warm Grey", "hex": "#C8C1B4"}, {"name": "Golden Beige", "hex": "#E8D3A9"},
+            {"name": "Light Navy", "hex": "#5A6E9A"}, {"name": "Stone", "hex": "#D1C7B5"},
+            {"name": "Milk Coffee", "hex": "#B08968"}, {"name": "Bisque", "hex": "#FFE4C4"}
+        ],
+        "luxury": [
+            {"name": "Light Gold", "hex": "#EED58C"}, {"name": "Cream Pearl", "hex": "#F5EBDC"},
+            {"name": "Morganite", "hex": "#F3C3B2"}, {"name": "Aquamarine", "hex": "#A4E4D7"},
+            {"name": "Peridot", "hex": "#C9DD6B"}
+        ],
+        "worst": [
+            {"name": "Black", "hex": "#000000"}, {"name": "Burgundy", "hex": "#800020"},
+            {"name": "Dark Brown", "hex": "#3D2B1F"}, {"name": "Charcoal", "hex": "#36454F"},
+            {"name": "Deep Purple", "hex": "#4B0082"}
+        ]
+    },
+
+    "Bright Spring": {
+        "core": [
+            {"name": "Bright White", "hex": "#FDFDFB"}, {"name": "Hot Coral", "hex": "#FF5A4E"},
+            {"name": "Bright Turquoise", "hex": "#00E0D0"}, {"name": "Emerald", "hex": "#00A550"},
+            {"name": "Lemon", "hex": "#FFF200"}, {"name": "Poppy", "hex": "#F43A2E"},
+            {"name": "Cobalt", "hex": "#1F5FD6"}, {"name": "Hot Pink", "hex": "#FF3E96"},
+            {"name": "Tangerine", "hex": "#FF8C00"}, {"name": "Lime", "hex": "#A4DE02"},
+            {"name": "Violet", "hex": "#8A5CF5"}, {"name": "Aqua", "hex": "#00CED1"},
+            {"name": "Navy", "hex": "#1B2A6B"}, {"name": "Charcoal", "hex": "#3A3A3C"},
+            {"name": "Warm Red", "hex": "#E32636"}
+        ],
+        "accent": [
+            {"name": "Neon Coral", "hex": "#FF6F61"}, {"name": "Electric Teal", "hex": "#00B3B3"},
+            {"name": "Sunflower", "hex": "#FFC512"}, {"name": "Jade", "hex": "#00A86B"},
+            {"name": "Fuchsia", "hex": "#F0259B"}, {"name": "Electric Blue", "hex": "#2F7FFF"},
+            {"name": "Chartreuse", "hex": "#C7EA46"}, {"name": "Orange", "hex": "#FF7F00"},
+            {"name": "Purple", "hex": "#7F3FBF"}, {"name": "Watermelon", "hex": "#FC6C85"}
+        ],
+        "neutral": [
+            {"name": "Bright White", "hex": "#FDFDFB"}, {"name": "Ivory", "hex": "#FFFFF0"},
+            {"name": "Black", "hex": "#101010"}, {"name": "Charcoal", "hex": "#3A3A3C"},
+            {"name": "Navy", "hex": "#1B2A6B"}, {"name": "Camel", "hex": "#C19A6B"},
+            {"name": "Medium Grey", "hex": "#8F8F8C"}, {"name": "Chocolate", "hex": "#5C3317"},
+            {"name": "Light Grey", "hex": "#D6D6D3"}, {"name": "Warm Taupe", "hex": "#A48D76"}
+        ],
+        "luxury": [
+            {"name": "Bright Gold", "hex": "#FFD700"}, {"name": "Polished Silver", "hex": "#D8D8D8"},
+            {"name": "Emerald", "hex": "#50C878"}, {"name": "Ruby", "hex": "#E0115F"},
+            {"name": "Paraiba", "hex": "#00C5CD"}
+        ],
+        "worst": [
+            {"name": "Dusty Rose", "hex": "#C4A4A7"}, {"name": "Mushroom", "hex": "#B5A89A"},
+            {"name": "Muted Olive", "hex": "#7A7A52"}, {"name": "Mauve", "hex": "#A57C8E"},
+            {"name": "Greige", "hex": "#B7AFA3"}
+        ]
     }
-    # (Other subtypes would be defined here, filling minimally for now to satisfy Deep Autumn test case)
 }
 
-# Fallback for undefined subtypes (Generic Season)
+# Fallback for undefined subtypes: the season's "True" subtype
 GENERIC_PALETTES = {
     "Winter": PALETTE_DB["True Winter"],
-    "Autumn": PALETTE_DB["Deep Autumn"],
-    # Placeholders for others to prevent errors
-    "Spring": PALETTE_DB["Deep Autumn"], # Fallback
-    "Summer": PALETTE_DB["True Winter"]  # Fallback
+    "Summer": PALETTE_DB["True Summer"],
+    "Autumn": PALETTE_DB["True Autumn"],
+    "Spring": PALETTE_DB["True Spring"],
 }
 
 def get_static_palette(season: str, subtype: str) -> Dict:
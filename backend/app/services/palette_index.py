@@ -0,0 +1,236 @@
+"""
+Compiled palette index: every PALETTE_DB colour as CIE Lab (D65) in NumPy
+arrays, built once at import, with a vectorized CIEDE2000 colour difference.
+
+    palette_index.nearest(["#8B4513"], "Deep Autumn", k=3)
+    palette_index.match_levels(item_hexes, best, neutral, worst)
+
+Matching picks the palette colour with the smallest ΔE2000; if it is within
+MATCH_DELTA_E its group decides the level, otherwise the item is "neutral".
+Stored user palettes (best/neutral/worst lists) are compiled on first use and
+memoized, so re-matching a whole wardrobe is one (items x palette) array op.
+"""
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .palette_db import PALETTE_DB, get_static_palette
+
+# ΔE2000 under which an item counts as "that palette colour" (2.3 is a
+# just-noticeable difference; ~12 is still the same colour family)
+MATCH_DELTA_E = 12.0
+
+# PALETTE_DB group -> match level. Order matters for exact ties (best wins).
+GROUP_LEVELS = {"core": "best", "accent": "best", "luxury": "best", "worst": "worst", "neutral": "neutral"}
+LEVEL_ORDER = ("best", "worst", "neutral")
+
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_POW25_7 = 25.0 ** 7
+
+
+# -------------------------------------------------
+# Colour conversion
+# -------------------------------------------------
+
+def parse_hex(hex_color: str | None) -> Tuple[int, int, int] | None:
+    """'#AABBCC' / 'AABBCC' -> (r, g, b), or None if it isn't a 6-digit hex colour."""
+    if not hex_color or not isinstance(hex_color, str):
+        return None
+    value = hex_color.strip().lstrip("#")
+    if len(value) != 6:
+        return None
+    try:
+        return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+    except ValueError:
+        return None
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) sRGB 0-255 -> (..., 3) CIE Lab (D65)."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = (c @ _RGB_TO_XYZ.T) / _D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def delta_e_2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """
+    CIEDE2000 (kL = kC = kH = 1) between broadcastable (..., 3) Lab arrays,
+    e.g. (N, 1, 3) against (1, M, 3) gives the (N, M) distance matrix.
+    """
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_bar7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + _POW25_7)))
+    a1p, a2p = a1 * (1 + g), a2 * (1 + g)
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = c2p - c1p
+    chroma_zero = (c1p * c2p) == 0
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(chroma_zero, 0.0, dhp)
+    dHp = 2 * np.sqrt(c1p * c2p) * np.sin(np.radians(dhp) / 2)
+
+    Lp_bar = (L1 + L2) / 2
+    Cp_bar = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    hp_bar = np.where(
+        chroma_zero, h_sum,
+        np.where(np.abs(h1p - h2p) <= 180, h_sum / 2, np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2)),
+    )
+
+    t = (1 - 0.17 * np.cos(np.radians(hp_bar - 30)) + 0.24 * np.cos(np.radians(2 * hp_bar))
+         + 0.32 * np.cos(np.radians(3 * hp_bar + 6)) - 0.20 * np.cos(np.radians(4 * hp_bar - 63)))
+    d_theta = 30 * np.exp(-(((hp_bar - 275) / 25) ** 2))
+    cp_bar7 = Cp_bar ** 7
+    r_c = 2 * np.sqrt(cp_bar7 / (cp_bar7 + _POW25_7))
+    l_term = (Lp_bar - 50) ** 2
+    s_l = 1 + 0.015 * l_term / np.sqrt(20 + l_term)
+    s_c = 1 + 0.045 * Cp_bar
+    s_h = 1 + 0.015 * Cp_bar * t
+    r_t = -np.sin(np.radians(2 * d_theta)) * r_c
+
+    dl, dc, dh = dLp / s_l, dCp / s_c, dHp / s_h
+    return np.sqrt(dl * dl + dc * dc + dh * dh + r_t * dc * dh)
+
+
+# -------------------------------------------------
+# Compiled palettes
+# -------------------------------------------------
+
+class CompiledPalette:
+    """One palette's colours as a Lab array plus parallel entry/level lists."""
+
+    __slots__ = ("lab", "entries", "levels")
+
+    def __init__(self, entries: List[Dict], levels: List[str]):
+        rgb = [parse_hex(e["hex"]) for e in entries]
+        self.entries = entries
+        self.levels = levels
+        self.lab = rgb_to_lab(np.array(rgb, dtype=np.float64).reshape(-1, 3))
+
+    def distances(self, query_lab: np.ndarray) -> np.ndarray:
+        """(N, 3) Lab -> (N, len(palette)) ΔE2000."""
+        return delta_e_2000(query_lab[:, None, :], self.lab[None, :, :])
+
+
+def _grouped_entries(groups: Dict[str, List]) -> Tuple[List[Dict], List[str]]:
+    """Flattens {group: [colours]} in LEVEL_ORDER, dropping entries without a valid hex."""
+    entries, levels = [], []
+    for level in LEVEL_ORDER:
+        for group, colours in groups.items():
+            if GROUP_LEVELS.get(group, group) != level:
+                continue
+            for colour in colours or []:
+                hex_color = (colour.get("hex") or colour.get("color")) if isinstance(colour, dict) else colour
+                rgb = parse_hex(hex_color)
+                if rgb is None:
+                    continue
+                name = colour.get("name") if isinstance(colour, dict) else None
+                entries.append({"name": name or "#%02X%02X%02X" % rgb, "hex": "#%02X%02X%02X" % rgb, "group": group})
+                levels.append(level)
+    return entries, levels
+
+
+class PaletteIndex:
+    def __init__(self, palettes: Dict[str, Dict[str, List]]):
+        self.subtypes = {name: CompiledPalette(*_grouped_entries(groups)) for name, groups in palettes.items()}
+
+    # --------------------------------------------------
+    def resolve(self, season: str | None, subtype: str | None) -> str:
+        """Subtype whose palette get_static_palette would serve (season fallback)."""
+        if subtype in self.subtypes:
+            return subtype
+        palette = get_static_palette(season, subtype)
+        return next(name for name, groups in PALETTE_DB.items() if groups is palette)
+
+    def nearest(self, hexes: Sequence[str], subtype: str, k: int = 1) -> List[List[Dict]]:
+        """
+        The k closest colours of `subtype`'s palette for each query colour,
+        as [{name, hex, group, level, delta_e}]. Invalid hexes get [].
+        """
+        palette = self.subtypes.get(subtype)
+        if palette is None:
+            raise KeyError(subtype)
+        lab, valid = _query_lab(hexes)
+        results = [[] for _ in hexes]
+        if not valid.any():
+            return results
+
+        distances = palette.distances(lab)
+        k = max(1, min(k, len(palette.entries)))
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        for row, query_index in enumerate(np.flatnonzero(valid)):
+            results[query_index] = [
+                {**palette.entries[j], "level": palette.levels[j], "delta_e": round(float(distances[row, j]), 2)}
+                for j in order[row]
+            ]
+        return results
+
+    def match_levels(self, hexes: Sequence[str | None], best: List, neutral: List, worst: List) -> List[str]:
+        """best/neutral/worst for each item colour against a stored user palette."""
+        palette = _compile_user_palette(_palette_key(best), _palette_key(neutral), _palette_key(worst))
+        return _match(palette, hexes)
+
+    def match_levels_for_subtype(self, hexes: Sequence[str | None], subtype: str) -> List[str]:
+        """Like match_levels, against a PALETTE_DB subtype (accent/luxury count as best)."""
+        return _match(self.subtypes[subtype], hexes)
+
+
+def _query_lab(hexes: Sequence[str | None]) -> Tuple[np.ndarray, np.ndarray]:
+    rgb = [parse_hex(h) for h in hexes]
+    valid = np.array([c is not None for c in rgb], dtype=bool)
+    lab = rgb_to_lab(np.array([c for c in rgb if c is not None], dtype=np.float64).reshape(-1, 3))
+    return lab, valid
+
+
+def _match(palette: CompiledPalette, hexes: Sequence[str | None]) -> List[str]:
+    levels = ["neutral"] * len(hexes)
+    if not len(palette.entries):
+        return levels
+    lab, valid = _query_lab(hexes)
+    if not valid.any():
+        return levels
+
+    distances = palette.distances(lab)
+    closest = distances.argmin(axis=1)  # first minimum = LEVEL_ORDER precedence on ties
+    matched = distances[np.arange(len(closest)), closest] < MATCH_DELTA_E
+    for row, query_index in enumerate(np.flatnonzero(valid)):
+        if matched[row]:
+            levels[query_index] = palette.levels[closest[row]]
+    return levels
+
+
+def _palette_key(colours: List) -> Tuple:
+    """Hashable form of a stored colour list (for the compile cache)."""
+    key = []
+    for colour in colours or []:
+        if isinstance(colour, dict):
+            key.append((colour.get("hex") or colour.get("color"), colour.get("name")))
+        else:
+            key.append((colour, None))
+    return tuple(key)
+
+
+@lru_cache(maxsize=256)
+def _compile_user_palette(best: Tuple, neutral: Tuple, worst: Tuple) -> CompiledPalette:
+    groups = {
+        level: [{"hex": hex_color, "name": name} for hex_color, name in colours if isinstance(hex_color, str)]
+        for level, colours in (("best", best), ("neutral", neutral), ("worst", worst))
+    }
+    return CompiledPalette(*_grouped_entries(groups))
+
+
+palette_index = PaletteIndex(PALETTE_DB)
@@ -0,0 +1,131 @@
+"""
+Fast reject gate for analysis photos.
+Runs cheap checks in tiers and stops at the first one that fails, so an
+unusable photo costs milliseconds instead of a full quality check and
+feature extraction:
+
+  1. header    - dimensions/aspect from the file header, no pixel decode
+  2. thumbnail - brightness and blur on a ~128 px thumbnail
+  3. face      - FaceMesh on the bounded analysis image
+
+The FaceMesh landmarks are normalized (0-1), so they are handed to the
+feature extractor instead of running the mesh a second time.
+"""
+import time
+from typing import Dict
+
+import cv2
+from PIL import Image
+
+from .photo_quality import load_analysis_image
+
+MIN_SIDE = 150
+MAX_PIXELS = 50_000_000
+MAX_ASPECT = 3.0
+
+THUMB_SIDE = 128
+MIN_BRIGHTNESS = 25
+MAX_BRIGHTNESS = 235
+MIN_CONTRAST = 10
+# Laplacian variance at thumbnail scale; sharp phone photos land in the
+# hundreds, heavily defocused ones under ~20
+MIN_THUMB_SHARPNESS = 25
+
+
+class PhotoRejected(Exception):
+    """Raised by analyze_user_style() for a photo the gate rejected; `reason` is user-facing."""
+
+    def __init__(self, gate: Dict):
+        super().__init__(gate["reason"])
+        self.gate = gate
+        self.reason = gate["reason"]
+
+
+class PhotoGate:
+    def __init__(self, face_mesh):
+        self.face_mesh = face_mesh
+
+    # --------------------------------------------------
+    def check(self, image_path: str) -> Dict:
+        """
+        Returns {
+            'passed': bool,
+            'tier': str (the tier that rejected, or the last one run),
+            'reason': str | None,
+            'metrics': Dict,
+            'landmarks': FaceMesh landmarks of the first face, or None,
+            'timings_ms': Dict
+        }
+        """
+        result = {"passed": False, "tier": "header", "reason": None, "metrics": {}, "landmarks": None, "timings_ms": {}}
+        metrics = result["metrics"]
+
+        # 1. HEADER
+        started = time.perf_counter()
+        try:
+            with Image.open(image_path) as img:
+                w, h = img.size
+        except Exception:
+            return self._reject(result, started, "Could not read image - upload a JPEG, PNG or WebP photo")
+        metrics["width"], metrics["height"] = w, h
+        if min(w, h) < MIN_SIDE:
+            return self._reject(result, started, f"Photo too small ({w}x{h}) - use at least {MIN_SIDE}px on each side")
+        if w * h > MAX_PIXELS:
+            return self._reject(result, started, f"Photo too large ({w}x{h})")
+        if max(w, h) / min(w, h) > MAX_ASPECT:
+            return self._reject(result, started, "Unusual aspect ratio - use a regular portrait photo, not a panorama or screenshot")
+        self._lap(result, started)
+
+        # 2. THUMBNAIL
+        result["tier"] = "thumbnail"
+        started = time.perf_counter()
+        image = load_analysis_image(image_path)
+        if image is None:
+            return self._reject(result, started, "Could not decode image")
+        thumb_scale = THUMB_SIDE / max(image.shape[:2])
+        thumb = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if thumb_scale < 1:
+            thumb = cv2.resize(thumb, None, fx=thumb_scale, fy=thumb_scale, interpolation=cv2.INTER_AREA)
+
+        mean, std = cv2.meanStdDev(thumb)
+        brightness, contrast = float(mean[0, 0]), float(std[0, 0])
+        _, lap_std = cv2.meanStdDev(cv2.Laplacian(thumb, cv2.CV_32F))
+        sharpness = float(lap_std[0, 0]) ** 2
+        metrics.update(brightness=brightness, contrast=contrast, thumb_sharpness=sharpness)
+
+        if brightness < MIN_BRIGHTNESS:
+            return self._reject(result, started, f"Photo too dark (brightness: {brightness:.1f}/255)")
+        if brightness > MAX_BRIGHTNESS:
+            return self._reject(result, started, f"Photo overexposed (brightness: {brightness:.1f}/255)")
+        if contrast < MIN_CONTRAST:
+            return self._reject(result, started, "Photo is almost uniform - make sure your face is in frame")
+        if sharpness < MIN_THUMB_SHARPNESS:
+            return self._reject(result, started, "Photo too blurry - hold the camera steady and tap to focus")
+        self._lap(result, started)
+
+        # 3. FACE
+        result["tier"] = "face"
+        started = time.perf_counter()
+        mesh = self.face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if not mesh.multi_face_landmarks:
+            return self._reject(result, started, "No face detected - face the camera with your face clearly visible")
+        result["landmarks"] = mesh.multi_face_landmarks[0]
+        self._lap(result, started)
+
+        result["passed"] = True
+        return result
+
+    @staticmethod
+    def summary(result: Dict) -> Dict:
+        """The gate result without landmarks (JSON-serializable)."""
+        return {k: v for k, v in result.items() if k != "landmarks"}
+
+    # --------------------------------------------------
+    @staticmethod
+    def _lap(result: Dict, started: float):
+        result["timings_ms"][result["tier"]] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _reject(self, result: Dict, started: float, reason: str) -> Dict:
+        self._lap(result, started)
+        result["reason"] = reason
+        return result
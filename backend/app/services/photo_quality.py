@@ -4,8 +4,78 @@ Validates photo quality before analysis to ensure accurate results
 """
 import cv2
 import numpy as np
+from PIL import Image
 from typing import Dict, List, Tuple
 
+ANALYSIS_MAX_SIDE = 512
+DETECT_MAX_SIDE = 320
+# Decoding a bit under ANALYSIS_MAX_SIDE is fine if it buys a coarser JPEG reduction
+MIN_DECODE_RATIO = 0.75
+
+# cv2.imread flags that let libjpeg decode at 1/8, 1/4 or 1/2 scale
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+_face_cascade = None
+
+
+def load_analysis_image(image_path: str, max_side: int = ANALYSIS_MAX_SIDE) -> np.ndarray | None:
+    """
+    BGR image no larger than `max_side`, decoded at reduced scale when possible.
+    The header is read first (no pixel decode) to pick the largest reduction
+    that still leaves at least MIN_DECODE_RATIO * max_side pixels.
+    """
+    flag = cv2.IMREAD_COLOR
+    try:
+        with Image.open(image_path) as img:
+            longest = max(img.size)
+        for factor, reduced in _REDUCED_FLAGS:
+            if longest // factor >= max_side * MIN_DECODE_RATIO:
+                flag = reduced
+                break
+    except Exception:
+        pass  # let OpenCV try on its own
+
+    image = cv2.imread(image_path, flag)
+    if image is None:
+        return None
+    h, w = image.shape[:2]
+    if max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        image = cv2.resize(image, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+    return image
+
+
+def mean_saturation(image: np.ndarray) -> float:
+    """Mean HSV saturation (OpenCV 0-255 scale) from max/min channels, without an HSV copy."""
+    b, g, r = cv2.split(image)
+    high = cv2.max(cv2.max(b, g), r)
+    low = cv2.min(cv2.min(b, g), r)
+    # S = 255 * (max - min) / max; OpenCV's divide yields 0 where max == 0
+    return float(cv2.mean(cv2.divide(cv2.subtract(high, low), high, scale=255))[0])
+
+
+def detect_faces(gray: np.ndarray, max_side: int = DETECT_MAX_SIDE) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Haar face boxes on a further reduced copy; returns (faces, (width, height)) of that copy.
+    Faces under 1/6 of the short side are far below min_face_size, so they aren't searched for.
+    """
+    global _face_cascade
+    if _face_cascade is None:
+        _face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+    h, w = gray.shape
+    if max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        gray = cv2.resize(gray, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+    h, w = gray.shape
+    min_side = min(h, w) // 6
+    return _face_cascade.detectMultiScale(gray, 1.15, 4, minSize=(min_side, min_side)), (w, h)
+
+
 class PhotoQualityChecker:
     """Validates photo quality for color season analysis"""
     
@@ -28,9 +98,11 @@ class PhotoQualityChecker:
             'warnings': List[str],
             'metrics': Dict
         }
+        Metrics are computed on a downscale bounded by ANALYSIS_MAX_SIDE, so
+        they don't depend on camera resolution.
         """
         try:
-            image = cv2.imread(image_path)
+            image = load_analysis_image(image_path)
             if image is None:
                 return {
                     'is_valid': False,
@@ -48,9 +120,13 @@ class PhotoQualityChecker:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             h, w = gray.shape
             
+            # Mean and std in one pass (brightness, contrast, lighting uniformity)
+            mean, std = cv2.meanStdDev(gray)
+            avg_brightness = float(mean[0, 0])
+            contrast = float(std[0, 0])
+            
             # 1. BRIGHTNESS CHECK
-            avg_brightness = np.mean(gray)
-            metrics['brightness'] = float(avg_brightness)
+            metrics['brightness'] = avg_brightness
             
             if avg_brightness < self.quality_thresholds['min_brightness']:
                 issues.append(f"Photo too dark (brightness: {avg_brightness:.1f}/255)")
@@ -62,17 +138,17 @@ class PhotoQualityChecker:
                 warnings.append("Photo is slightly bright - avoid direct flash")
             
             # 2. CONTRAST CHECK
-            contrast = gray.std()
-            metrics['contrast'] = float(contrast)
+            metrics['contrast'] = contrast
             
             if contrast < self.quality_thresholds['min_contrast']:
                 issues.append(f"Low contrast (contrast: {contrast:.1f}) - photo appears washed out")
             elif contrast < 40:
                 warnings.append("Moderate contrast - natural lighting recommended")
             
-            # 3. BLUR DETECTION (Laplacian variance)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            metrics['sharpness'] = float(laplacian_var)
+            # 3. BLUR DETECTION (Laplacian variance, float32 is plenty for 8-bit input)
+            _, lap_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+            laplacian_var = float(lap_std[0, 0]) ** 2
+            metrics['sharpness'] = laplacian_var
             
             if laplacian_var < self.quality_thresholds['max_blur']:
                 issues.append(f"Photo too blurry (sharpness: {laplacian_var:.1f})")
@@ -80,24 +156,22 @@ class PhotoQualityChecker:
                 warnings.append("Photo slightly blurry - hold camera steady")
             
             # 4. COLOR SATURATION CHECK
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            saturation = hsv[:, :, 1].mean()
-            metrics['saturation'] = float(saturation)
+            saturation = mean_saturation(image)
+            metrics['saturation'] = saturation
             
             if saturation < 30:
                 warnings.append("Low color saturation - avoid filters/heavy editing")
             
             # 5. LIGHTING UNIFORMITY
             # Check if lighting is too uneven (harsh shadows)
-            brightness_std = gray.std()
-            metrics['lighting_uniformity'] = float(brightness_std)
+            brightness_std = contrast
+            metrics['lighting_uniformity'] = brightness_std
             
             if brightness_std > 70:
                 warnings.append("Uneven lighting detected - use diffused/natural light")
             
-            # 6. FACE DETECTION (basic check)
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+            # 6. FACE DETECTION (basic check, at reduced scale)
+            faces, (dw, dh) = detect_faces(gray)
             
             if len(faces) == 0:
                 issues.append("No face detected - ensure face is clearly visible")
@@ -106,7 +180,7 @@ class PhotoQualityChecker:
             else:
                 # Check face size
                 (x, y, fw, fh) = faces[0]
-                face_area = (fw * fh) / (w * h)
+                face_area = (fw * fh) / (dw * dh)
                 metrics['face_coverage'] = float(face_area)
                 
                 if face_area < self.quality_thresholds['min_face_size']:
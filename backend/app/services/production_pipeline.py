@@ -6,7 +6,7 @@ import os
 from typing import Dict, Optional
 from .photo_quality import PhotoQualityChecker
 from .cv_engine_enhanced import EnhancedFeatureExtractor
-from .style_analysis import analyze_user_style as legacy_analyze
+from .style_analysis import analyze_user_style as legacy_analyze, photo_gate
 
 class ProductionAnalysisPipeline:
     """
@@ -24,7 +24,9 @@ class ProductionAnalysisPipeline:
         force_analysis: bool = False
     ) -> Dict:
         """
-        Perform complete analysis with quality pre-check
+        Perform complete analysis with quality pre-check.
+        A tiered gate rejects unusable photos first; its landmarks are reused
+        by feature extraction.
         
         Args:
             file_path: Path to uploaded photo
@@ -34,6 +36,20 @@ class ProductionAnalysisPipeline:
             Complete analysis result with quality metadata
         """
         
+        # Step 0: Fast reject gate (header -> thumbnail -> face)
+        gate = photo_gate.check(file_path)
+        landmarks = gate["landmarks"]
+        
+        if not gate["passed"]:
+            print(f"❌ Rejected at {gate['tier']} tier in {sum(gate['timings_ms'].values()):.1f}ms: {gate['reason']}")
+            if not force_analysis:
+                return {
+                    "success": False,
+                    "error": gate["reason"],
+                    "gate": photo_gate.summary(gate),
+                    "recommendations": self.quality_checker.get_photo_recommendations()
+                }
+        
         # Step 1: Photo Quality Check
         print("="*60)
         print("STEP 1: Photo Quality Assessment")
@@ -77,7 +93,8 @@ class ProductionAnalysisPipeline:
             # Use enhanced extractor with lighting correction
             features = self.enhanced_extractor.process_image(
                 file_path, 
-                apply_lighting_correction=True
+                apply_lighting_correction=True,
+                landmarks=landmarks
             )
             
             print(f"✅ Extraction successful")
@@ -102,7 +119,8 @@ class ProductionAnalysisPipeline:
             # Use the existing style_analysis with extracted features
             analysis_result = legacy_analyze(
                 file_path=file_path,
-                manual_signal=None  # Let it use CV extraction
+                manual_signal=None,  # Let it use CV extraction
+                gate=gate  # already checked (and possibly forced past): don't gate again
             )
             
             print(f"✅ Classification: {analysis_result['season']} - {analysis_result['season_subtype']}")
@@ -117,6 +135,7 @@ class ProductionAnalysisPipeline:
             analysis_result['original_confidence'] = analysis_result['confidence_score']
             analysis_result['confidence_score'] = adjusted_confidence
             analysis_result['photo_quality_score'] = quality_result['quality_score']
+            analysis_result['gate'] = photo_gate.summary(gate)
             analysis_result['success'] = True
             
             # Add quality warnings to explanation
@@ -0,0 +1,203 @@
+"""
+Opt-in per-request profiler.
+A request carrying `X-Profile: 1` from an admin runs under pyinstrument
+(statistical sampler, async-aware) if it is installed, otherwise cProfile.
+The report is written to PROFILE_DIR as an artifact keyed by a request id,
+returned in the `X-Profile-Id` response header, and listed by /admin/profiles.
+
+Requests without the header go straight to the app, so there is no cost
+when profiling isn't asked for. Only the event-loop thread is profiled:
+sync handlers running in the threadpool show up as the await on them.
+Both profilers hook the interpreter globally, so one request is profiled
+at a time; a profile request arriving meanwhile is served unprofiled.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional; cProfile is the fallback
+    Profiler = None
+
+PROFILE_HEADER = b"x-profile"
+REQUEST_ID_HEADER = b"x-request-id"
+PROFILE_ID = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+TOP_FUNCTIONS = 40
+
+# held while a request is being profiled; never waited on
+_profiling = threading.Lock()
+
+
+class ProfileStore:
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+
+    # --------------------------------------------------
+    def save(self, profile_id: str, meta: Dict, report: str, extension: str, raw: bytes | None = None):
+        os.makedirs(self.directory, exist_ok=True)
+        meta["artifact"] = f"{profile_id}{extension}"
+        with open(self._path(profile_id, extension), "w", encoding="utf-8") as f:
+            f.write(report)
+        if raw is not None:
+            with open(self._path(profile_id, ".prof"), "wb") as f:
+                f.write(raw)
+        with open(self._path(profile_id, ".json"), "w") as f:
+            json.dump(meta, f)
+        self._prune()
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        """Metadata of the newest profiles first."""
+        entries = []
+        for path in self._meta_files()[:limit]:
+            try:
+                with open(path) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def artifact(self, profile_id: str) -> str | None:
+        """Path of the human-readable report, or None."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, ".json")) as f:
+                name = json.load(f)["artifact"]
+        except (OSError, ValueError, KeyError):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.exists(path) else None
+
+    # --------------------------------------------------
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}{extension}")
+
+    def _meta_files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        with os.scandir(self.directory) as entries:
+            metas = [e for e in entries if e.name.endswith(".json")]
+        metas.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [e.path for e in metas]
+
+    def _prune(self):
+        for meta_path in self._meta_files()[self.keep:]:
+            stem = meta_path[: -len(".json")]
+            for extension in (".json", ".html", ".txt", ".prof"):
+                try:
+                    os.remove(stem + extension)
+                except FileNotFoundError:
+                    pass
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_KEEP)
+
+
+def _header(scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI. `is_admin(authorization_header)` decides who may profile;
+    other requests with the header are served normally, unprofiled.
+    """
+
+    def __init__(self, app, is_admin: Callable[[str | None], bool]):
+        self.app = app
+        self.is_admin = is_admin
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _header(scope, PROFILE_HEADER) not in ("1", "true"):
+            await self.app(scope, receive, send)
+            return
+        if not self.is_admin(_header(scope, b"authorization")):
+            await self.app(scope, receive, send)
+            return
+
+        if Profiler is not None:
+            profiler = Profiler(interval=settings.PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+            engine, extension = "pyinstrument", ".html"
+            start, stop = profiler.start, profiler.stop
+        else:
+            profiler = cProfile.Profile()
+            engine, extension = "cprofile", ".txt"
+            start, stop = profiler.enable, profiler.disable
+
+        if not _profiling.acquire(blocking=False):
+            print("⚠️ Profiler busy with another request; serving unprofiled")
+            await self.app(scope, receive, send)
+            return
+
+        requested = _header(scope, REQUEST_ID_HEADER)
+        profile_id = requested if requested and PROFILE_ID.match(requested) else uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            start()
+        except BaseException:
+            _profiling.release()
+            raise
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            stop()
+            _profiling.release()
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "engine": engine,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            # rendering and file writes stay off the event loop
+            await run_in_threadpool(self._save, profile_id, meta, profiler, extension)
+
+    @staticmethod
+    def _save(profile_id: str, meta: Dict, profiler, extension: str):
+        try:
+            raw = None
+            if isinstance(profiler, cProfile.Profile):
+                report = io.StringIO()
+                stats = pstats.Stats(profiler, stream=report)
+                stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+                report = report.getvalue()
+                # pstats can only dump to a file; keep the binary for snakeviz/pstats
+                tmp = os.path.join(profile_store.directory, f".{profile_id}.prof")
+                os.makedirs(profile_store.directory, exist_ok=True)
+                stats.dump_stats(tmp)
+                with open(tmp, "rb") as f:
+                    raw = f.read()
+                os.remove(tmp)
+            else:
+                report = profiler.output_html()
+            profile_store.save(profile_id, meta, report, extension, raw)
+            print(f"🔎 Profiled {meta['method']} {meta['path']} ({meta['duration_ms']}ms) -> {profile_id}")
+        except OSError as e:
+            print(f"⚠️ Could not save profile {profile_id}: {e}")
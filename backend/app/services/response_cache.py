@@ -0,0 +1,197 @@
+"""
+LLM response cache for stylist chat and outfit generation.
+Keys are built from the normalized prompt context (message/request, season
+subtype, wardrobe version), so repeated questions skip the Grok/Gemini call.
+Entries live in a small in-memory LRU backed by SQLite, with TTL expiry and
+LRU eviction on both layers. Async callers use aget/aset: memory hits are
+answered inline, SQLite reads and writes run in the threadpool.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+
+MEMORY_ENTRIES = 256
+
+
+def normalize_message(text: str | None) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = (text or "").lower()
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    return " ".join(text.split())
+
+
+def wardrobe_version(items: Iterable) -> str:
+    """Stable hash of the wardrobe attributes that influence AI output."""
+    rows = sorted(
+        (
+            i.id,
+            i.category or "",
+            i.subcategory or "",
+            i.match_level or "",
+            i.color_primary or "",
+            i.color_name or "",
+            i.pattern or "",
+            i.occasion_tags or "",
+            i.style_tags or "",
+            i.seasonality or "",
+        )
+        for i in items
+    )
+    return hashlib.sha1(json.dumps(rows).encode()).hexdigest()
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    raw = json.dumps([namespace, *parts], sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+class ResponseCache:
+    def __init__(self, db_path: str, ttl_seconds: int, max_entries: int, memory_entries: int = MEMORY_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_used"
+            " ON llm_response_cache (last_used)"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------
+    def get(self, key: str) -> str | None:
+        value = self._memory_hit(key)
+        if value is not None:
+            return value
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                self._conn.execute(
+                    "UPDATE llm_response_cache SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self._remember(key, row[1], row[0])
+                self.hits += 1
+                return row[0]
+
+            if row or entry:
+                self._forget(key)
+            self.misses += 1
+            return None
+
+    def get_json(self, key: str) -> Dict | None:
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+            self._remember(key, expires_at, value)
+
+    def set_json(self, key: str, value: Dict):
+        self.set(key, json.dumps(value))
+
+    # --------------------------------------------------
+    async def aget(self, key: str) -> str | None:
+        value = self._memory_hit(key)
+        if value is not None:
+            return value
+        return await run_in_threadpool(self.get, key)
+
+    async def aget_json(self, key: str) -> Dict | None:
+        value = await self.aget(key)
+        return json.loads(value) if value is not None else None
+
+    async def aset(self, key: str, value: str):
+        await run_in_threadpool(self.set, key, value)
+
+    async def aset_json(self, key: str, value: Dict):
+        await self.aset(key, json.dumps(value))
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "memory_entries": len(self._memory),
+        }
+
+    # --------------------------------------------------
+    def _memory_hit(self, key: str) -> str | None:
+        """Unexpired in-memory value, or None; never touches SQLite."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        return None
+
+    def _remember(self, key: str, expires_at: float, value: str):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str):
+        self._memory.pop(key, None)
+        self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+        overflow = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN ("
+                " SELECT key FROM llm_response_cache ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_PATH,
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
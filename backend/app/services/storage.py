@@ -0,0 +1,252 @@
+"""
+Upload storage backends.
+Files are content-addressed and sharded by digest so no directory (or key
+prefix) grows past a few hundred entries:
+
+    uploads/wardrobe/ab/cd/abcdef....jpg
+    uploads/analysis/ab/cd/analysis_abcdef....jpg
+
+`file_path` in the DB is that key for every backend. LocalStorage keeps files
+on disk behind the /uploads static mount; S3Storage (STORAGE_BACKEND=s3) puts
+them in an S3-compatible bucket and hands out presigned or public URLs, so
+image bytes never pass through the API workers.
+
+Identical uploads share one file/object; the upload GC only deletes it once no
+row references it and it is older than the grace period. Reusing an existing
+file refreshes its modification time, so a pending delete cannot remove it
+before the new upload's row is committed.
+"""
+import os
+import re
+import time
+from typing import Dict
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from .upload_gc import upload_gc, ANALYSIS_PREFIX, UPLOAD_ROOT
+from .upload_writer import save_upload
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ImportError:  # optional, only needed for STORAGE_BACKEND=s3
+    boto3 = None
+
+STAGING_DIR = "tmp"
+OBJECT_CACHE_CONTROL = "public, max-age=31536000, immutable"  # content-addressed keys
+SHARDED_NAME = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/(?:%s)?[0-9a-f]{64}\.\w+$" % ANALYSIS_PREFIX)
+
+
+def shard_path(root: str, kind: str, digest: str, ext: str, prefix: str = "") -> str:
+    return "/".join([root, kind, digest[:2], digest[2:4], f"{prefix}{digest}{ext}"])
+
+
+def is_sharded(file_path: str, root: str = UPLOAD_ROOT) -> bool:
+    parts = file_path.replace("\\", "/").split("/")
+    return len(parts) >= 4 and parts[0] == root and bool(SHARDED_NAME.match("/".join(parts[-3:])))
+
+
+class LocalStorage:
+    """Stores uploads on local disk under `root`, served by the /uploads static mount."""
+
+    url_prefix = "/uploads"
+    serves_files = True
+
+    def __init__(self, root: str = UPLOAD_ROOT):
+        self.root = root
+
+    # --------------------------------------------------
+    async def save(self, upload: UploadFile, kind: str = "wardrobe") -> Dict:
+        """
+        Streams the upload (size/type checked by upload_writer) into its
+        content-addressed location. Returns save_upload's dict with `path`
+        (the key stored in the DB) and `local_path` (a file the CV stack can read).
+        """
+        prefix = ANALYSIS_PREFIX if kind == "analysis" else ""
+        saved = await save_upload(upload, os.path.join(self.root, STAGING_DIR))
+        ext = os.path.splitext(saved["path"])[1]
+        final = shard_path(self.root, kind, saved["sha256"], ext, prefix)
+        await run_in_threadpool(self._place, saved["path"], final)
+        saved["path"] = saved["local_path"] = final
+        return saved
+
+    def release(self, saved: Dict):
+        """Done with `local_path` (no-op: the local copy is the stored file)."""
+
+    def stage(self, file_path: str, directory: str) -> str | None:
+        """
+        A local file holding a stored file's bytes, for scripts that run the CV
+        stack over existing items; None if it is missing. Non-local backends
+        download into `directory`, which the caller cleans up.
+        """
+        return file_path if os.path.exists(file_path) else None
+
+    def put_file(self, local_path: str, key: str, mime_type: str):
+        """Stores an existing local file under `key` (moved; duplicates are kept for the GC)."""
+        if not os.path.exists(key):
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            os.replace(local_path, key)
+
+    def url(self, file_path: str) -> str:
+        """Public URL for a stored file (relative to the API host)."""
+        return file_path.replace("\\", "/")
+
+    def url_epoch(self) -> str:
+        """Changes whenever url() results may change (part of HTTP cache keys)."""
+        return ""
+
+    def delete(self, file_path: str | None):
+        """Deferred: the GC removes the file once nothing references it."""
+        upload_gc.schedule_delete(file_path)
+
+    # --------------------------------------------------
+    @staticmethod
+    def _place(staged: str, final: str):
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        if os.path.exists(final):
+            # Same bytes already stored: keep one copy, marked as freshly used
+            os.remove(staged)
+            os.utime(final)
+        else:
+            os.replace(staged, final)
+
+
+class S3Storage(LocalStorage):
+    """
+    S3-compatible object storage (AWS, MinIO, loadtest/fake_s3.py).
+    Uploads are staged locally for validation and CV, then put in the bucket
+    under the same key layout. Analysis selfies are transient CV input and
+    stay on local disk, where the GC expires them.
+    """
+
+    serves_files = False
+
+    def __init__(self, root: str = UPLOAD_ROOT):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        super().__init__(root)
+        self.bucket = settings.S3_BUCKET
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            config=BotoConfig(
+                signature_version="s3v4",
+                s3={"addressing_style": "path"},
+                # MinIO-style servers don't all speak the newer default checksums
+                request_checksum_calculation="when_required",
+                response_checksum_validation="when_required",
+            ),
+        )
+
+    # --------------------------------------------------
+    async def save(self, upload: UploadFile, kind: str = "wardrobe") -> Dict:
+        if kind == "analysis":
+            return await super().save(upload, kind)
+
+        saved = await save_upload(upload, os.path.join(self.root, STAGING_DIR))
+        ext = os.path.splitext(saved["path"])[1]
+        key = shard_path(self.root, kind, saved["sha256"], ext)
+        await run_in_threadpool(self._put, saved["path"], key, saved["mime_type"])
+        saved["local_path"] = saved["path"]
+        saved["path"] = key
+        return saved
+
+    def release(self, saved: Dict):
+        """Removes the local staging copy once the request is done with it."""
+        if saved.get("local_path") != saved.get("path"):
+            try:
+                os.remove(saved["local_path"])
+            except FileNotFoundError:
+                pass
+
+    def stage(self, file_path: str, directory: str) -> str | None:
+        key = file_path.replace("\\", "/")
+        if not is_sharded(key) or os.path.basename(key).startswith(ANALYSIS_PREFIX):
+            return super().stage(file_path, directory)
+        local_path = os.path.join(directory, os.path.basename(key))
+        try:
+            self.client.download_file(self.bucket, key, local_path)
+        except ClientError:
+            return None
+        return local_path
+
+    def put_file(self, local_path: str, key: str, mime_type: str):
+        """Uploads a local file under `key`; the local copy is left for the GC."""
+        self._put(local_path, key, mime_type)
+
+    def url(self, file_path: str) -> str:
+        key = file_path.replace("\\", "/")
+        if not is_sharded(key) or os.path.basename(key).startswith(ANALYSIS_PREFIX):
+            return key  # legacy or local-only file, still behind the static mount
+        if settings.S3_PUBLIC_BASE_URL:
+            return f"{settings.S3_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=settings.S3_PRESIGN_SECONDS,
+        )
+
+    def url_epoch(self) -> str:
+        if settings.S3_PUBLIC_BASE_URL:
+            return ""
+        # Roll cached responses over well before their presigned URLs expire
+        return str(int(time.time() // max(1, settings.S3_PRESIGN_SECONDS // 2)))
+
+    def delete(self, file_path: str | None):
+        if file_path and is_sharded(file_path) and not os.path.basename(file_path).startswith(ANALYSIS_PREFIX):
+            upload_gc.schedule_delete(file_path, remove=self._delete_object)
+        else:
+            upload_gc.schedule_delete(file_path)
+
+    # --------------------------------------------------
+    def _put(self, staged: str, key: str, mime_type: str):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            # Same bytes already stored: an in-place copy refreshes LastModified
+            # (see _delete_object) without sending the bytes again
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+                ContentType=mime_type,
+                CacheControl=OBJECT_CACHE_CONTROL,
+            )
+            return
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise
+        with open(staged, "rb") as f:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=f,
+                ContentType=mime_type,
+                CacheControl=OBJECT_CACHE_CONTROL,
+            )
+
+    def _delete_object(self, key: str) -> int | None:
+        """Bytes freed, or None if the object was written within the GC grace period."""
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError:
+            return 0
+        if time.time() - head["LastModified"].timestamp() < settings.UPLOAD_GC_GRACE_SECONDS:
+            return None
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return head["ContentLength"]
+
+
+def _make_storage() -> LocalStorage:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage()
+    return LocalStorage()
+
+
+storage = _make_storage()
@@ -9,10 +9,15 @@ except ImportError:
     from .cv_engine import FeatureExtractor
 from .interpretation_layer import interpret_eye_color, interpret_hair_color, interpret_skin_tone, generate_explanation
 from .palette_db import get_static_palette
+from .photo_gate import PhotoGate, PhotoRejected
+from .metrics import span, record
 import os
+import time
 
 # Initialize CV Engine globally to save load time
 extractor = FeatureExtractor()
+# Cheap reject gate in front of it, sharing its FaceMesh
+photo_gate = PhotoGate(extractor.face_mesh)
 
 # --- ARCHETYPE DATABASE (Reference Only) ---
 ARCHETYPES = [
@@ -108,8 +113,11 @@ def calculate_distance(signal: Dict, archetype: Dict) -> float:
     
     return math.sqrt(sq_sum)
 
-def analyze_user_style(email: str = None, file_path: str = None, manual_signal: Dict = None):
+def analyze_user_style(email: str = None, file_path: str = None, manual_signal: Dict = None, landmarks=None, gate: Dict = None):
     # Palette v6.4 - ABSOLUTE SUB-SEASON GATING
+    # `gate`: photo_gate.check() result the caller already ran (and chose to proceed
+    # with, e.g. forced analysis); `landmarks`: FaceMesh landmarks from it.
+    # Without either, the gate runs here and a rejection raises PhotoRejected.
     
     # 1. SIGNAL ACQUISITION (REAL CV or SIMULATION)
     
@@ -118,9 +126,18 @@ def analyze_user_style(email: str = None, file_path: str = None, manual_signal:
     
     # A. REAL COMPUTER VISION PATH
     if file_path and os.path.exists(file_path):
+        if gate is None and landmarks is None:
+            with span("style.gate"):
+                gate = photo_gate.check(file_path)
+            if not gate["passed"]:
+                # Cheap rejection: the user gets the reason, not a simulated season
+                raise PhotoRejected(gate)
+        if landmarks is None and gate is not None:
+            landmarks = gate["landmarks"]
         try:
             print(f"👁️ Start CV Analysis for: {file_path}")
-            features = extractor.process_image(file_path)
+            with span("style.extract"):
+                features = extractor.process_image(file_path, landmarks=landmarks)
             
             skin_l = features["skin_l"]
             skin_b = features["skin_b"]
@@ -188,6 +205,9 @@ def analyze_user_style(email: str = None, file_path: str = None, manual_signal:
             hair_l = max(5, skin_l - 50)
             contrast = abs(skin_l - hair_l)
 
+    # Everything below is classification; timed as one stage
+    classify_started = time.perf_counter()
+
     # --- FIX 3: CORRECT CONTRAST FORMULA ---
     # Weighted average: Skin vs Hair (50%), Skin vs Eyes (30%), Hair vs Eyes (20%)
     contrast = (
@@ -430,6 +450,7 @@ def analyze_user_style(email: str = None, file_path: str = None, manual_signal:
     palette_data = get_static_palette(selected["season"], selected["subtype"])
     
     face_shapes = ["Oval", "Square", "Round", "Heart", "Diamond"]
+    record("style.classify", time.perf_counter() - classify_started)
     
     return {
         "season": selected["season"],
@@ -1,22 +1,17 @@
 from typing import List, Dict
 import json
-import random
-import httpx
+import time
 from ..models import User, WardrobeItem
 from ..config import settings
-
-BASE_REQUIRED = [["OnePiece"], ["Top", "Bottom"]]
-ALWAYS_REQUIRED = ["Footwear", "Accessory"]
-OPTIONAL = ["Outerwear"]
+from .response_cache import response_cache, make_key, normalize_message, wardrobe_version
+from .outfit_solver import outfit_solver
+from .outfit_prompt import build_outfit_prompt
+from .api_scheduler import gemini_scheduler, gemini_url, INTERACTIVE
+from .circuit_breaker import CircuitOpenError, gemini_breaker
 
 class StylistService:
     def __init__(self):
         self.api_key = settings.GEMINI_API_KEY
-        self.api_url = (
-            "https://generativelanguage.googleapis.com/v1beta/models/"
-            "gemini-2.0-flash-lite-preview-02-05:generateContent"
-            f"?key={self.api_key}"
-        )
 
     # --------------------------------------------------
     async def generate_outfit(self, user: User, request: Dict) -> Dict:
@@ -24,113 +19,176 @@ class StylistService:
         if not wardrobe:
             return self._incomplete(["Top", "Bottom", "OnePiece"])
 
-        # Try Gemini (optional)
-        ai_outfit = None
-        if self.api_key:
+        # Hashed once per request; keys the response cache and the solver's index
+        version = wardrobe_version(wardrobe)
+
+        # Gemini picks the items only when explicitly configured
+        if settings.OUTFIT_ENGINE == "gemini" and self.api_key:
+            return await self._generate_ai_selected(user, wardrobe, request, version)
+
+        # Local solver: deterministic, variant N is the N-th most different outfit
+        variant = max(0, request.get("variant") or 0)
+        outfits = outfit_solver.solve(user.id, wardrobe, request, k=variant + 1, version=version)
+        if not outfits:
+            return self._incomplete(["Top", "Bottom", "OnePiece"])
+        result = self._format(outfits[min(variant, len(outfits) - 1)], request)
+
+        # Gemini (optional) only writes the explanation text
+        if self.api_key and settings.OUTFIT_AI_EXPLANATIONS and result["items"]:
+            explained = await self._explain(user, wardrobe, result, request)
+            if explained:
+                result.update(explained)
+        return result
+
+    # --------------------------------------------------
+    async def _generate_ai_selected(self, user: User, wardrobe: List[WardrobeItem], request: Dict, version: str) -> Dict:
+        # Reuse a cached answer for the same context
+        cache_key = self._cache_key(user, version, request)
+        ai_outfit = await response_cache.aget_json(cache_key)
+        if ai_outfit is None and not gemini_breaker.available():
+            # Gemini is down: go straight to the local solver
+            print("🔌 Gemini circuit open, using local outfit solver")
+        elif ai_outfit is None:
             try:
-                ai_outfit = await self._generate_with_gemini(wardrobe, request)
+                ai_outfit = await self._generate_with_gemini(user, wardrobe, request, version)
+                await response_cache.aset_json(cache_key, ai_outfit)
             except Exception as e:
                 print("⚠️ Gemini failed:", e)
 
         # Always enforce completion
-        return self._force_complete(ai_outfit, wardrobe)
+        return self._force_complete(ai_outfit, wardrobe, request, user, version)
 
     # --------------------------------------------------
-    async def _generate_with_gemini(self, wardrobe, request):
-        inventory = [
-            {"item_id": i.id, "category": i.category, "match_level": i.match_level}
-            for i in wardrobe
-        ]
+    def _cache_key(self, user: User, version: str, request: Dict) -> str:
+        analysis = user.style_analysis
+        return make_key(
+            "outfit",
+            {k: normalize_message(v) if isinstance(v, str) else v for k, v in request.items()},
+            analysis.season_subtype if analysis else None,
+            version,
+        )
+
+    # --------------------------------------------------
+    async def _generate_with_gemini(self, user: User, wardrobe: List[WardrobeItem], request: Dict, version: str | None = None):
+        # Locally pre-filtered, compact inventory instead of every wardrobe row
+        prompt, stats = build_outfit_prompt(user.id, wardrobe, request, version)
+
+        started = time.perf_counter()
+        try:
+            return await self._call_gemini(prompt)
+        finally:
+            stats["gemini_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            print(
+                f"🧮 Outfit prompt: {stats['wardrobe_items']} items -> {stats['candidates']} candidates, "
+                f"~{stats['prompt_tokens']} tokens, build {stats['build_ms']} ms, Gemini {stats['gemini_ms']} ms"
+            )
 
+    # --------------------------------------------------
+    async def _explain(self, user: User, wardrobe: List[WardrobeItem], outfit: Dict, request: Dict) -> Dict | None:
+        by_id = {i.id: i for i in wardrobe}
+        chosen = [by_id[i["item_id"]] for i in outfit["items"] if i["item_id"] in by_id]
+        analysis = user.style_analysis
+
+        cache_key = make_key(
+            "outfit_explanation",
+            sorted(i.id for i in chosen),
+            {k: normalize_message(v) if isinstance(v, str) else v for k, v in request.items() if k != "variant"},
+            analysis.season_subtype if analysis else None,
+        )
+        cached = await response_cache.aget_json(cache_key)
+        if cached is not None:
+            return cached
+        if not gemini_breaker.available():
+            # Keep the local reason text rather than waiting on a dead provider
+            return None
+
+        pieces = [
+            {
+                "category": i.category,
+                "name": i.subcategory or i.category,
+                "color": i.color_name,
+                "pattern": i.pattern,
+                "match_level": i.match_level,
+            }
+            for i in chosen
+        ]
         prompt = f"""
 You are a professional fashion stylist.
 
-WARDROBE:
-{json.dumps(inventory)}
+The outfit below was already chosen for the user ({analysis.season_subtype if analysis else "unknown season"}).
+
+OUTFIT:
+{json.dumps(pieces)}
 
 REQUEST:
 {json.dumps(request)}
 
-RULES:
-- Use ONLY wardrobe items
-- Build a COMPLETE outfit
-- Either OnePiece OR Top + Bottom
-- MUST include Footwear and Accessory
-- JSON only
+Return JSON only: {{"outfit_name": short catchy name, "explanation": 2-3 sentences on why it works}}
 """
+        try:
+            data = await self._call_gemini(prompt)
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            print("⚠️ Gemini explanation failed:", e)
+            return None
+
+        explained = {k: data[k] for k in ("outfit_name", "explanation") if isinstance(data.get(k), str) and data[k]}
+        if explained:
+            await response_cache.aset_json(cache_key, explained)
+        return explained or None
 
+    # --------------------------------------------------
+    async def _call_gemini(self, prompt: str) -> Dict:
         payload = {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {"response_mime_type": "application/json"},
         }
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            res = await client.post(self.api_url, json=payload)
-            res.raise_for_status()
+        # Shares the Gemini quota with uploads (interactive lane)
+        res = await gemini_scheduler.post(gemini_url(), json=payload, timeout=60, lane=INTERACTIVE)
+
+        # Safely parse response JSON with error handling
+        try:
+            response_data = res.json()
+            if "candidates" not in response_data or not response_data["candidates"]:
+                raise ValueError("Gemini API returned empty candidates")
             
-            # Safely parse response JSON with error handling
-            try:
-                response_data = res.json()
-                if "candidates" not in response_data or not response_data["candidates"]:
-                    raise ValueError("Gemini API returned empty candidates")
-                
-                candidate = response_data["candidates"][0]
-                if "content" not in candidate or "parts" not in candidate["content"]:
-                    raise ValueError("Gemini API response missing content/parts")
-                
-                raw = candidate["content"]["parts"][0].get("text", "")
-                if not raw:
-                    raise ValueError("Gemini API returned empty text")
-                
-                # Clean and parse JSON response
-                cleaned = raw.replace("```json", "").replace("```", "").strip()
-                return json.loads(cleaned)
-            except (KeyError, IndexError, json.JSONDecodeError, ValueError) as e:
-                print(f"⚠️ Gemini API response parsing error: {e}")
-                raise
+            candidate = response_data["candidates"][0]
+            if "content" not in candidate or "parts" not in candidate["content"]:
+                raise ValueError("Gemini API response missing content/parts")
+            
+            raw = candidate["content"]["parts"][0].get("text", "")
+            if not raw:
+                raise ValueError("Gemini API returned empty text")
+            
+            # Clean and parse JSON response
+            cleaned = raw.replace("```json", "").replace("```", "").strip()
+            return json.loads(cleaned)
+        except (KeyError, IndexError, json.JSONDecodeError, ValueError) as e:
+            print(f"⚠️ Gemini API response parsing error: {e}")
+            raise
 
     # --------------------------------------------------
-    def _force_complete(self, outfit: Dict | None, wardrobe: List[WardrobeItem]) -> Dict:
+    def _force_complete(
+        self, outfit: Dict | None, wardrobe: List[WardrobeItem], request: Dict, user: User, version: str | None = None
+    ) -> Dict:
+        """Keeps the AI-selected items and lets the local solver fill the missing slots."""
         items = outfit["items"] if outfit and "items" in outfit else []
-        selected_ids = {i["item_id"] for i in items}
-        selected_items = [i for i in wardrobe if i.id in selected_ids]
-        categories = {i.category for i in selected_items}
-
-        def pick(cat):
-            pool = [i for i in wardrobe if i.category == cat and i.id not in selected_ids]
-            return random.choice(pool) if pool else None
+        by_id = {i.id: i for i in wardrobe}
+        items = [i for i in items if isinstance(i, dict) and i.get("item_id") in by_id]
+        fixed = [by_id[i["item_id"]] for i in items]
 
+        solved = outfit_solver.solve(user.id, wardrobe, request, k=1, fixed=fixed, version=version)
+        fixed_ids = {i.id for i in fixed}
         final_items = list(items)
         missing = []
-
-        # ---- Base outfit ----
-        if "OnePiece" not in categories:
-            if not {"Top", "Bottom"}.issubset(categories):
-                top = pick("Top")
-                bottom = pick("Bottom")
-                if top and bottom:
-                    final_items += [
-                        {"item_id": top.id, "reason": "Base top"},
-                        {"item_id": bottom.id, "reason": "Base bottom"},
-                    ]
-                else:
-                    missing += ["Top", "Bottom"]
-
-        # ---- Required extras ----
-        for cat in ALWAYS_REQUIRED:
-            if cat not in categories:
-                item = pick(cat)
-                if item:
-                    final_items.append({"item_id": item.id, "reason": f"{cat} match"})
-                else:
-                    missing.append(cat)
-
-        # ---- Optional ----
-        for cat in OPTIONAL:
-            if cat not in categories:
-                item = pick(cat)
-                if item:
-                    final_items.append({"item_id": item.id, "reason": f"{cat} layer"})
+        if solved:
+            final_items += [
+                {"item_id": item.id, "reason": self._reason(item, score)}
+                for score, item in solved[0]["items"] if item.id not in fixed_ids
+            ]
+            missing = solved[0]["missing"]
 
         return {
             "outfit_name": outfit.get("outfit_name", "Styled Outfit") if outfit else "Styled Outfit",
@@ -139,6 +197,33 @@ RULES:
             "missing_categories": list(set(missing)),
         }
 
+    # --------------------------------------------------
+    def _format(self, solved: Dict, request: Dict) -> Dict:
+        items = solved["items"]
+        best = sum(1 for _, i in items if i.match_level == "best")
+        occasion = request.get("occasion") or "your day"
+        weather = request.get("weather") or "Neutral"
+
+        explanation = f"Complete outfit for {occasion} in {weather.lower()} weather"
+        if best:
+            explanation += f", with {best} piece{'s' if best > 1 else ''} from your best palette colors"
+        explanation += "."
+
+        return {
+            "outfit_name": f"{request.get('vibe') or 'Styled'} {occasion}".strip().title(),
+            "items": [{"item_id": item.id, "reason": self._reason(item, score)} for score, item in items],
+            "explanation": explanation,
+            "missing_categories": list(set(solved["missing"])),
+        }
+
+    def _reason(self, item, score: float) -> str:
+        parts = [f"{item.category} match"]
+        if item.match_level == "best":
+            parts.append("flatters your palette")
+        if item.color_name and item.color_name != "Unknown":
+            parts.append(item.color_name)
+        return " · ".join(parts)
+
     # --------------------------------------------------
     def _incomplete(self, cats):
         return {
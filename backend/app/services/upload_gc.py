@@ -0,0 +1,215 @@
+"""
+Garbage collector for uploads/.
+Request handlers hand file deletions to a deferred queue instead of calling
+os.remove inline. A background loop drains that queue and periodically
+reconciles the directory tree against WardrobeItem.file_path in batches,
+removing orphans, expired analysis selfies and stale `.part` files.
+A file is only ever deleted if no row references it and it has not been
+written (or reused by a duplicate upload) within UPLOAD_GC_GRACE_SECONDS:
+the row for a new upload is only committed after classification.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from ..config import settings
+from .. import database, models
+from .upload_writer import PART_SUFFIX
+
+UPLOAD_ROOT = "uploads"
+ANALYSIS_PREFIX = "analysis_"
+SCAN_BATCH = 1000
+REFERENCE_BATCH = 5000
+
+
+def _norm(path: str) -> str:
+    return os.path.normpath(path.replace("\\", "/"))
+
+
+class UploadGC:
+    def __init__(self, root: str = UPLOAD_ROOT):
+        self.root = root
+        self._pending = deque()
+        self._lock = threading.Lock()  # one sweep/drain at a time
+        self.last_report: Dict | None = None
+
+    # --------------------------------------------------
+    def schedule_delete(self, path: str | None, remove: Callable[[str], int] | None = None):
+        """
+        Defers deleting an upload to the GC (called after the row is gone).
+        `remove` deletes non-local objects and returns the bytes freed, or
+        None if the object was modified within the grace period.
+        """
+        if path:
+            self._pending.append((path, remove, 0.0))
+
+    def drain(self, dry_run: bool = False) -> Dict:
+        """
+        Deletes queued files that no row references anymore. Files modified
+        within the grace period (a duplicate upload may be about to reference
+        them) are re-queued and checked again once it has passed. A dry run
+        only reports and leaves the queue as it was.
+        """
+        now = time.time()
+        queued, waiting = [], []
+        while self._pending:
+            entry = self._pending.popleft()
+            (queued if entry[2] <= now else waiting).append(entry)
+        report = self._empty_report()
+        if queued:
+            with self._lock:
+                referenced = self._referenced(path for path, _, _ in queued)
+                for entry in queued:
+                    path, remove, _ = entry
+                    if dry_run:
+                        waiting.append(entry)
+                    if _norm(path) in referenced:
+                        continue
+                    if not self._remove(path, "deferred", report, dry_run, remove=remove) and not dry_run:
+                        waiting.append((path, remove, now + settings.UPLOAD_GC_GRACE_SECONDS))
+        self._pending.extend(waiting)
+        return report
+
+    def collect(self, dry_run: bool = False) -> Dict:
+        """Full reconciliation of the uploads tree; returns what was reclaimed."""
+        started = time.perf_counter()
+        report = self.drain(dry_run)
+
+        with self._lock:
+            now = time.time()
+            grace = settings.UPLOAD_GC_GRACE_SECONDS
+            analysis_ttl = settings.ANALYSIS_PHOTO_TTL_HOURS * 3600
+
+            for batch in self._batches(self._scan(), SCAN_BATCH):
+                report["scanned"] += len(batch)
+                referenced = self._referenced(path for path, _ in batch)
+                for path, stat in batch:
+                    if _norm(path) in referenced:
+                        continue
+                    age = now - stat.st_mtime
+                    name = os.path.basename(path)
+                    if name.endswith(PART_SUFFIX):
+                        if age > grace:
+                            self._remove(path, "partial", report, dry_run, stat.st_size)
+                    elif name.startswith(ANALYSIS_PREFIX):
+                        if age > analysis_ttl:
+                            self._remove(path, "analysis", report, dry_run, stat.st_size)
+                    elif age > grace:
+                        self._remove(path, "orphan", report, dry_run, stat.st_size)
+
+        report["duration_s"] = round(time.perf_counter() - started, 2)
+        report["dry_run"] = dry_run
+        self.last_report = report
+        return report
+
+    async def run_forever(self):
+        """Background loop: drain deletes often, sweep the tree rarely."""
+        last_sweep = 0.0
+        while True:
+            try:
+                if time.monotonic() - last_sweep >= settings.UPLOAD_GC_INTERVAL_SECONDS:
+                    report = await asyncio.to_thread(self.collect)
+                    last_sweep = time.monotonic()
+                    if report["deleted"]:
+                        print(
+                            f"🧹 Upload GC: removed {report['deleted']} files "
+                            f"({report['reclaimed_bytes'] / 1024 / 1024:.1f} MB) in {report['duration_s']}s"
+                        )
+                else:
+                    await asyncio.to_thread(self.drain)
+            except Exception as e:
+                print(f"⚠️ Upload GC failed: {e}")
+            await asyncio.sleep(settings.UPLOAD_GC_DRAIN_SECONDS)
+
+    # --------------------------------------------------
+    def _scan(self) -> Iterator:
+        """(path, stat) for every file under root, without building a full listing."""
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat()
+            except FileNotFoundError:
+                continue
+
+    def _referenced(self, paths: Iterable[str]) -> set:
+        """Normalized paths among `paths` that some WardrobeItem still points to."""
+        # Stored paths may use either separator, so match on both spellings
+        candidates = {}
+        for path in paths:
+            normalized = _norm(path)
+            candidates[normalized.replace("\\", "/")] = normalized
+            candidates[normalized.replace("/", "\\")] = normalized
+            candidates[path] = normalized
+
+        found = set()
+        db = database.SessionLocal()
+        try:
+            keys = list(candidates)
+            for i in range(0, len(keys), REFERENCE_BATCH):
+                rows = (
+                    db.query(models.WardrobeItem.file_path)
+                    .filter(models.WardrobeItem.file_path.in_(keys[i:i + REFERENCE_BATCH]))
+                    .all()
+                )
+                found.update(candidates[r.file_path] for r in rows)
+        finally:
+            db.close()
+        return found
+
+    @staticmethod
+    def _batches(items: Iterator, size: int) -> Iterator[List]:
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _empty_report() -> Dict:
+        return {
+            "scanned": 0,
+            "deleted": 0,
+            "reclaimed_bytes": 0,
+            "by_kind": {"deferred": 0, "partial": 0, "analysis": 0, "orphan": 0},
+        }
+
+    @staticmethod
+    def _remove(path: str, kind: str, report: Dict, dry_run: bool, size: int | None = None, remove=None) -> bool:
+        """False if the file was kept because it is too recent (deferred deletes only)."""
+        try:
+            if remove is not None:
+                size = 0 if dry_run else remove(path)
+                if size is None:
+                    return False
+            else:
+                if size is None:
+                    stat = os.stat(path)
+                    if time.time() - stat.st_mtime < settings.UPLOAD_GC_GRACE_SECONDS:
+                        return False
+                    size = stat.st_size
+                if not dry_run:
+                    os.remove(path)
+        except FileNotFoundError:
+            return True
+        except Exception as e:
+            print(f"⚠️ Upload GC could not remove {path}: {e}")
+            return True
+        report["deleted"] += 1
+        report["reclaimed_bytes"] += size
+        report["by_kind"][kind] += 1
+        return True
+
+
+upload_gc = UploadGC()
@@ -0,0 +1,88 @@
+"""
+Streaming writer for user uploads.
+Reads the multipart file in chunks, sniffs the real image type from its magic
+bytes, enforces MAX_UPLOAD_BYTES and hashes incrementally. Data goes to a
+`.part` file that is only renamed into place once complete, so rejected or
+interrupted uploads never leave a half-written image for the CV stack.
+"""
+import hashlib
+import os
+import uuid
+from typing import Dict
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+
+CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """MIME type from the file signature, ignoring the client's filename and Content-Type."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _too_large() -> UploadRejected:
+    return UploadRejected(413, f"File too large (max {round(settings.MAX_UPLOAD_BYTES / (1024 * 1024), 1):g} MB)")
+
+
+async def save_upload(upload: UploadFile, directory: str, prefix: str = "") -> Dict:
+    """
+    Streams `upload` into `directory` as `{prefix}{uuid}{ext}`.
+    Returns {"path", "mime_type", "size", "sha256"}; raises UploadRejected (413/415).
+    """
+    max_bytes = settings.MAX_UPLOAD_BYTES
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large()
+
+    head = await upload.read(CHUNK_SIZE)
+    mime_type = sniff_image_type(head)
+    if mime_type is None:
+        raise UploadRejected(415, "Unsupported file type. Upload a JPEG, PNG or WebP image.")
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{prefix}{uuid.uuid4()}{EXTENSIONS[mime_type]}")
+    part_path = path + PART_SUFFIX
+
+    digest = hashlib.sha256()
+    size = 0
+    f = await run_in_threadpool(open, part_path, "wb")
+    try:
+        chunk = head
+        while chunk:
+            size += len(chunk)
+            if size > max_bytes:
+                raise _too_large()
+            digest.update(chunk)
+            await run_in_threadpool(f.write, chunk)
+            chunk = await upload.read(CHUNK_SIZE)
+        await run_in_threadpool(f.close)
+        os.replace(part_path, path)
+    except BaseException:
+        f.close()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return {"path": path, "mime_type": mime_type, "size": size, "sha256": digest.hexdigest()}
@@ -1,14 +1,31 @@
+import asyncio
 import base64
 import json
 import httpx
 from ..config import settings
+from .api_scheduler import gemini_scheduler, gemini_url, INTERACTIVE
+from .circuit_breaker import CircuitOpenError, gemini_breaker
 
-async def analyze_clothing_image(image_path: str) -> dict:
+def _read_base64(image_path: str) -> str:
+    with open(image_path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+async def analyze_clothing_image(image_path: str, lane: str = INTERACTIVE, mime_type: str = "image/jpeg") -> dict:
+    """
+    Gemini clothing metadata for an image, or None.
+    `lane` is INTERACTIVE for request-path uploads and BACKGROUND for batch jobs.
+    `mime_type` is the sniffed type from the upload writer.
+    """
     if not settings.GEMINI_API_KEY:
         return None
+    if not gemini_breaker.available():
+        # Provider is down: skip reading/encoding, the caller falls back to local classifiers
+        print("🔌 Gemini circuit open, skipping image analysis")
+        return None
 
-    with open(image_path, "rb") as f:
-        image_b64 = base64.b64encode(f.read()).decode()
+    # Off the event loop: a 10 MB photo takes a while to read and encode
+    image_b64 = await asyncio.to_thread(_read_base64, image_path)
 
     PROMPT = """
 You are a fashion product classification expert.
@@ -70,7 +87,7 @@ STRICT REQUIREMENTS:
         "contents": [{
             "parts": [
                 {"text": PROMPT},
-                {"inline_data": {"mime_type": "image/jpeg", "data": image_b64}}
+                {"inline_data": {"mime_type": mime_type, "data": image_b64}}
             ]
         }],
         "generationConfig": {
@@ -79,55 +96,39 @@ STRICT REQUIREMENTS:
         }
     }
 
-    import asyncio
-    
-    # Retry loop for 429
-    temp_delay = 2
-    for attempt in range(3):
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                res = await client.post(
-                    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-lite-preview-02-05:generateContent?key={settings.GEMINI_API_KEY}",
-                    json=payload
-                )
-            
-            # Check response status before parsing JSON
-            res.raise_for_status()
-            
-            # Safely parse response JSON
-            response_data = res.json()
-            if "candidates" not in response_data or not response_data["candidates"]:
-                print("⚠️ Gemini API returned empty candidates")
-                return None
-            
-            candidate = response_data["candidates"][0]
-            if "content" not in candidate or "parts" not in candidate["content"]:
-                print("⚠️ Gemini API response missing content/parts")
-                return None
-            
-            raw = candidate["content"]["parts"][0].get("text", "")
-            if not raw:
-                print("⚠️ Gemini API returned empty text")
-                return None
-            
-            # Clean and parse JSON response
-            cleaned = raw.replace("```json", "").replace("```", "").strip()
-            return json.loads(cleaned)
-            
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                print(f"⚠️ Gemini Rate Limit. Retrying in {temp_delay}s...")
-                await asyncio.sleep(temp_delay)
-                temp_delay *= 2
-                continue
-            
-            print(f"⚠️ Gemini API HTTP error: {e.response.status_code} - {e.response.text}")
+    # Rate limiting and 429 retries are handled by the shared scheduler
+    try:
+        res = await gemini_scheduler.post(gemini_url(), json=payload, timeout=30, lane=lane)
+
+        # Safely parse response JSON
+        response_data = res.json()
+        if "candidates" not in response_data or not response_data["candidates"]:
+            print("⚠️ Gemini API returned empty candidates")
             return None
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
-            print(f"⚠️ Gemini API response parsing error: {e}")
+        
+        candidate = response_data["candidates"][0]
+        if "content" not in candidate or "parts" not in candidate["content"]:
+            print("⚠️ Gemini API response missing content/parts")
             return None
-        except Exception as e:
-            print(f"⚠️ Gemini API request failed: {e}")
+        
+        raw = candidate["content"]["parts"][0].get("text", "")
+        if not raw:
+            print("⚠️ Gemini API returned empty text")
             return None
-    
-    return None
+        
+        # Clean and parse JSON response
+        cleaned = raw.replace("```json", "").replace("```", "").strip()
+        return json.loads(cleaned)
+        
+    except CircuitOpenError:
+        print("🔌 Gemini circuit open, skipping image analysis")
+        return None
+    except httpx.HTTPStatusError as e:
+        print(f"⚠️ Gemini API HTTP error: {e.response.status_code} - {e.response.text}")
+        return None
+    except (KeyError, IndexError, json.JSONDecodeError) as e:
+        print(f"⚠️ Gemini API response parsing error: {e}")
+        return None
+    except Exception as e:
+        print(f"⚠️ Gemini API request failed: {e}")
+        return None
@@ -1,8 +1,9 @@
 # backend/app/services/wardrobe_logic.py
 
-import math
 from typing import List, Union, Dict, Any
 
+from .palette_index import palette_index
+
 
 # -------------------------------
 # Color utilities
@@ -22,23 +23,6 @@ def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
 
 
-def color_distance(c1: tuple[int, int, int], c2: tuple[int, int, int]) -> float:
-    """
-    Perceptual color distance (weighted Euclidean).
-    This is intentionally used instead of simple RGB distance.
-    """
-    rmean = (c1[0] + c2[0]) / 2
-    r = c1[0] - c2[0]
-    g = c1[1] - c2[1]
-    b = c1[2] - c2[2]
-
-    return math.sqrt(
-        (((512 + rmean) * r * r) >> 8) +
-        4 * g * g +
-        (((767 - rmean) * b * b) >> 8)
-    )
-
-
 # -------------------------------
 # Palette helpers
 # -------------------------------
@@ -110,49 +94,19 @@ def determine_match_level(
     if not item_hex:
         return "neutral"
 
-    try:
-        item_rgb = hex_to_rgb(item_hex)
-    except Exception:
-        return "neutral"
+    # Nearest palette color by ΔE2000 (see palette_index.py)
+    return palette_index.match_levels([item_hex], best_colors, neutral_colors, worst_colors)[0]
 
-    # Relaxed threshold (as agreed)
-    THRESHOLD = 120
-
-    # 1️⃣ BEST colors (highest priority)
-    for color in best_colors or []:
-        hex_candidate = normalize_hex(extract_hex(color))
-        if not hex_candidate:
-            continue
-
-        try:
-            if color_distance(item_rgb, hex_to_rgb(hex_candidate)) < THRESHOLD:
-                return "best"
-        except Exception:
-            continue
-
-    # 2️⃣ WORST colors (second priority)
-    for color in worst_colors or []:
-        hex_candidate = normalize_hex(extract_hex(color))
-        if not hex_candidate:
-            continue
-
-        try:
-            if color_distance(item_rgb, hex_to_rgb(hex_candidate)) < THRESHOLD:
-                return "worst"
-        except Exception:
-            continue
-
-    # 3️⃣ NEUTRAL colors (fallback)
-    for color in neutral_colors or []:
-        hex_candidate = normalize_hex(extract_hex(color))
-        if not hex_candidate:
-            continue
-
-        try:
-            if color_distance(item_rgb, hex_to_rgb(hex_candidate)) < THRESHOLD:
-                return "neutral"
-        except Exception:
-            continue
-
-    # Default safe fallback
-    return "neutral"
+
+def determine_match_levels(
+    item_hexes: List[str | None],
+    season: str | None,
+    season_subtype: str | None
+) -> List[str]:
+    """
+    Match levels of many item colors against the full palette of the user's
+    subtype (core/accent/luxury count as best) in one vectorized pass.
+    Used on upload and to re-match the wardrobe when the analysis changes.
+    """
+    subtype = palette_index.resolve(season, season_subtype)
+    return palette_index.match_levels_for_subtype([normalize_hex(h) for h in item_hexes], subtype)
@@ -0,0 +1,72 @@
+"""
+Measures Gemini outfit prompt size and build latency against wardrobe size.
+Compares the legacy full-inventory JSON dump with the compact pre-filtered encoding.
+
+Usage: python bench_outfit_prompt.py
+"""
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from app.services.chat_context import estimate_tokens
+from app.services.outfit_prompt import build_outfit_prompt
+
+CATEGORIES = ["Top", "Bottom", "OnePiece", "Outerwear", "Footwear", "Accessory"]
+SEASONS = ["Spring", "Summer", "Autumn", "Winter"]
+OCCASIONS = ["Work", "Casual", "Party", "Date", "Formal", "Weekend"]
+PATTERNS = [None, "Solid", "Striped", "Floral", "Checked"]
+WARDROBE_SIZES = [10, 50, 200, 1000, 5000]
+
+REQUEST = {"occasion": "Work", "weather": "Cold", "vibe": "Smart Casual"}
+
+
+def make_wardrobe(size: int, seed: int = 42):
+    rnd = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            category=rnd.choice(CATEGORIES),
+            subcategory=rnd.choice(["Shirt", "Jeans", "Dress", "Blazer", "Boots", "Bag"]),
+            match_level=rnd.choice(["best", "neutral", "worst"]),
+            color_primary="#%06X" % rnd.randrange(1 << 24),
+            color_name=rnd.choice(["Navy", "Black", "Cream", "Rust", "Olive", "Red"]),
+            pattern=rnd.choice(PATTERNS),
+            seasonality=json.dumps(rnd.sample(SEASONS, 2)),
+            occasion_tags=json.dumps(rnd.sample(OCCASIONS, 2)),
+            style_tags=json.dumps(["Classic"]),
+        )
+        for i in range(size)
+    ]
+
+
+def legacy_prompt_tokens(wardrobe) -> int:
+    inventory = [
+        {"item_id": i.id, "category": i.category, "match_level": i.match_level}
+        for i in wardrobe
+    ]
+    return estimate_tokens(json.dumps(inventory)) + estimate_tokens(json.dumps(REQUEST)) + 60
+
+
+def run():
+    print(f"{'items':>6} | {'legacy tokens':>13} | {'compact tokens':>14} | {'candidates':>10} | {'build ms (cold/warm)':>20}")
+    print("-" * 78)
+    for user_id, size in enumerate(WARDROBE_SIZES, start=1):
+        wardrobe = make_wardrobe(size)
+
+        started = time.perf_counter()
+        _, stats = build_outfit_prompt(user_id, wardrobe, REQUEST)
+        cold_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        build_outfit_prompt(user_id, wardrobe, REQUEST)
+        warm_ms = (time.perf_counter() - started) * 1000
+
+        print(
+            f"{size:>6} | {legacy_prompt_tokens(wardrobe):>13} | {stats['prompt_tokens']:>14} | "
+            f"{stats['candidates']:>10} | {cold_ms:>9.1f} / {warm_ms:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,125 @@
+"""
+Analysis pipeline benchmarks: photo quality, gate, feature extraction,
+dominant colour, season classification and wardrobe match levels.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from conftest import IMAGE_SIZES
+from app.services.photo_quality import PhotoQualityChecker
+from app.services.style_analysis import analyze_user_style, extractor, photo_gate
+from app.services.palette_db import PALETTE_DB
+from app.services.palette_index import palette_index
+from app.services.wardrobe_logic import determine_match_level, determine_match_levels
+
+SIZES = list(IMAGE_SIZES)
+
+
+@pytest.fixture(scope="module")
+def quality_checker():
+    return PhotoQualityChecker()
+
+
+# -------------------------------------------------
+# Photo quality / gate
+# -------------------------------------------------
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_quality_synthetic(bench, quality_checker, synthetic_images, size):
+    result = bench(quality_checker.check_photo_quality, synthetic_images[size])
+    assert "quality_score" in result
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_quality_face(bench, quality_checker, face_images, size):
+    result = bench(quality_checker.check_photo_quality, face_images[size])
+    assert result["metrics"].get("face_coverage")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_gate_face(bench, face_images, size):
+    result = bench(photo_gate.check, face_images[size])
+    assert result["passed"], result["reason"]
+
+
+# -------------------------------------------------
+# Feature extraction
+# -------------------------------------------------
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_process_image(bench, face_images, size):
+    features = bench(extractor.process_image, face_images[size])
+    assert 0 <= features["skin_l"] <= 100
+
+
+def bench_process_image_gate_landmarks(bench, face_images):
+    """Extraction with landmarks handed over by the photo gate (no second FaceMesh pass)."""
+    landmarks = photo_gate.check(face_images["medium"])["landmarks"]
+    features = bench(extractor.process_image, face_images["medium"], landmarks=landmarks)
+    assert 0 <= features["skin_l"] <= 100
+
+
+@pytest.mark.parametrize("pixels", [100, 1_000, 10_000])
+def bench_dominant_color(bench, pixels):
+    rng = np.random.default_rng(pixels)
+    # Three skin-ish clusters, like a cheek crop
+    centers = np.array([[205, 160, 135], [180, 130, 110], [120, 85, 70]], np.float32)
+    region = centers[rng.integers(0, 3, pixels)] + rng.normal(0, 8, (pixels, 3))
+    region = np.clip(region, 0, 255).astype(np.uint8).reshape(-1, 1, 3)
+    l, _, _ = bench(extractor.get_dominant_color, region)
+    assert 0 <= l <= 100
+
+
+# -------------------------------------------------
+# Classification
+# -------------------------------------------------
+
+def bench_analyze_manual_signal(bench):
+    signal = {"skin_l": 72, "skin_b": 12, "chroma": 38, "hair_l": 30, "eye_l": 40}
+    result = bench(analyze_user_style, "bench@example.com", None, signal)
+    assert result["season"]
+
+
+@pytest.mark.parametrize("size", ["small", "medium"])
+def bench_analyze_photo(bench, face_images, size):
+    result = bench(analyze_user_style, "bench@example.com", face_images[size])
+    assert result["season"]
+
+
+@pytest.mark.parametrize("palette_size", [12, 48, 192])
+def bench_match_level(bench, palette_size):
+    """1000 wardrobe colours against a stored palette of `palette_size` best/neutral/worst entries."""
+    rnd = random.Random(palette_size)
+
+    def colours(n):
+        return [{"hex": "#%06X" % rnd.randrange(1 << 24), "name": "c"} for _ in range(n)]
+
+    best, neutral, worst = colours(palette_size // 2), colours(palette_size // 4), colours(palette_size // 4)
+    items = ["#%06X" % rnd.randrange(1 << 24) for _ in range(1000)]
+
+    levels = bench(palette_index.match_levels, items, best, neutral, worst)
+    assert levels[0] == determine_match_level(items[0], best, neutral, worst)
+    assert set(levels) <= {"best", "neutral", "worst"}
+
+
+@pytest.mark.parametrize("items", [100, 1000])
+def bench_match_levels_subtype(bench, items):
+    """A whole wardrobe re-matched against a full 45-colour subtype palette in one pass."""
+    rnd = random.Random(items)
+    hexes = ["#%06X" % rnd.randrange(1 << 24) for _ in range(items)]
+    levels = bench(determine_match_levels, hexes, "Autumn", "Deep Autumn")
+    assert set(levels) <= {"best", "neutral", "worst"}
+
+
+def bench_nearest_all_subtypes(bench):
+    """Top-3 nearest palette colours for 50 query colours in each of the 12 subtypes."""
+    rnd = random.Random(12)
+    hexes = ["#%06X" % rnd.randrange(1 << 24) for _ in range(50)]
+
+    def run():
+        return [palette_index.nearest(hexes, subtype, k=3) for subtype in PALETTE_DB]
+
+    results = bench(run)
+    assert all(len(r) == 50 for r in results)
@@ -0,0 +1,62 @@
+"""
+Category normalization of AI labels (upload tagging, retag_wardrobe.py).
+The expected table doubles as a regression check for plural and compound
+handling.
+"""
+import pytest
+
+from app.services.clothing_normalizer import normalize_categories, normalize_category
+
+EXPECTED = {
+    # "-es" plurals of words ending in "e"
+    "blouses": "Top",
+    "Denim Blouses": "Top",
+    "camisoles": "Top",
+    "hoodies": "Outerwear",
+    "purses": "Accessory",
+    "totes": "Accessory",
+    "necklaces": "Accessory",
+    # "-es" plurals of words ending in "s"
+    "dresses": "OnePiece",
+    "glasses": "Accessory",
+    # plain "-s" plurals
+    "capris": "Bottom",
+    "jackets": "Outerwear",
+    "tank tops": "Top",
+    # compound words
+    "sweatpants": "Bottom",
+    "raincoats": "Outerwear",
+    # no substring false positives
+    "laptops": "Uncategorized",
+    "flowers": "Uncategorized",
+}
+
+# AI descriptions: whole words and plurals only, no compound-word matching
+DESCRIPTIONS = {
+    "a participant in a rampant, flippant mood": "Uncategorized",
+    "model wearing a feathered headdress": "Uncategorized",
+    "two floral dresses on a rack": "OnePiece",
+    "relaxed denim jeans": "Bottom",
+}
+
+
+def bench_normalize_expected(bench):
+    labels = list(EXPECTED)
+    result = bench(lambda: [normalize_category(label) for label in labels])
+    assert dict(zip(labels, result)) == EXPECTED
+
+
+def bench_normalize_descriptions(bench):
+    texts = list(DESCRIPTIONS)
+    result = bench(lambda: [normalize_category(None, free_text=text) for text in texts])
+    assert dict(zip(texts, result)) == DESCRIPTIONS
+    # compound words still match in label fields
+    assert normalize_category("sweatpants", free_text="a participant") == "Bottom"
+
+
+@pytest.mark.parametrize("n", [10000])
+def bench_normalize_batch(bench, n):
+    labels = list(EXPECTED)
+    rows = [(labels[i % len(labels)], None) for i in range(n)]
+    result = bench(normalize_categories, rows)
+    assert result[: len(labels)] == list(EXPECTED.values())
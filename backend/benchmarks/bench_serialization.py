@@ -0,0 +1,77 @@
+"""
+Wardrobe listing serialization: per-request pydantic objects (the old
+get_wardrobe path) against concatenated pre-serialized fragments.
+"""
+import json
+import random
+
+import pytest
+from pydantic import TypeAdapter
+
+from app import models, schemas
+from app.services import item_json
+from app.services.storage import storage
+
+LISTING = TypeAdapter(list[schemas.WardrobeItemResponse])
+
+
+def wardrobe(n: int):
+    rnd = random.Random(n)
+    items = []
+    for i in range(n):
+        ai = {
+            "category": "Top", "subcategory": "shirt", "color_hex": "#%06X" % rnd.randrange(1 << 24),
+            "pattern": "solid", "fabric": "cotton", "seasonality": ["Spring", "Summer"],
+            "occasion_tags": ["Work", "Casual"], "style_tags": ["Minimal"], "confidence": 0.91,
+        }
+        item = models.WardrobeItem(
+            id=i + 1, user_id=1, file_path=f"uploads/wardrobe/ab/cd/{i:064x}.jpg",
+            category="Top", subcategory="shirt", type="button-down",
+            color_primary=ai["color_hex"], color_name="Blue", pattern="solid", fabric="cotton", fit="regular",
+            seasonality=json.dumps(ai["seasonality"]), occasion_tags=json.dumps(ai["occasion_tags"]),
+            style_tags=json.dumps(ai["style_tags"]), match_level=rnd.choice(["best", "neutral", "worst"]),
+            ai_metadata=json.dumps({"ai": ai, "decision": {"source": "gemini"}}),
+        )
+        item_json.refresh(item)
+        items.append(item)
+    return items
+
+
+@pytest.mark.parametrize("n", [50, 500])
+def bench_listing_pydantic(bench, n):
+    """json.loads per row, a WardrobeItemResponse per item, then FastAPI-style serialization."""
+    items = wardrobe(n)
+
+    def run():
+        return LISTING.dump_json([
+            schemas.WardrobeItemResponse(
+                id=i.id,
+                file_path=i.file_path,
+                image_url=storage.url(i.file_path),
+                category=i.category,
+                subcategory=i.subcategory,
+                type=i.type,
+                color_primary=i.color_primary,
+                color_secondary=None,
+                color_name=i.color_name,
+                pattern=i.pattern,
+                fabric=i.fabric,
+                fit=i.fit,
+                seasonality=json.loads(i.seasonality),
+                occasion_tags=json.loads(i.occasion_tags),
+                style_tags=json.loads(i.style_tags),
+                match_level=i.match_level,
+                ai_metadata=json.loads(i.ai_metadata),
+            )
+            for i in items
+        ])
+
+    assert len(json.loads(bench(run))) == n
+
+
+@pytest.mark.parametrize("n", [50, 500])
+def bench_listing_fragments(bench, n):
+    """Concatenated response_json fragments with image_url spliced in."""
+    rows = [(i.response_json, i.file_path) for i in wardrobe(n)]
+    body = bench(item_json.render_list, rows)
+    assert LISTING.validate_json(body)[0].image_url == storage.url(rows[0][1])
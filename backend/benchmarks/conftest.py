@@ -0,0 +1,186 @@
+"""
+Benchmark harness for the analysis pipeline.
+
+Run from backend/:
+
+    python -m pytest benchmarks                 # compare against the baseline
+    BENCH_UPDATE=1 python -m pytest benchmarks  # record a new baseline
+
+Each benchmark times its callable with the `bench` fixture (warm-up, then
+rounds until BENCH_MIN_ROUNDS and BENCH_MAX_SECONDS are both met) and
+compares the median with baselines/<os>-<arch>.json. A median more than
+BENCH_TOLERANCE (default 0.5 = +50%) over the baseline fails the test.
+Benchmarks without a baseline entry only report.
+
+Images are generated into a temp dir per session: synthetic scenes at
+several camera sizes, and resized copies of fixtures/face.jpg (a real face,
+so FaceMesh has something to find).
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+import cv2
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FACE_FIXTURE = os.path.join(BENCH_DIR, "fixtures", "face.jpg")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines", f"{platform.system().lower()}-{platform.machine()}.json")
+
+UPDATE = os.getenv("BENCH_UPDATE") == "1"
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.5"))
+MIN_ROUNDS = int(os.getenv("BENCH_MIN_ROUNDS", "5"))
+MAX_SECONDS = float(os.getenv("BENCH_MAX_SECONDS", "2.0"))
+
+# Long side of the generated images: web upload, laptop webcam, 12 MP phone
+IMAGE_SIZES = {"small": 640, "medium": 1600, "large": 4000}
+
+_results: Dict[str, Dict] = {}
+
+
+def _load_baseline() -> Dict:
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    return {}
+
+
+_baseline = _load_baseline()
+
+
+# -------------------------------------------------
+# Timer
+# -------------------------------------------------
+
+class Bench:
+    def __init__(self, name: str):
+        self.name = name
+        self.stats: Dict | None = None
+
+    def __call__(self, fn: Callable, *args, warmup: int = 1, **kwargs):
+        """Times fn(*args, **kwargs); returns its last result."""
+        for _ in range(warmup):
+            result = fn(*args, **kwargs)
+
+        timings = []
+        started = time.perf_counter()
+        while len(timings) < MIN_ROUNDS or time.perf_counter() - started < MAX_SECONDS:
+            t0 = time.perf_counter_ns()
+            result = fn(*args, **kwargs)
+            timings.append((time.perf_counter_ns() - t0) / 1e6)
+
+        self.stats = {
+            "median_ms": round(statistics.median(timings), 3),
+            "min_ms": round(min(timings), 3),
+            "max_ms": round(max(timings), 3),
+            "stdev_ms": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+            "rounds": len(timings),
+        }
+        _results[self.name] = self.stats
+        self._check()
+        return result
+
+    def _check(self):
+        expected = _baseline.get(self.name, {}).get("median_ms")
+        if UPDATE or expected is None:
+            return
+        limit = expected * (1 + TOLERANCE)
+        if self.stats["median_ms"] > limit:
+            pytest.fail(
+                f"{self.name}: median {self.stats['median_ms']:.2f} ms vs baseline {expected:.2f} ms "
+                f"(limit {limit:.2f} ms at +{TOLERANCE:.0%})"
+            )
+
+
+@pytest.fixture
+def bench(request) -> Bench:
+    return Bench(request.node.name)
+
+
+# -------------------------------------------------
+# Images
+# -------------------------------------------------
+
+def _synthetic_scene(long_side: int, seed: int = 7) -> np.ndarray:
+    """Smooth background, sensor-ish noise and a face-coloured ellipse under dark hair."""
+    rng = np.random.default_rng(seed)
+    w, h = long_side * 3 // 4, long_side
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    image = np.empty((h, w, 3), np.float32)
+    image[..., 0] = 150 + 60 * xx / w
+    image[..., 1] = 140 + 40 * yy / h
+    image[..., 2] = 120 + 30 * (xx + yy) / (w + h)
+
+    center, axes = (w // 2, h * 2 // 5), (w // 5, h // 5)
+    cv2.ellipse(image, center, (axes[0] + w // 40, axes[1] + h // 30), 0, 180, 360, (35, 45, 60), -1)
+    cv2.ellipse(image, center, axes, 0, 0, 360, (150, 170, 215), -1)
+    for dx in (-1, 1):
+        cv2.circle(image, (center[0] + dx * axes[0] // 2, center[1] - axes[1] // 5), max(2, w // 60), (60, 50, 40), -1)
+
+    image += rng.normal(0, 6, image.shape).astype(np.float32)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+@pytest.fixture(scope="session")
+def synthetic_images(tmp_path_factory) -> Dict[str, str]:
+    directory = tmp_path_factory.mktemp("synthetic")
+    paths = {}
+    for label, side in IMAGE_SIZES.items():
+        path = str(directory / f"scene_{side}.jpg")
+        cv2.imwrite(path, _synthetic_scene(side), [cv2.IMWRITE_JPEG_QUALITY, 90])
+        paths[label] = path
+    return paths
+
+
+@pytest.fixture(scope="session")
+def face_images(tmp_path_factory) -> Dict[str, str]:
+    face = cv2.imread(FACE_FIXTURE)
+    if face is None:
+        pytest.skip(f"face fixture missing: {FACE_FIXTURE}")
+    directory = tmp_path_factory.mktemp("faces")
+    paths = {}
+    for label, side in IMAGE_SIZES.items():
+        scale = side / max(face.shape[:2])
+        resized = cv2.resize(face, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+        path = str(directory / f"face_{side}.jpg")
+        cv2.imwrite(path, resized, [cv2.IMWRITE_JPEG_QUALITY, 92])
+        paths[label] = path
+    return paths
+
+
+# -------------------------------------------------
+# Reporting / baseline update
+# -------------------------------------------------
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks (ms)")
+    terminalreporter.write_line(f"{'name':<58} {'median':>9} {'min':>9} {'baseline':>9} {'rounds':>6}")
+    for name, stats in sorted(_results.items()):
+        expected = _baseline.get(name, {}).get("median_ms")
+        terminalreporter.write_line(
+            f"{name:<58} {stats['median_ms']:>9.2f} {stats['min_ms']:>9.2f} "
+            f"{(f'{expected:.2f}' if expected is not None else '-'):>9} {stats['rounds']:>6}"
+        )
+    if UPDATE:
+        terminalreporter.write_line(f"\n📦 Baseline written to {os.path.relpath(BASELINE_PATH, BACKEND_DIR)}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not UPDATE or not _results:
+        return
+    baseline = dict(_baseline)
+    baseline.update(_results)
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
@@ -3,6 +3,7 @@ Manual classification for the last few edge cases
 """
 from app.database import SessionLocal
 from app.models import WardrobeItem
+from app.services.http_cache import bump_users
 from PIL import Image
 
 # Based on the images you showed:
@@ -22,6 +23,7 @@ def classify_remaining():
     db = SessionLocal()
     try:
         items = db.query(WardrobeItem).filter(WardrobeItem.category == "Uncategorized").all()
+        touched = set()
         
         for item in items:
             try:
@@ -51,11 +53,14 @@ def classify_remaining():
                         category = "Accessory"
                 
                 item.category = category
+                item.response_json = None  # rebuilt on next listing
+                touched.add(item.user_id)
                 print(f"ID {item.id}: {item.file_path} -> {category} (aspect: {aspect:.2f})")
                 
             except Exception as e:
                 print(f"Failed to process {item.id}: {e}")
         
+        bump_users(db, touched, "wardrobe")
         db.commit()
         print("\n✅ All remaining items classified")
         
@@ -7,6 +7,7 @@ from app.services.fallback_classifier import fallback_classify
 from app.services.clothing_normalizer import normalize_category
 from app.database import SessionLocal
 from app.models import WardrobeItem
+from app.services.http_cache import bump_users
 import json
 
 ALLOWED_CATEGORIES = {"Top", "Bottom", "OnePiece", "Outerwear", "Footwear", "Accessory"}
@@ -17,6 +18,7 @@ def fix_uncategorized_items():
         items = db.query(WardrobeItem).filter(WardrobeItem.category == "Uncategorized").all()
         
         print(f"Found {len(items)} uncategorized items")
+        touched = set()
         
         for item in items:
             print(f"\nProcessing ID {item.id}: {item.file_path}")
@@ -51,11 +53,14 @@ def fix_uncategorized_items():
             # Update if we found something
             if new_category:
                 item.category = new_category
+                item.response_json = None  # rebuilt on next listing
+                touched.add(item.user_id)
                 print(f"  → Updated to: {new_category}")
             else:
                 print(f"  ✗ Could not classify")
         
-        # Commit all changes
+        # Commit all changes (and invalidate the owners' wardrobe ETags)
+        bump_users(db, touched, "wardrobe")
         db.commit()
         print(f"\n✅ Database updated successfully")
         
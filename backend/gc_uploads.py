@@ -0,0 +1,24 @@
+"""
+One-off sweep of uploads/: removes orphaned files, expired analysis photos
+and stale partial uploads, then prints what was reclaimed.
+The API runs the same collector in the background; this is for cron or cleanup.
+
+Usage: python gc_uploads.py [--dry-run]
+"""
+import argparse
+import json
+
+from app.services.upload_gc import upload_gc
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted")
+    args = parser.parse_args()
+
+    report = upload_gc.collect(dry_run=args.dry_run)
+    print(json.dumps(report, indent=2))
+    print(
+        f"\n{'🔍 Would reclaim' if args.dry_run else '✅ Reclaimed'} "
+        f"{report['reclaimed_bytes'] / 1024 / 1024:.1f} MB from {report['deleted']} of {report['scanned']} files"
+    )
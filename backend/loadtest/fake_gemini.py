@@ -0,0 +1,114 @@
+"""
+Local fake Gemini server for load tests.
+Implements the generateContent endpoint with configurable latency, random 429s
+and an optional per-minute quota, returning plausible JSON for clothing
+analysis, outfit selection and outfit explanation prompts.
+
+Usage:
+    FAKE_GEMINI_LATENCY_MS=400 FAKE_GEMINI_429_RATE=0.1 FAKE_GEMINI_RPM=30 \\
+        uvicorn loadtest.fake_gemini:app --port 9100
+    GEMINI_BASE_URL=http://127.0.0.1:9100 GEMINI_API_KEY=fake uvicorn app.main:app
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from collections import deque
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_GEMINI_LATENCY_MS", "400"))
+JITTER_MS = float(os.getenv("FAKE_GEMINI_JITTER_MS", "100"))
+RATE_429 = float(os.getenv("FAKE_GEMINI_429_RATE", "0"))
+QUOTA_RPM = int(os.getenv("FAKE_GEMINI_RPM", "0"))  # 0 = unlimited
+RETRY_AFTER_S = int(os.getenv("FAKE_GEMINI_RETRY_AFTER", "2"))
+
+CATEGORIES = ["Top", "Bottom", "OnePiece", "Outerwear", "Footwear", "Accessory"]
+COLORS = [("Navy", "#000080"), ("Black", "#000000"), ("Cream", "#FFFDD0"), ("Rust", "#8B4513"), ("Red", "#CC0000")]
+
+app = FastAPI(title="Fake Gemini")
+
+_recent = deque()
+stats = {"requests": 0, "rate_limited": 0}
+
+
+def _rate_limited() -> bool:
+    if RATE_429 and random.random() < RATE_429:
+        return True
+    if QUOTA_RPM:
+        now = time.monotonic()
+        while _recent and now - _recent[0] > 60:
+            _recent.popleft()
+        if len(_recent) >= QUOTA_RPM:
+            return True
+        _recent.append(now)
+    return False
+
+
+def _clothing() -> dict:
+    category = random.choice(CATEGORIES)
+    color, hex_color = random.choice(COLORS)
+    return {
+        "category": category,
+        "subcategory": f"Fake {category}",
+        "item_type": None,
+        "color_primary": color,
+        "color_hex": hex_color,
+        "pattern": "Solid",
+        "fabric": "Cotton",
+        "fit": "Regular",
+        "seasonality": ["Autumn", "Winter"],
+        "style_tags": ["Classic"],
+        "occasion_tags": ["Work", "Casual"],
+    }
+
+
+def _outfit(prompt: str) -> dict:
+    # Compact inventory lines look like "12|Top|Shirt|Navy|..."
+    picked, seen = [], set()
+    for item_id, category in re.findall(r"^(\d+)\|(\w+)\|", prompt, flags=re.M):
+        if category not in seen:
+            seen.add(category)
+            picked.append({"item_id": int(item_id), "reason": f"Fake {category} pick"})
+    return {"outfit_name": "Fake Outfit", "items": picked}
+
+
+def _answer(prompt: str, has_image: bool) -> dict:
+    if has_image:
+        return _clothing()
+    if "WARDROBE" in prompt:
+        return _outfit(prompt)
+    return {"outfit_name": "Fake Look", "explanation": "A balanced outfit in your palette colors."}
+
+
+@app.post("/v1beta/models/{model_action}")
+async def generate_content(model_action: str, request: Request):
+    stats["requests"] += 1
+    await asyncio.sleep(max(0.0, random.gauss(LATENCY_MS, JITTER_MS)) / 1000)
+
+    if _rate_limited():
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(RETRY_AFTER_S)},
+            content={"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Fake quota exceeded"}},
+        )
+
+    body = await request.json()
+    parts = body.get("contents", [{}])[0].get("parts", [])
+    prompt = "".join(p.get("text", "") for p in parts)
+    has_image = any("inline_data" in p for p in parts)
+
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": json.dumps(_answer(prompt, has_image))}]}
+        }]
+    }
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
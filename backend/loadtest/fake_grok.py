@@ -0,0 +1,108 @@
+"""
+Local fake Grok (xAI) server for load tests.
+Implements the OpenAI-compatible chat completions endpoint, both plain JSON
+and SSE streaming, with configurable time-to-first-token, per-token delay,
+random 429s and an optional per-minute quota.
+
+Usage:
+    FAKE_GROK_LATENCY_MS=300 FAKE_GROK_TOKEN_MS=20 FAKE_GROK_429_RATE=0.05 \\
+        uvicorn loadtest.fake_grok:app --port 9300
+    XAI_BASE_URL=http://127.0.0.1:9300 XAI_API_KEY=fake uvicorn app.main:app
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_MS = float(os.getenv("FAKE_GROK_LATENCY_MS", "300"))  # time to first token
+JITTER_MS = float(os.getenv("FAKE_GROK_JITTER_MS", "80"))
+TOKEN_MS = float(os.getenv("FAKE_GROK_TOKEN_MS", "20"))  # between streamed chunks
+RATE_429 = float(os.getenv("FAKE_GROK_429_RATE", "0"))
+QUOTA_RPM = int(os.getenv("FAKE_GROK_RPM", "0"))  # 0 = unlimited
+RETRY_AFTER_S = int(os.getenv("FAKE_GROK_RETRY_AFTER", "2"))
+
+REPLIES = [
+    "For your palette, try a navy blazer over a cream knit with dark denim. "
+    "Add tan loafers and a gold watch to keep it warm and polished.",
+    "Rust and olive are great on you. Pair a rust sweater with olive chinos, "
+    "then finish with brown boots and a camel coat when it gets cold.",
+    "Keep contrast soft: a dusty rose blouse, grey wide-leg trousers and "
+    "silver jewellery will flatter your cool undertone.",
+]
+
+app = FastAPI(title="Fake Grok")
+
+_recent = deque()
+stats = {"requests": 0, "streamed": 0, "rate_limited": 0}
+
+
+def _rate_limited() -> bool:
+    if RATE_429 and random.random() < RATE_429:
+        return True
+    if QUOTA_RPM:
+        now = time.monotonic()
+        while _recent and now - _recent[0] > 60:
+            _recent.popleft()
+        if len(_recent) >= QUOTA_RPM:
+            return True
+        _recent.append(now)
+    return False
+
+
+def _chunks(text: str):
+    """Roughly token-sized pieces (a word plus its trailing space)."""
+    words = text.split(" ")
+    return [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    stats["requests"] += 1
+    body = await request.json()
+    await asyncio.sleep(max(0.0, random.gauss(LATENCY_MS, JITTER_MS)) / 1000)
+
+    if _rate_limited():
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(RETRY_AFTER_S)},
+            content={"error": {"code": "rate_limit_exceeded", "message": "Fake quota exceeded"}},
+        )
+
+    reply = random.choice(REPLIES)
+    model = body.get("model", "grok-fake")
+
+    if not body.get("stream"):
+        return {
+            "id": "fake-completion",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+        }
+
+    stats["streamed"] += 1
+
+    async def events():
+        for i, piece in enumerate(_chunks(reply)):
+            if i:
+                await asyncio.sleep(TOKEN_MS / 1000)
+            chunk = {
+                "id": "fake-completion",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
@@ -0,0 +1,114 @@
+"""
+Minimal S3-compatible stand-in for local testing of STORAGE_BACKEND=s3.
+Supports path-style PutObject, CopyObject, GetObject (including presigned URLs;
+signatures are not checked), HeadObject and DeleteObject, with objects kept in
+memory.
+
+Usage:
+    uvicorn loadtest.fake_s3:app --port 9200
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://127.0.0.1:9200 \\
+        S3_ACCESS_KEY_ID=fake S3_SECRET_ACCESS_KEY=fake uvicorn app.main:app
+"""
+import asyncio
+import hashlib
+import os
+import time
+from urllib.parse import unquote
+
+from fastapi import FastAPI, Request, Response
+
+LATENCY_MS = float(os.getenv("FAKE_S3_LATENCY_MS", "0"))
+
+app = FastAPI(title="Fake S3")
+
+objects = {}  # (bucket, key) -> {"body", "content_type", "etag", "headers"}
+stats = {"put": 0, "copy": 0, "get": 0, "head": 0, "delete": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def _not_found(key: str) -> Response:
+    body = f"<?xml version='1.0' encoding='UTF-8'?><Error><Code>NoSuchKey</Code><Key>{key}</Key></Error>"
+    return Response(body, status_code=404, media_type="application/xml")
+
+
+async def _latency():
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+
+
+@app.get("/stats")
+def get_stats():
+    return {**stats, "objects": len(objects)}
+
+
+@app.put("/{bucket}/{key:path}")
+async def put_object(bucket: str, key: str, request: Request):
+    await _latency()
+    if "x-amz-copy-source" in request.headers:
+        return _copy_object(bucket, key, request)
+    body = await request.body()
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    objects[(bucket, key)] = {
+        "body": body,
+        "content_type": request.headers.get("content-type", "application/octet-stream"),
+        "etag": etag,
+        "cache_control": request.headers.get("cache-control"),
+        "modified": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime()),
+    }
+    stats["put"] += 1
+    stats["bytes_in"] += len(body)
+    return Response(status_code=200, headers={"ETag": etag})
+
+
+def _copy_object(bucket: str, key: str, request: Request) -> Response:
+    source_bucket, _, source_key = unquote(request.headers["x-amz-copy-source"]).lstrip("/").partition("/")
+    source = objects.get((source_bucket, source_key))
+    if source is None:
+        return _not_found(source_key)
+    obj = {**source, "modified": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())}
+    if request.headers.get("x-amz-metadata-directive") == "REPLACE":
+        obj["content_type"] = request.headers.get("content-type", source["content_type"])
+        obj["cache_control"] = request.headers.get("cache-control")
+    objects[(bucket, key)] = obj
+    stats["copy"] += 1
+    body = (
+        "<?xml version='1.0' encoding='UTF-8'?><CopyObjectResult>"
+        f"<LastModified>{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())}</LastModified>"
+        f"<ETag>{obj['etag']}</ETag></CopyObjectResult>"
+    )
+    return Response(body, media_type="application/xml")
+
+
+def _headers(obj: dict) -> dict:
+    headers = {"ETag": obj["etag"], "Last-Modified": obj["modified"], "Content-Length": str(len(obj["body"]))}
+    if obj["cache_control"]:
+        headers["Cache-Control"] = obj["cache_control"]
+    return headers
+
+
+@app.head("/{bucket}/{key:path}")
+async def head_object(bucket: str, key: str):
+    stats["head"] += 1
+    obj = objects.get((bucket, key))
+    if obj is None:
+        return Response(status_code=404)
+    return Response(status_code=200, headers=_headers(obj), media_type=obj["content_type"])
+
+
+@app.get("/{bucket}/{key:path}")
+async def get_object(bucket: str, key: str):
+    await _latency()
+    stats["get"] += 1
+    obj = objects.get((bucket, key))
+    if obj is None:
+        return _not_found(key)
+    stats["bytes_out"] += len(obj["body"])
+    headers = _headers(obj)
+    headers.pop("Content-Length")
+    return Response(obj["body"], headers=headers, media_type=obj["content_type"])
+
+
+@app.delete("/{bucket}/{key:path}")
+async def delete_object(bucket: str, key: str):
+    stats["delete"] += 1
+    objects.pop((bucket, key), None)
+    return Response(status_code=204)
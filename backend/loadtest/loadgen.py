@@ -0,0 +1,282 @@
+"""
+Asyncio HTTP load generator for the API.
+
+Each virtual user registers, logs in and then loops its scenario until the
+run ends, so one run measures what a single API process sustains for that
+traffic mix. Every request is recorded per endpoint (route template, not
+the concrete URL); the report gives throughput, error counts and latency
+percentiles, plus time-to-first-token for the streaming chat.
+
+Scenarios:
+  onboarding  register, analyze a selfie, bulk-upload wardrobe photos, list them
+  browse      wardrobe / profile / analysis reads with short think times
+  chat        stylist chat, plain and streamed
+  outfits     outfit generation across occasions and variants
+  mixed       weighted mix of the above (default)
+
+Start the fakes and point the API at them first:
+    uvicorn loadtest.fake_gemini:app --port 9100
+    uvicorn loadtest.fake_grok:app --port 9300
+    GEMINI_BASE_URL=http://127.0.0.1:9100 GEMINI_API_KEY=fake \\
+    XAI_BASE_URL=http://127.0.0.1:9300 XAI_API_KEY=fake \\
+        uvicorn app.main:app --port 8000
+
+Usage:
+    python loadtest/loadgen.py --users 20 --duration 60 --scenario mixed
+    python loadtest/loadgen.py --scenario onboarding --uploads 30 --json results.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+import numpy as np
+from PIL import Image
+
+FACE_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "face.jpg")
+
+OCCASIONS = ["Work", "Casual", "Party", "Date", "Formal", "Weekend"]
+WEATHER = ["Cold", "Warm", "Neutral", "Rainy"]
+QUESTIONS = [
+    "What colors suit me best?",
+    "What should I wear to a job interview?",
+    "How do I style a navy blazer?",
+    "Which metals go with my palette?",
+    "Give me a weekend outfit idea.",
+]
+GARMENTS = ["shirt", "jeans", "dress", "blazer", "boots", "scarf", "sweater", "skirt"]
+
+MIXED_WEIGHTS = {"browse": 5, "chat": 3, "outfits": 2, "onboarding": 1}
+PERCENTILES = (50, 90, 95, 99)
+
+
+# -------------------------------------------------
+# Stats
+# -------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # endpoint -> [ms]
+        self.errors = defaultdict(lambda: defaultdict(int))  # endpoint -> status -> count
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint: str, ms: float, status: int | str):
+        self.latencies[endpoint].append(ms)
+        if not (isinstance(status, int) and status < 400):
+            self.errors[endpoint][str(status)] += 1
+
+    def report(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        rows = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            rows[endpoint] = {
+                "count": len(values),
+                "rps": round(len(values) / elapsed, 2),
+                "errors": dict(self.errors.get(endpoint, {})),
+                **{f"p{p}_ms": round(_percentile(values, p), 1) for p in PERCENTILES},
+                "max_ms": round(values[-1], 1),
+            }
+        total = sum(r["count"] for r in rows.values())
+        return {"elapsed_s": round(elapsed, 1), "requests": total, "rps": round(total / elapsed, 2), "endpoints": rows}
+
+
+def _percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def print_report(report: dict):
+    print(f"\n📊 {report['requests']} requests in {report['elapsed_s']}s ({report['rps']} req/s)\n")
+    header = f"{'endpoint':<38} {'count':>6} {'req/s':>7} " + " ".join(f"{f'p{p}':>8}" for p in PERCENTILES) + f" {'max':>8}  errors"
+    print(header)
+    print("-" * len(header))
+    for endpoint, row in report["endpoints"].items():
+        errors = ", ".join(f"{k}x{v}" for k, v in row["errors"].items()) or "-"
+        print(
+            f"{endpoint:<38} {row['count']:>6} {row['rps']:>7.2f} "
+            + " ".join(f"{row[f'p{p}_ms']:>8.1f}" for p in PERCENTILES)
+            + f" {row['max_ms']:>8.1f}  {errors}"
+        )
+
+
+# -------------------------------------------------
+# Virtual user
+# -------------------------------------------------
+
+def garment_image(rnd: random.Random) -> bytes:
+    """A unique small JPEG (uploads are content-addressed, so identical bytes would dedupe)."""
+    w, h = rnd.choice([(480, 640), (600, 800), (720, 960)])
+    colour = np.array([rnd.randrange(256) for _ in range(3)], np.uint8)
+    pixels = np.full((h, w, 3), 235, np.uint8)
+    pixels[h // 8: h * 7 // 8, w // 5: w * 4 // 5] = colour
+    noise = np.random.default_rng(rnd.randrange(1 << 30)).integers(0, 12, pixels.shape, dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels + noise).save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, args, index: int):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.rnd = random.Random(args.seed + index)
+        self.email = f"load-{uuid.uuid4().hex[:10]}@example.com"
+        self.headers = {}
+        self.conversation_id = None
+
+    async def request(self, method: str, url: str, endpoint: str | None = None, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        self.recorder.record(endpoint or f"{method} {url}", (time.perf_counter() - started) * 1000, status)
+        return response
+
+    async def think(self):
+        if self.args.think_ms:
+            await asyncio.sleep(self.rnd.uniform(0.5, 1.5) * self.args.think_ms / 1000)
+
+    # --------------------------------------------------
+    async def sign_up(self) -> bool:
+        await self.request("POST", "/auth/register", json={"email": self.email, "password": "loadtest-pass", "full_name": "Load Test"})
+        response = await self.request("POST", "/auth/token", data={"username": self.email, "password": "loadtest-pass"})
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def onboarding(self):
+        if self.args.selfie:
+            with open(self.args.selfie, "rb") as f:
+                await self.request("POST", "/profile/analyze-photo", files={"file": ("selfie.jpg", f.read(), "image/jpeg")})
+        for i in range(self.args.uploads):
+            garment = self.rnd.choice(GARMENTS)
+            await self.request(
+                "POST", "/wardrobe/",
+                files={"file": (f"{garment}_{i}.jpg", garment_image(self.rnd), "image/jpeg")},
+                data={"enrich": "true" if self.args.enrich else "false"},
+            )
+        await self.request("GET", "/wardrobe/")
+
+    async def browse(self):
+        for url in ("/wardrobe/", "/profile/", "/profile/analysis"):
+            await self.request("GET", url)
+            await self.think()
+
+    async def chat(self):
+        payload = {"message": self.rnd.choice(QUESTIONS), "conversation_id": self.conversation_id}
+        if self.rnd.random() < 0.5:
+            response = await self.request("POST", "/stylist/chat", json=payload)
+            if response is not None and response.status_code == 200:
+                self.conversation_id = response.json()["conversation_id"]
+        else:
+            await self.chat_stream(payload)
+        await self.think()
+
+    async def chat_stream(self, payload: dict):
+        endpoint = "POST /stylist/chat/stream"
+        started = time.perf_counter()
+        first_token = None
+        try:
+            async with self.client.stream("POST", "/stylist/chat/stream", json=payload, headers=self.headers) as response:
+                status = response.status_code
+                event = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event = line[len("event:"):].strip()
+                    elif line.startswith("data:") and event == "token" and first_token is None:
+                        first_token = time.perf_counter()
+                    elif line.startswith("data:") and event == "meta":
+                        self.conversation_id = json.loads(line[len("data:"):])["conversation_id"]
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        self.recorder.record(endpoint, (time.perf_counter() - started) * 1000, status)
+        if first_token is not None:
+            self.recorder.record(f"{endpoint} (first token)", (first_token - started) * 1000, 200)
+
+    async def outfits(self):
+        await self.request("POST", "/outfits/generate", json={
+            "occasion": self.rnd.choice(OCCASIONS),
+            "weather": self.rnd.choice(WEATHER),
+            "variant": self.rnd.randrange(3),
+        })
+        await self.think()
+
+    # --------------------------------------------------
+    async def run(self, scenario: str, deadline: float):
+        if not await self.sign_up():
+            return
+        if scenario != "onboarding":
+            # Later scenarios need a wardrobe to browse and style
+            await self.onboarding()
+        while time.perf_counter() < deadline:
+            name = scenario
+            if scenario == "mixed":
+                name = self.rnd.choices(list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values()))[0]
+            if name == "onboarding":
+                # Fresh account per onboarding pass
+                self.email = f"load-{uuid.uuid4().hex[:10]}@example.com"
+                self.conversation_id = None
+                if not await self.sign_up():
+                    return
+            await getattr(self, name)()
+
+
+# -------------------------------------------------
+# Main
+# -------------------------------------------------
+
+async def main(args):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users * 2)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        deadline = time.perf_counter() + args.duration
+        users = []
+        for i in range(args.users):
+            users.append(asyncio.create_task(VirtualUser(client, recorder, args, i).run(args.scenario, deadline)))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.users)
+        print(f"🚀 {args.users} users running '{args.scenario}' against {args.base_url} for {args.duration}s")
+        await asyncio.gather(*users)
+    recorder.finished = time.perf_counter()
+
+    report = recorder.report()
+    report["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=["onboarding", "browse", "chat", "outfits", "mixed"], default="mixed")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp", type=float, default=0, help="seconds to spread user start-up over")
+    parser.add_argument("--uploads", type=int, default=10, help="wardrobe photos per onboarding")
+    parser.add_argument("--no-enrich", dest="enrich", action="store_false", help="upload with enrich=false")
+    parser.add_argument("--selfie", default=FACE_FIXTURE if os.path.exists(FACE_FIXTURE) else None,
+                        help="photo for /profile/analyze-photo during onboarding (default: the benchmark face)")
+    parser.add_argument("--think-ms", type=float, default=200, help="mean pause between user actions")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the report here")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""
+Moves existing flat uploads (uploads/wardrobe/<uuid>.jpg) into the sharded,
+content-addressed layout and rewrites WardrobeItem.file_path in bulk. With
+STORAGE_BACKEND=s3 the files are uploaded to the bucket under the new keys
+instead (the flat local copies are left to the GC).
+
+Rows are processed in id-ordered chunks; each chunk's files are moved first and
+the paths committed right after, so an interrupted run can simply be restarted
+(already migrated rows are skipped). Duplicate images collapse into one file.
+Leftover flat files (old analysis photos, orphans) are left to gc_uploads.py.
+
+Usage: python migrate_upload_layout.py [--dry-run] [--chunk-size 1000]
+"""
+import argparse
+import hashlib
+import os
+import time
+
+from app.database import SessionLocal
+from app.models import WardrobeItem
+from app.services.http_cache import bump_users
+from app.services.storage import storage, shard_path, is_sharded
+from app.services.upload_writer import EXTENSIONS, sniff_image_type
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(path: str) -> tuple[str, str, str]:
+    """(sha256, extension, MIME type) of a file on disk, from its sniffed image type."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        head = f.read(HASH_CHUNK)
+        mime_type = sniff_image_type(head)
+        while head:
+            digest.update(head)
+            head = f.read(HASH_CHUNK)
+    ext = EXTENSIONS.get(mime_type) or os.path.splitext(path)[1].lower() or ".jpg"
+    return digest.hexdigest(), ext, mime_type or "image/jpeg"
+
+
+def migrate(dry_run: bool, chunk_size: int):
+    db = SessionLocal()
+    started = time.perf_counter()
+    stats = {"rows": 0, "moved": 0, "deduplicated": 0, "missing": 0, "already": 0}
+    last_id = 0
+    placed = set()  # keys written by this run (S3 keys have no local file to check)
+    try:
+        while True:
+            rows = (
+                db.query(WardrobeItem.id, WardrobeItem.user_id, WardrobeItem.file_path)
+                .filter(WardrobeItem.id > last_id)
+                .order_by(WardrobeItem.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            owners = set()
+            for row in rows:
+                stats["rows"] += 1
+                path = (row.file_path or "").replace("\\", "/")
+                if is_sharded(path):
+                    stats["already"] += 1
+                    continue
+                if not os.path.exists(path):
+                    stats["missing"] += 1
+                    continue
+
+                digest, ext, mime_type = file_digest(path)
+                target = shard_path(storage.root, "wardrobe", digest, ext)
+                if target in placed or os.path.exists(target):
+                    stats["deduplicated"] += 1
+                else:
+                    stats["moved"] += 1
+                # Duplicates stay where they are; once unreferenced, gc_uploads.py removes them
+                if not dry_run and target not in placed:
+                    storage.put_file(path, target, mime_type)
+                placed.add(target)
+                updates.append({"id": row.id, "file_path": target, "response_json": None})
+                owners.add(row.user_id)
+
+            if updates and not dry_run:
+                db.bulk_update_mappings(WardrobeItem, updates)
+                # Cached listings hold the old image paths
+                bump_users(db, owners, "wardrobe")
+                db.commit()
+
+            rate = stats["rows"] / (time.perf_counter() - started)
+            print(f"📦 {stats['rows']} rows | {stats['moved']} moved | {stats['deduplicated']} duplicates | {rate:.0f} rows/s")
+    finally:
+        db.close()
+
+    print(f"\n{'🔍 Dry run' if dry_run else '✅ Done'}: {stats}")
+    if stats["deduplicated"] and not dry_run:
+        print("   Run gc_uploads.py to remove the duplicate flat files.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    migrate(args.dry_run, args.chunk_size)
@@ -0,0 +1,252 @@
+"""
+Resumable batch re-tagging of wardrobe categories.
+
+Rows are streamed in id order (keyset pagination) and each chunk goes through:
+  1. stored Gemini metadata, batch-normalized
+  2. the local chain (filename keywords -> local model -> shape heuristics) in a process pool
+  3. optionally Gemini (--gemini) for rows the local chain could only guess,
+     with bounded concurrency on the scheduler's background lane
+Results are bulk-updated per chunk and the last id is checkpointed, so an
+interrupted run continues where it stopped. Images are read through the
+storage backend: with STORAGE_BACKEND=s3 each chunk's objects are downloaded
+to a temp dir first.
+
+Usage:
+    python retag_wardrobe.py                      # Uncategorized rows only
+    python retag_wardrobe.py --all --gemini       # every row, Gemini for weak guesses
+    python retag_wardrobe.py --reset              # ignore the checkpoint
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import WardrobeItem
+from app.services import vision_service
+from app.services.api_scheduler import BACKGROUND
+from app.services.storage import storage
+from app.services.http_cache import bump_users
+from app.services.clothing_normalizer import normalize_categories, normalize_category
+from app.services.fallback_classifier import (
+    analyze_image_properties,
+    classify_by_keywords,
+    extract_keywords_from_filename,
+    smart_classify,
+)
+from app.services.local_classifier import local_classifier
+
+ALLOWED_CATEGORIES = {"Top", "Bottom", "OnePiece", "Outerwear", "Footwear", "Accessory"}
+WEAK_SOURCES = {None, "fallback_heuristic"}
+
+
+# -------------------------------------------------
+# Local chain (runs in worker processes)
+# -------------------------------------------------
+
+def classify_local(job: tuple) -> tuple:
+    """(item_id, file_path, local copy | None) -> (item_id, category | None, source | None)"""
+    item_id, file_path, local_path = job
+
+    category = classify_by_keywords(extract_keywords_from_filename(os.path.basename(file_path)))
+    if category:
+        return item_id, category, "filename"
+    if local_path is None:
+        return item_id, None, None
+
+    props = analyze_image_properties(local_path)
+    guess = local_classifier.predict(local_path, props)
+    if guess and guess["confidence"] >= settings.LOCAL_CLASSIFIER_THRESHOLD:
+        return item_id, guess["category"], "local_model"
+
+    return item_id, smart_classify(local_path, props), "fallback_heuristic"
+
+
+# -------------------------------------------------
+# Helpers
+# -------------------------------------------------
+
+def load_checkpoint(path: str, scope: str) -> dict:
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("scope") == scope:
+            return state
+        print(f"⚠️ Checkpoint is for scope '{state.get('scope')}', starting over")
+    return {"scope": scope, "last_id": 0, "processed": 0, "updated": 0}
+
+
+def save_checkpoint(path: str, state: dict):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def stored_ai(raw: str | None) -> dict | None:
+    try:
+        data = json.loads(raw) if raw else None
+    except ValueError:
+        return None
+    if isinstance(data, dict) and "ai" in data:
+        data = data["ai"]
+    return data if isinstance(data, dict) else None
+
+
+def decision_source(raw: str | None) -> str | None:
+    try:
+        data = json.loads(raw) if raw else None
+    except ValueError:
+        return None
+    return (data.get("decision") or {}).get("source") if isinstance(data, dict) else None
+
+
+def fetch_chunk(db, last_id: int, chunk_size: int, all_rows: bool):
+    query = db.query(
+        WardrobeItem.id, WardrobeItem.user_id, WardrobeItem.file_path, WardrobeItem.category, WardrobeItem.ai_metadata
+    ).filter(WardrobeItem.id > last_id)
+    if not all_rows:
+        query = query.filter(WardrobeItem.category == "Uncategorized")
+    return query.order_by(WardrobeItem.id).limit(chunk_size).all()
+
+
+async def ask_gemini(rows: list, local_paths: dict, concurrency: int) -> dict:
+    """item_id -> Gemini metadata for each row (None on failure)."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(row):
+        async with semaphore:
+            try:
+                return row.id, await vision_service.analyze_clothing_image(local_paths[row.id], lane=BACKGROUND)
+            except Exception as e:
+                print(f"⚠️ Gemini failed for {row.id}: {e}")
+                return row.id, None
+
+    return dict(await asyncio.gather(*(one(r) for r in rows)))
+
+
+# -------------------------------------------------
+# Main loop
+# -------------------------------------------------
+
+async def retag(args):
+    scope = "all" if args.all else "uncategorized"
+    state = {"scope": scope, "last_id": 0, "processed": 0, "updated": 0}
+    if not args.reset:
+        state = load_checkpoint(args.checkpoint, scope)
+    if state["last_id"]:
+        print(f"↩️ Resuming after id {state['last_id']} ({state['processed']} rows done)")
+
+    db = SessionLocal()
+    remaining = db.query(WardrobeItem.id).filter(WardrobeItem.id > state["last_id"])
+    if not args.all:
+        remaining = remaining.filter(WardrobeItem.category == "Uncategorized")
+    total = remaining.count()
+    print(f"🔎 {total} rows to re-tag ({scope}), chunks of {args.chunk_size}, {args.workers} workers")
+
+    started = time.perf_counter()
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            while True:
+                rows = fetch_chunk(db, state["last_id"], args.chunk_size, args.all)
+                if not rows:
+                    break
+
+                results = {}  # item_id -> (category, source, ai)
+
+                # 1. Stored Gemini metadata
+                ai_by_id = {r.id: stored_ai(r.ai_metadata) for r in rows}
+                with_ai = [r for r in rows if ai_by_id[r.id]]
+                names = normalize_categories(
+                    (ai_by_id[r.id].get("category"), ai_by_id[r.id].get("subcategory"), ai_by_id[r.id].get("type"))
+                    for r in with_ai
+                )
+                for r, name in zip(with_ai, names):
+                    if name in ALLOWED_CATEGORIES:
+                        results[r.id] = (name, "ai_semantic", ai_by_id[r.id])
+
+                pending = [r for r in rows if r.id not in results]
+                with tempfile.TemporaryDirectory(prefix="retag_") as staging:
+                    # Local copies of the images (the files themselves for local storage)
+                    local_paths = {r.id: storage.stage(r.file_path, staging) for r in pending}
+
+                    # 2. Local chain in the process pool
+                    jobs = [(r.id, r.file_path, local_paths[r.id]) for r in pending]
+                    chunksize = max(1, len(jobs) // (args.workers * 4))
+                    for item_id, category, source in pool.map(classify_local, jobs, chunksize=chunksize):
+                        if category in ALLOWED_CATEGORIES:
+                            results[item_id] = (category, source, ai_by_id[item_id])
+
+                    # 3. Gemini for rows the local chain could only guess
+                    if args.gemini:
+                        weak = [
+                            r for r in pending
+                            if local_paths[r.id] and results.get(r.id, (None, None))[1] in WEAK_SOURCES
+                        ]
+                        for item_id, ai in (await ask_gemini(weak, local_paths, args.gemini_concurrency)).items():
+                            category = normalize_category(
+                                ai.get("category"), ai.get("subcategory"), ai.get("type"), ai.get("item_type")
+                            ) if ai else None
+                            if category in ALLOWED_CATEGORIES:
+                                results[item_id] = (category, "ai_semantic", ai)
+
+                # 4. Bulk update
+                by_id = {r.id: r for r in rows}
+                updates = [
+                    {
+                        "id": item_id,
+                        "category": category,
+                        "ai_metadata": json.dumps({"ai": ai, "decision": {"source": source, "retagged": True}}),
+                        "response_json": None,  # rebuilt on next listing
+                    }
+                    for item_id, (category, source, ai) in results.items()
+                    if category != by_id[item_id].category
+                    # Never replace a real category with a shape guess, or overrule the user
+                    and not (source in WEAK_SOURCES and by_id[item_id].category != "Uncategorized")
+                    and decision_source(by_id[item_id].ai_metadata) != "user_input"
+                ]
+                if updates and not args.dry_run:
+                    db.bulk_update_mappings(WardrobeItem, updates)
+                    # Invalidate the owners' wardrobe ETags
+                    bump_users(db, (by_id[u["id"]].user_id for u in updates), "wardrobe")
+                    db.commit()
+
+                state["last_id"] = rows[-1].id
+                state["processed"] += len(rows)
+                state["updated"] += len(updates)
+                if not args.dry_run:
+                    save_checkpoint(args.checkpoint, state)
+
+                done += len(rows)
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed if elapsed else 0.0
+                eta = (total - done) / rate if rate else 0.0
+                print(
+                    f"📦 {done}/{total} rows | {len(updates)} updated in chunk | "
+                    f"{rate:.0f} rows/s | ETA {eta:.0f}s"
+                )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Re-tagged {done} rows in {elapsed:.1f}s ({state['updated']} updated in total)")
+    if args.dry_run:
+        print("   (dry run, nothing written)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="re-tag every row, not just Uncategorized")
+    parser.add_argument("--gemini", action="store_true", help="ask Gemini when the local chain only has a heuristic guess")
+    parser.add_argument("--gemini-concurrency", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--checkpoint", default="retag_checkpoint.json")
+    parser.add_argument("--reset", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(retag(parser.parse_args()))
@@ -0,0 +1,53 @@
+"""
+Behavior checks for the backend services.
+
+Run from backend/:
+
+    python -m pytest tests
+
+Unlike the top-level test_*.py scripts these need no running server, API
+keys or network: everything runs in-process against a throwaway SQLite
+database and temp directories created for the session.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Settings are read at import, so point all runtime state at a temp dir first
+_STATE_DIR = tempfile.mkdtemp(prefix="backend_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_STATE_DIR, 'test.db')}"
+os.environ["RESPONSE_CACHE_PATH"] = os.path.join(_STATE_DIR, "response_cache.db")
+os.environ["PROFILE_DIR"] = os.path.join(_STATE_DIR, "profiles")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+for key in ("GEMINI_API_KEY", "XAI_API_KEY"):
+    os.environ.pop(key, None)
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    """A fresh user row per test."""
+    count = db.query(models.User).count()
+    row = models.User(email=f"user{count}@example.com", hashed_password="x")
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
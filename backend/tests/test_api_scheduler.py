@@ -0,0 +1,90 @@
+"""Token-bucket scheduler: priority lanes, Retry-After parsing and its cap."""
+import asyncio
+from email.utils import formatdate
+import time
+
+import httpx
+import pytest
+
+from app.services.api_scheduler import BACKGROUND, INTERACTIVE, TokenBucketScheduler, _retry_after
+
+URL = "https://provider.test/generate"
+
+
+def fake_provider(monkeypatch, responses):
+    """Routes the scheduler's httpx clients to canned responses; returns the request log."""
+    calls = []
+    real_client = httpx.AsyncClient
+
+    def handler(request):
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return calls
+
+
+def test_retry_after_sources():
+    assert _retry_after(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+    date = formatdate(time.time() + 60, usegmt=True)
+    assert 55 < _retry_after(httpx.Response(429, headers={"Retry-After": date})) <= 60
+    body = '{"error": {"details": [{"retryDelay": "13s"}]}}'
+    assert _retry_after(httpx.Response(429, text=body)) == 13.0
+    assert _retry_after(httpx.Response(503)) is None
+
+
+def test_interactive_lane_goes_first():
+    scheduler = TokenBucketScheduler("test", rate_per_minute=600, burst=1)
+    order = []
+
+    async def call(lane, name):
+        await scheduler.acquire(lane)
+        order.append(name)
+
+    async def run():
+        await scheduler.acquire(INTERACTIVE)  # drain the bucket
+        background = asyncio.create_task(call(BACKGROUND, "background"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call(INTERACTIVE, "interactive"))
+        await asyncio.gather(background, interactive)
+
+    asyncio.run(run())
+    assert order == ["interactive", "background"]
+    assert scheduler.stats()["lanes"][BACKGROUND]["requests"] == 1
+
+
+def test_short_retry_after_is_honored(monkeypatch):
+    calls = fake_provider(monkeypatch, [
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(200, json={"ok": True}),
+    ])
+    scheduler = TokenBucketScheduler("test", rate_per_minute=6000, burst=5, max_delay=5)
+
+    res = asyncio.run(scheduler.post(URL, json={}, timeout=1))
+    assert res.status_code == 200
+    assert len(calls) == 2
+    assert scheduler.retries == 1
+    assert scheduler.throttled == 1
+
+
+def test_long_retry_after_fails_fast_and_caps_the_pause(monkeypatch):
+    calls = fake_provider(monkeypatch, [httpx.Response(429, headers={"Retry-After": "3600"})])
+    scheduler = TokenBucketScheduler("test", rate_per_minute=6000, burst=5, max_delay=5)
+
+    started = time.monotonic()
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scheduler.post(URL, json={}, timeout=1))
+    assert time.monotonic() - started < 1
+    assert len(calls) == 1
+    assert 0 < scheduler.stats()["paused_for_s"] <= 5
+
+
+def test_retries_are_bounded(monkeypatch):
+    calls = fake_provider(monkeypatch, [httpx.Response(503, headers={"Retry-After": "0"})])
+    scheduler = TokenBucketScheduler("test", rate_per_minute=6000, burst=5, max_retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scheduler.post(URL, json={}, timeout=1))
+    assert len(calls) == 3
@@ -0,0 +1,114 @@
+"""Circuit breaker state transitions and half-open probe accounting."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.api_scheduler import TokenBucketScheduler
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, recovery_timeout=30)
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert not breaker.available()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_single_probe_after_recovery(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.available()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one probe at a time
+
+
+def test_probe_outcome_closes_or_reopens(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_released_probe_frees_the_slot(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+
+
+def test_lost_probe_expires(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 30
+    assert breaker.allow_request()
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+def test_scheduler_fails_fast_while_open(monkeypatch):
+    calls = []
+    real_client = httpx.AsyncClient
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    scheduler = TokenBucketScheduler("test", rate_per_minute=6000, burst=5, max_retries=5, base_delay=0, breaker=breaker)
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(scheduler.post("https://provider.test/", json={}, timeout=1))
+    assert len(calls) == 2
+    assert breaker.state == OPEN
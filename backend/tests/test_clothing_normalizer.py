@@ -0,0 +1,73 @@
+"""Keyword matcher behind normalize_category and the filename fallbacks."""
+import pytest
+
+from app.services.clothing_normalizer import (
+    CATEGORY_SYNONYMS,
+    KeywordMatcher,
+    keyword_matcher,
+    normalize_categories,
+    normalize_category,
+)
+
+
+@pytest.mark.parametrize("labels, expected", [
+    (("Top",), "Top"),
+    (("t-shirt",), "Top"),
+    (("Denim Jeans",), "Bottom"),
+    (("dresses",), "OnePiece"),
+    (("blouses",), "Top"),
+    (("sweatpants",), "Bottom"),
+    (("raincoat",), "Outerwear"),
+    (("ankle boots",), "Footwear"),
+    ((None, "sunglasses"), "Accessory"),
+    (("laptops",), "Uncategorized"),
+    (("flowers",), "Uncategorized"),
+    ((None, None), "Uncategorized"),
+])
+def test_normalize_category(labels, expected):
+    assert normalize_category(*labels) == expected
+
+
+def test_exact_hits_outweigh_stems_and_compounds():
+    scores = keyword_matcher.scores("dress", "sweatpants")
+    assert scores["OnePiece"] == 2
+    assert scores["Bottom"] == 1
+    assert normalize_category("dress", "sweatpants") == "OnePiece"
+
+
+def test_scores_sum_across_fields():
+    assert normalize_category("shirt", "jeans", "cargo pants") == "Bottom"
+    # a token counts once, whichever fields repeat it
+    assert keyword_matcher.scores("jeans", "denim jeans")["Bottom"] == 2
+
+
+@pytest.mark.parametrize("description", [
+    "a participant wearing it",
+    "rampant florals",
+    "a flippant look",
+    "worn with a headdress",
+])
+def test_free_text_skips_compound_words(description):
+    assert normalize_category(None, free_text=description) == "Uncategorized"
+    assert normalize_category("Top", free_text=description) == "Top"
+
+
+def test_free_text_matches_words_and_plurals():
+    assert normalize_category(None, free_text="Two floral dresses") == "OnePiece"
+    assert keyword_matcher.match(free_text="a belt and sneakers") == {"Accessory", "Footwear"}
+
+
+def test_filename_tokens():
+    assert keyword_matcher.match("uploads/red_sneakers-01.jpg") == {"Footwear"}
+    assert "Footwear" not in keyword_matcher.match("uploads/wardrobe/ab/cd/0f3e.jpg")
+
+
+def test_generic_keywords_never_match_as_suffix():
+    matcher = KeywordMatcher(CATEGORY_SYNONYMS)
+    assert matcher.match("sunflower", "earring") == {"Accessory"}  # "earring" is a keyword itself
+    assert matcher.match("boring", "flatflats") == set()
+
+
+def test_batch_matches_single_calls():
+    rows = [("dresses", None), ("jacket", "coat"), ("laptop", None), ("dresses", None)]
+    assert normalize_categories(rows) == [normalize_category(*row) for row in rows]
@@ -0,0 +1,116 @@
+"""ETag / If-None-Match on the per-user read endpoints and version bumps on writes."""
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.main import app
+from app.services import http_cache
+from app.services.http_cache import _matches, resources_for
+
+_emails = (f"etag{i}@example.com" for i in itertools.count())
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def login(client, db):
+    def login():
+        email = next(_emails)
+        client.post("/auth/register", json={"email": email, "password": "pw", "full_name": "E"})
+        token = client.post("/auth/token", data={"username": email, "password": "pw"}).json()["access_token"]
+        user_id = db.query(models.User.id).filter(models.User.email == email).scalar()
+        return {"Authorization": f"Bearer {token}"}, user_id
+    return login
+
+
+def etag(client, headers, path="/wardrobe/"):
+    res = client.get(path, headers=headers)
+    assert res.status_code == 200
+    return res.headers["etag"]
+
+
+def add_item(db, user_id):
+    item = models.WardrobeItem(user_id=user_id, file_path="uploads/wardrobe/aa/bb/x.jpg", category="Top")
+    db.add(item)
+    http_cache.bump(db, user_id, "wardrobe")  # what scripts must do before committing
+    db.commit()
+    return item.id
+
+
+def test_resources_for():
+    assert resources_for("/wardrobe/") == ("wardrobe",)
+    assert resources_for("/profile/analysis") == ("analysis",)
+    assert resources_for("/profile/palette/nearest") == ("analysis", "wardrobe")
+    assert resources_for("/profile/") == ("profile",)
+    assert resources_for("/wardrobes") == ()
+    assert resources_for("/stylist/chat") == ()
+
+
+def test_weak_comparison():
+    tag = 'W/"1-0-abc"'
+    assert _matches(tag, tag)
+    assert _matches('"1-0-abc"', tag)
+    assert _matches('"other", W/"1-0-abc"', tag)
+    assert _matches("*", tag)
+    assert not _matches('W/"1-1-abc"', tag)
+
+
+def test_matching_etag_gets_304(client, login):
+    headers, _ = login()
+    res = client.get("/wardrobe/", headers=headers)
+    assert res.headers["cache-control"] == "private, no-cache"
+    assert "Authorization" in res.headers["vary"]
+
+    cached = client.get("/wardrobe/", headers={**headers, "If-None-Match": res.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == res.headers["etag"]
+
+
+def test_etag_is_per_user_and_per_query(client, login):
+    first, _ = login()
+    second, _ = login()
+    tag = etag(client, first)
+    assert client.get("/wardrobe/", headers={**second, "If-None-Match": tag}).status_code == 200
+    assert etag(client, first, "/wardrobe/?limit=5") != tag
+
+
+def test_script_bump_invalidates(client, login, db):
+    headers, user_id = login()
+    tag = etag(client, headers)
+    item_id = add_item(db, user_id)
+
+    res = client.get("/wardrobe/", headers={**headers, "If-None-Match": tag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != tag
+    assert [i["id"] for i in res.json()] == [item_id]
+
+
+def test_successful_writes_bump_only_their_resource(client, login, db):
+    headers, user_id = login()
+    item_id = add_item(db, user_id)
+    wardrobe_tag = etag(client, headers)
+    profile_tag = etag(client, headers, "/profile/")
+
+    assert client.put("/profile/", json={"age": 30}, headers=headers).status_code == 200
+    assert etag(client, headers, "/profile/") != profile_tag
+    assert etag(client, headers) == wardrobe_tag
+
+    assert client.delete("/wardrobe/999999", headers=headers).status_code == 404
+    assert etag(client, headers) == wardrobe_tag  # failed writes don't bump
+
+    assert client.delete(f"/wardrobe/{item_id}", headers=headers).status_code == 200
+    res = client.get("/wardrobe/", headers={**headers, "If-None-Match": wardrobe_tag})
+    assert res.status_code == 200
+    assert res.json() == []
+
+
+def test_anonymous_requests_pass_through(client):
+    res = client.get("/wardrobe/", headers={"If-None-Match": "*"})
+    assert res.status_code == 401
+    assert "etag" not in res.headers
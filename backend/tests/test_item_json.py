@@ -0,0 +1,67 @@
+"""Pre-serialized wardrobe item fragments and image_url splicing."""
+import json
+
+import pytest
+
+from app import models, schemas
+from app.services import item_json
+from app.services.storage import storage
+
+
+def item(**overrides):
+    fields = dict(
+        id=7, user_id=1, file_path="uploads\\wardrobe\\ab\\cd\\7.jpg", category="OnePiece",
+        subcategory="robe d'été", color_primary="#AABBCC", color_name="Blue",
+        seasonality=json.dumps(["Summer"]), occasion_tags=json.dumps(["Party"]), style_tags=None,
+        match_level=None, ai_metadata=json.dumps({"ai": {"category": "dress"}, "decision": {"source": "gemini"}}),
+    )
+    fields.update(overrides)
+    return models.WardrobeItem(**fields)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(item_json, "orjson", None)
+    elif item_json.orjson is None:
+        pytest.skip("orjson not installed")
+
+
+def test_fragment_matches_the_response_model(encoder):
+    row = item()
+    item_json.refresh(row)
+    body = item_json.render(row.response_json, row.file_path)
+
+    response = schemas.WardrobeItemResponse.model_validate_json(body)
+    assert response.file_path == "uploads/wardrobe/ab/cd/7.jpg"
+    assert response.image_url == storage.url(row.file_path)
+    assert response.subcategory == "robe d'été"
+    assert response.style_tags == []
+    assert response.match_level == "neutral"
+    assert response.ai_metadata["decision"]["source"] == "gemini"
+    assert "image_url" not in json.loads(row.response_json)
+
+
+def test_spliced_url_is_escaped(encoder, monkeypatch):
+    monkeypatch.setattr(storage, "url", lambda path: 'https://cdn.test/a"b\\c?sig=1&x=2')
+    row = item()
+    item_json.refresh(row)
+    assert json.loads(item_json.render(row.response_json, row.file_path))["image_url"] == 'https://cdn.test/a"b\\c?sig=1&x=2'
+
+
+def test_render_list(encoder):
+    rows = []
+    for i in range(1, 4):
+        row = item(id=i)
+        item_json.refresh(row)
+        rows.append((row.response_json, row.file_path))
+    assert [i["id"] for i in json.loads(item_json.render_list(rows))] == [1, 2, 3]
+    assert item_json.render_list([]) == b"[]"
+
+
+def test_encoders_agree(monkeypatch):
+    if item_json.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = item_json.build(item())
+    monkeypatch.setattr(item_json, "orjson", None)
+    assert json.loads(item_json.build(item())) == json.loads(fast)
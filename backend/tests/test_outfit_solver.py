@@ -0,0 +1,80 @@
+"""Outfit solver: template selection, pinned items and weather layers."""
+import itertools
+
+from app import models
+from app.services.outfit_solver import OutfitSolver
+
+_ids = itertools.count(1)
+
+
+def item(category, color="#334455", match_level="best", **fields):
+    return models.WardrobeItem(
+        id=next(_ids), category=category, subcategory=category.lower(),
+        color_primary=color, match_level=match_level, **fields,
+    )
+
+
+def categories(outfit):
+    return sorted(i.category for _, i in outfit["items"])
+
+
+def wardrobe():
+    return [
+        item("Top"), item("Bottom"), item("OnePiece"),
+        item("Footwear"), item("Accessory"), item("Outerwear"),
+    ]
+
+
+def test_outfit_is_a_one_piece_or_top_and_bottom():
+    outfits = OutfitSolver().solve(1, wardrobe(), {"weather": "hot"}, k=5)
+    assert outfits
+    for outfit in outfits:
+        cats = categories(outfit)
+        assert ("OnePiece" in cats) != ("Top" in cats and "Bottom" in cats)
+        assert {"Footwear", "Accessory"} <= set(cats)
+        assert "Outerwear" not in cats  # no layer in warm weather
+        assert outfit["missing"] == []
+
+
+def test_cold_weather_forces_a_layer():
+    for outfit in OutfitSolver().solve(1, wardrobe(), {"weather": "cold"}, k=3):
+        assert "Outerwear" in categories(outfit)
+
+
+def test_pinned_top_never_gets_a_one_piece():
+    items = wardrobe()
+    top = items[0]
+    for outfit in OutfitSolver().solve(1, items, {"weather": "hot"}, k=5, fixed=[top]):
+        assert top.id in {i.id for _, i in outfit["items"]}
+        assert categories(outfit) == ["Accessory", "Bottom", "Footwear", "Top"]
+
+
+def test_pinned_one_piece_needs_no_top_or_bottom():
+    items = wardrobe()
+    dress = items[2]
+    outfit = OutfitSolver().solve(1, items, {"weather": "hot"}, fixed=[dress])[0]
+    assert categories(outfit) == ["Accessory", "Footwear", "OnePiece"]
+
+
+def test_missing_categories_are_reported():
+    items = [item("Top"), item("Footwear")]
+    outfit = OutfitSolver().solve(1, items, {"weather": "hot"}, fixed=[items[0]])[0]
+    assert categories(outfit) == ["Footwear", "Top"]
+    assert outfit["missing"] == ["Bottom", "Accessory"]
+
+
+def test_prefers_palette_matches_and_is_deterministic():
+    items = wardrobe() + [item("Top", match_level="worst"), item("Bottom", match_level="worst")]
+    solver = OutfitSolver()
+    first = solver.solve(1, items, {"weather": "hot", "occasion": "work"})
+    assert all(i.match_level == "best" for _, i in first[0]["items"])
+    again = OutfitSolver().solve(1, items, {"weather": "hot", "occasion": "work"})
+    assert [i.id for _, i in again[0]["items"]] == [i.id for _, i in first[0]["items"]]
+
+
+def test_variants_differ():
+    items = wardrobe() + [item("Top"), item("Bottom"), item("Footwear")]
+    outfits = OutfitSolver().solve(1, items, {"weather": "hot"}, k=3)
+    assert len(outfits) == 3
+    ids = [frozenset(i.id for _, i in o["items"]) for o in outfits]
+    assert len(set(ids)) == 3
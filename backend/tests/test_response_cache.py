@@ -0,0 +1,78 @@
+"""Response cache: hits on both layers, TTL/LRU eviction and key invalidation."""
+import asyncio
+import time
+
+import pytest
+
+from app import models
+from app.services.response_cache import ResponseCache, make_key, normalize_message, wardrobe_version
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=3, memory_entries=1)
+
+
+def item(**overrides):
+    fields = dict(id=1, category="Top", subcategory="shirt", match_level="best", color_primary="#112233")
+    fields.update(overrides)
+    return models.WardrobeItem(**fields)
+
+
+def test_memory_and_sqlite_hits(cache):
+    cache.set("a", "A")
+    cache.set("b", "B")  # evicts "a" from the one-entry memory layer
+    assert cache.get("b") == "B"
+    assert cache.get("a") == "A"  # served from SQLite
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(path, 60, 10).set_json("k", {"x": 1})
+    assert ResponseCache(path, 60, 10).get_json("k") == {"x": 1}
+
+
+def test_expired_entries_miss(cache, monkeypatch):
+    cache.set("a", "A")
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_used(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        clock[0] += 1
+    cache.get("a")  # "b" is now the least recently used
+    clock[0] += 1
+    cache.set("d", "d")
+    assert cache.stats()["entries"] == 3
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+
+
+def test_async_api(cache):
+    async def run():
+        await cache.aset_json("k", {"x": 1})
+        return await cache.aget_json("k"), await cache.aget("missing")
+
+    assert asyncio.run(run()) == ({"x": 1}, None)
+
+
+def test_key_normalizes_message():
+    assert normalize_message("  What should I WEAR today?! ") == "what should i wear today"
+    assert make_key("chat", normalize_message("Hi there!")) == make_key("chat", normalize_message("hi  there"))
+    assert make_key("chat", "hi") != make_key("outfit", "hi")
+
+
+def test_wardrobe_changes_invalidate_key():
+    before = wardrobe_version([item(), item(id=2, category="Bottom")])
+    assert wardrobe_version([item(id=2, category="Bottom"), item()]) == before  # order-independent
+    assert wardrobe_version([item(match_level="worst"), item(id=2, category="Bottom")]) != before
+    assert wardrobe_version([item()]) != before
@@ -0,0 +1,56 @@
+"""Content-addressed, sharded upload layout of the local storage backend."""
+import asyncio
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.storage import LocalStorage, is_sharded, shard_path
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # keys are relative to the backend dir, like in the app
+    return LocalStorage("uploads")
+
+
+def save(storage, data: bytes, kind="wardrobe"):
+    return asyncio.run(storage.save(UploadFile(io.BytesIO(data), size=len(data), filename="x.jpg"), kind))
+
+
+def test_shard_path_layout():
+    digest = "abcdef" + "0" * 58
+    assert shard_path("uploads", "wardrobe", digest, ".jpg") == f"uploads/wardrobe/ab/cd/{digest}.jpg"
+    assert is_sharded(f"uploads/wardrobe/ab/cd/{digest}.jpg")
+    assert is_sharded(f"uploads\\analysis\\ab\\cd\\analysis_{digest}.png")
+    assert not is_sharded("uploads/wardrobe/3f2a9c1e-photo.jpg")
+    assert not is_sharded(f"static/wardrobe/ab/cd/{digest}.jpg")
+
+
+def test_saves_under_digest_shard(storage):
+    saved = save(storage, JPEG)
+    digest = hashlib.sha256(JPEG).hexdigest()
+    assert saved["path"] == f"uploads/wardrobe/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    assert saved["local_path"] == saved["path"]
+    assert is_sharded(saved["path"])
+    assert os.listdir("uploads/tmp") == []
+
+
+def test_analysis_photos_get_their_prefix(storage):
+    saved = save(storage, JPEG, kind="analysis")
+    assert os.path.basename(saved["path"]).startswith("analysis_")
+    assert saved["path"].startswith("uploads/analysis/")
+
+
+def test_duplicate_upload_shares_the_file_and_refreshes_mtime(storage):
+    first = save(storage, JPEG)["path"]
+    os.utime(first, (0, 0))
+    second = save(storage, JPEG)["path"]
+    assert second == first
+    assert time.time() - os.stat(first).st_mtime < 60
+    assert sum(len(files) for _, _, files in os.walk("uploads")) == 1
@@ -0,0 +1,118 @@
+"""Upload GC: deferred deletes, the grace period and orphan sweeps."""
+import os
+import time
+
+import pytest
+
+from app import models
+from app.config import settings
+from app.services.upload_gc import UploadGC
+
+OLD = 0  # mtime far outside any grace period or TTL
+
+
+@pytest.fixture
+def gc(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return UploadGC("uploads")
+
+
+def write(path: str, size: int = 10, mtime: float | None = OLD) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def reference(db, user, path: str):
+    db.add(models.WardrobeItem(user_id=user.id, file_path=path, category="Top"))
+    db.commit()
+
+
+def test_drain_deletes_unreferenced_files(gc):
+    path = write("uploads/wardrobe/ab/cd/gone.jpg", size=42)
+    gc.schedule_delete(path)
+    report = gc.drain()
+    assert not os.path.exists(path)
+    assert report["deleted"] == 1
+    assert report["reclaimed_bytes"] == 42
+    assert len(gc._pending) == 0
+
+
+def test_drain_keeps_referenced_files(gc, db, user):
+    path = write("uploads/wardrobe/ab/cd/shared.jpg")
+    reference(db, user, path.replace("/", "\\"))  # either separator counts
+    gc.schedule_delete(path)
+    assert gc.drain()["deleted"] == 0
+    assert os.path.exists(path)
+    assert len(gc._pending) == 0
+
+
+def test_recent_files_wait_for_the_grace_period(gc):
+    path = write("uploads/wardrobe/ab/cd/fresh.jpg", mtime=None)
+    gc.schedule_delete(path)
+    assert gc.drain()["deleted"] == 0
+    assert os.path.exists(path)
+    (_, _, not_before), = gc._pending
+    assert not_before > time.time() + settings.UPLOAD_GC_GRACE_SECONDS - 60
+
+    gc.drain()  # not due yet: left alone
+    assert os.path.exists(path)
+    assert len(gc._pending) == 1
+
+
+def test_dry_run_drain_keeps_the_queue(gc):
+    path = write("uploads/wardrobe/ab/cd/gone.jpg")
+    gc.schedule_delete(path)
+    assert gc.drain(dry_run=True)["deleted"] == 1
+    assert os.path.exists(path)
+    assert len(gc._pending) == 1
+    gc.drain()
+    assert not os.path.exists(path)
+
+
+def test_remote_remove_callback(gc):
+    removed = []
+
+    def remove(key):
+        removed.append(key)
+        return None if len(removed) == 1 else 99  # first call: object too recent
+
+    gc.schedule_delete("uploads/wardrobe/ab/cd/remote.jpg", remove)
+    assert gc.drain()["deleted"] == 0
+    assert len(gc._pending) == 1
+
+    gc._pending[0] = gc._pending[0][:2] + (0.0,)  # grace period over
+    report = gc.drain()
+    assert report["deleted"] == 1
+    assert report["reclaimed_bytes"] == 99
+    assert removed == ["uploads/wardrobe/ab/cd/remote.jpg"] * 2
+
+
+def test_collect_sweeps_orphans(gc, db, user):
+    kept = write("uploads/wardrobe/aa/bb/kept.jpg")
+    reference(db, user, kept)
+    orphan = write("uploads/wardrobe/aa/bb/orphan.jpg", size=5)
+    fresh_orphan = write("uploads/wardrobe/aa/bb/fresh.jpg", mtime=None)
+    stale_part = write("uploads/tmp/upload.jpg.part")
+    live_part = write("uploads/tmp/other.jpg.part", mtime=None)
+    old_selfie = write("uploads/analysis/aa/bb/analysis_old.jpg")
+    recent_selfie = write("uploads/analysis/aa/bb/analysis_new.jpg", mtime=time.time() - 3600)
+
+    report = gc.collect()
+    assert report["scanned"] == 7
+    assert report["by_kind"] == {"deferred": 0, "partial": 1, "analysis": 1, "orphan": 1}
+    for path in (kept, fresh_orphan, live_part, recent_selfie):
+        assert os.path.exists(path), path
+    for path in (orphan, stale_part, old_selfie):
+        assert not os.path.exists(path), path
+
+
+def test_collect_dry_run_deletes_nothing(gc):
+    orphan = write("uploads/wardrobe/aa/bb/orphan.jpg")
+    report = gc.collect(dry_run=True)
+    assert report["dry_run"] is True
+    assert report["by_kind"]["orphan"] == 1
+    assert os.path.exists(orphan)
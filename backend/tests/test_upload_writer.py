@@ -0,0 +1,77 @@
+"""Streaming upload writer: type sniffing, size limits and partial files."""
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.config import settings
+from app.services.upload_writer import CHUNK_SIZE, UploadRejected, save_upload, sniff_image_type
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+WEBP = b"RIFF\x00\x00\x00\x00WEBPVP8 " + b"\x00" * 64
+
+
+def upload(data: bytes, filename="photo.jpg", declared_size=True):
+    return UploadFile(io.BytesIO(data), size=len(data) if declared_size else None, filename=filename)
+
+
+def save(data: bytes, directory, **kwargs):
+    return asyncio.run(save_upload(upload(data, **kwargs), str(directory)))
+
+
+@pytest.mark.parametrize("head, expected", [
+    (JPEG, "image/jpeg"),
+    (PNG, "image/png"),
+    (WEBP, "image/webp"),
+    (b"GIF89a" + b"\x00" * 16, None),
+    (b"<svg xmlns='http://www.w3.org/2000/svg'/>", None),
+    (b"RIFF\x00\x00\x00\x00WAVE", None),
+    (b"", None),
+])
+def test_sniff_image_type(head, expected):
+    assert sniff_image_type(head) == expected
+
+
+def test_saves_with_sniffed_extension_and_digest(tmp_path):
+    data = PNG + os.urandom(3 * CHUNK_SIZE)  # spans several chunks
+    saved = save(data, tmp_path, filename="looks-like.jpg")
+    assert saved["mime_type"] == "image/png"
+    assert saved["path"].endswith(".png")
+    assert saved["size"] == len(data)
+    assert saved["sha256"] == hashlib.sha256(data).hexdigest()
+    with open(saved["path"], "rb") as f:
+        assert f.read() == data
+    assert os.listdir(tmp_path) == [os.path.basename(saved["path"])]
+
+
+def test_rejects_non_images(tmp_path):
+    with pytest.raises(UploadRejected) as e:
+        save(b"%PDF-1.7 not an image", tmp_path, filename="photo.jpg")
+    assert e.value.status_code == 415
+    assert os.listdir(tmp_path) == []
+
+
+def test_rejects_declared_size_over_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1024)
+    with pytest.raises(UploadRejected) as e:
+        save(JPEG + b"\x00" * 2048, tmp_path)
+    assert e.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_rejects_streamed_size_over_limit_and_removes_part(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", CHUNK_SIZE + 10)
+    with pytest.raises(UploadRejected) as e:
+        save(JPEG + b"\x00" * (2 * CHUNK_SIZE), tmp_path, declared_size=False)
+    assert e.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_accepts_exactly_the_limit(tmp_path, monkeypatch):
+    data = JPEG + b"\x00" * 1000
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", len(data))
+    assert save(data, tmp_path)["size"] == len(data)
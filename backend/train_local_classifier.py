@@ -0,0 +1,114 @@
+"""
+Trains the local CPU category classifier from already tagged wardrobe items.
+Labels come from Gemini or the user; items tagged by heuristics or by the
+local model itself are skipped so the model never trains on its own guesses.
+
+Usage: python train_local_classifier.py [--out data/local_classifier.json] [--min-per-class 5]
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import WardrobeItem
+from app.services.local_classifier import FEATURE_VERSION, extract_features
+
+ALLOWED_CATEGORIES = {"Top", "Bottom", "OnePiece", "Outerwear", "Footwear", "Accessory"}
+TRUSTED_SOURCES = {"ai_semantic", "user_input"}
+
+
+def _label_source(item: WardrobeItem):
+    try:
+        return (json.loads(item.ai_metadata or "{}").get("decision") or {}).get("source")
+    except (ValueError, AttributeError):
+        return None
+
+
+def load_dataset():
+    db = SessionLocal()
+    try:
+        items = (
+            db.query(WardrobeItem.id, WardrobeItem.file_path, WardrobeItem.category, WardrobeItem.ai_metadata)
+            .filter(WardrobeItem.category.in_(ALLOWED_CATEGORIES))
+            .all()
+        )
+    finally:
+        db.close()
+
+    X, y = [], []
+    for item in items:
+        if _label_source(item) not in TRUSTED_SOURCES or not os.path.exists(item.file_path):
+            continue
+        features = extract_features(item.file_path)
+        if features is not None:
+            X.append(features)
+            y.append(item.category)
+    return np.array(X), np.array(y)
+
+
+def train(out_path: str, min_per_class: int):
+    started = time.perf_counter()
+    X, y = load_dataset()
+    print(f"Loaded {len(y)} labeled images in {time.perf_counter() - started:.1f}s")
+
+    counts = Counter(y)
+    keep = np.array([counts[label] >= min_per_class for label in y], dtype=bool)
+    X, y = X[keep], y[keep]
+    classes = sorted(set(y))
+    print("Per class:", {str(c): counts[c] for c in classes})
+    if len(classes) < 2:
+        print(f"✗ Need at least 2 categories with {min_per_class}+ images")
+        return
+
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Xs = (X - mean) / scale
+
+    # Hold-out accuracy first, then refit on everything
+    if len(y) >= 5 * len(classes):
+        X_tr, X_te, y_tr, y_te = train_test_split(Xs, y, test_size=0.2, stratify=y, random_state=0)
+        probe = LogisticRegression(max_iter=2000, C=0.5, class_weight="balanced").fit(X_tr, y_tr)
+        confident = probe.predict_proba(X_te).max(axis=1) >= settings.LOCAL_CLASSIFIER_THRESHOLD
+        accuracy = (probe.predict(X_te) == y_te).mean()
+        confident_accuracy = (probe.predict(X_te)[confident] == y_te[confident]).mean() if confident.any() else 0.0
+        print(
+            f"Hold-out accuracy {accuracy:.1%}; "
+            f"{confident.mean():.1%} above threshold {settings.LOCAL_CLASSIFIER_THRESHOLD} "
+            f"at {confident_accuracy:.1%} accuracy"
+        )
+
+    model = LogisticRegression(max_iter=2000, C=0.5, class_weight="balanced").fit(Xs, y)
+    coef, intercept = model.coef_, model.intercept_
+    if len(model.classes_) == 2:
+        # Binary models expose one row; expand to a softmax over both classes
+        coef = np.vstack([-coef[0] / 2, coef[0] / 2])
+        intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump({
+            "feature_version": FEATURE_VERSION,
+            "classes": [str(c) for c in model.classes_],
+            "mean": mean.tolist(),
+            "scale": scale.tolist(),
+            "coef": coef.tolist(),
+            "intercept": intercept.tolist(),
+            "samples": int(len(y)),
+        }, f)
+    print(f"✅ Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=settings.LOCAL_CLASSIFIER_PATH)
+    parser.add_argument("--min-per-class", type=int, default=5)
+    args = parser.parse_args()
+    train(args.out, args.min_per_class)
@@ -6,31 +6,72 @@ def upgrade_database():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    # List of new columns to add
-    new_columns = [
-        ("subcategory", "TEXT"),
-        ("type", "TEXT"),
-        ("color_primary", "TEXT"),
-        ("color_secondary", "TEXT"),
-        ("fabric", "TEXT"),
-        ("fit", "TEXT"),
-        ("seasonality", "TEXT"),
-        ("occasion_tags", "TEXT"),
-        ("style_tags", "TEXT"),
-        ("ai_metadata", "TEXT")
-    ]
+    # List of new columns to add, per table
+    new_columns = {
+        "wardrobe_items": [
+            ("subcategory", "TEXT"),
+            ("type", "TEXT"),
+            ("color_primary", "TEXT"),
+            ("color_secondary", "TEXT"),
+            ("fabric", "TEXT"),
+            ("fit", "TEXT"),
+            ("seasonality", "TEXT"),
+            ("occasion_tags", "TEXT"),
+            ("style_tags", "TEXT"),
+            ("ai_metadata", "TEXT"),
+            ("response_json", "TEXT")
+        ],
+        "conversations": [
+            ("summary", "TEXT"),
+            ("summarized_upto_id", "INTEGER DEFAULT 0")
+        ]
+    }
     
     print(f"📦 Upgrading database: {DB_PATH}")
     
-    for col_name, col_type in new_columns:
-        try:
-            cursor.execute(f"ALTER TABLE wardrobe_items ADD COLUMN {col_name} {col_type}")
-            print(f"   ✅ Added column: {col_name}")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" in str(e):
-                print(f"   ⚠️ Column already exists: {col_name}")
-            else:
-                print(f"   ❌ Error adding {col_name}: {e}")
+    for table, columns in new_columns.items():
+        for col_name, col_type in columns:
+            try:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+                print(f"   ✅ Added column: {table}.{col_name}")
+            except sqlite3.OperationalError as e:
+                if "duplicate column name" in str(e):
+                    print(f"   ⚠️ Column already exists: {table}.{col_name}")
+                else:
+                    print(f"   ❌ Error adding {table}.{col_name}: {e}")
+
+    # New tables (same DDL as models.py; create_all also makes them on startup)
+    new_tables = {
+        "style_analysis_snapshots": """
+            CREATE TABLE IF NOT EXISTS style_analysis_snapshots (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER REFERENCES users(id),
+                version INTEGER,
+                format_version INTEGER,
+                result TEXT,
+                response_json TEXT,
+                created_at DATETIME
+            )""",
+        "resource_versions": """
+            CREATE TABLE IF NOT EXISTS resource_versions (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER REFERENCES users(id),
+                resource VARCHAR,
+                version INTEGER,
+                CONSTRAINT uq_resource_versions_user_resource UNIQUE (user_id, resource)
+            )""",
+    }
+    new_indexes = [
+        "CREATE INDEX IF NOT EXISTS ix_style_analysis_snapshots_id ON style_analysis_snapshots (id)",
+        "CREATE INDEX IF NOT EXISTS ix_style_analysis_snapshots_user_version ON style_analysis_snapshots (user_id, version)",
+        "CREATE INDEX IF NOT EXISTS ix_resource_versions_id ON resource_versions (id)",
+    ]
+    for table, ddl in new_tables.items():
+        cursor.execute(ddl)
+        print(f"   ✅ Table ready: {table}")
+    for ddl in new_indexes:
+        cursor.execute(ddl)
+    # Existing analyses are snapshotted from the legacy columns on first read
 
     # Optional: Migrate data from color_hex to color_primary if needed
     try:
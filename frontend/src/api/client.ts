@@ -12,6 +12,10 @@ api.interceptors.request.use((config) => {
     return config;
 });
 
+// Stored images: absolute (presigned/CDN) URLs from object storage, or paths under the API host
+export const mediaUrl = (url: string) =>
+    /^https?:\/\//.test(url) ? url : `${api.defaults.baseURL}/${url}`;
+
 export const analyzePhoto = async (file: File) => {
     const formData = new FormData();
     formData.append('file', file);
@@ -22,4 +26,58 @@ export const analyzePhoto = async (file: File) => {
     });
 };
 
+export interface ChatStreamHandlers {
+    onMeta?: (conversationId: number) => void;
+    onToken: (content: string) => void;
+}
+
+// Streams /stylist/chat/stream (Server-Sent Events) and resolves with the full response.
+// axios cannot read a streaming body in the browser, so this uses fetch.
+export const streamChat = async (
+    message: string,
+    conversationId: number | null,
+    handlers: ChatStreamHandlers,
+) => {
+    const token = localStorage.getItem('token');
+    const res = await fetch(`${api.defaults.baseURL}/stylist/chat/stream`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            ...(token ? { Authorization: `Bearer ${token}` } : {}),
+        },
+        body: JSON.stringify({ message, conversation_id: conversationId }),
+    });
+    if (!res.ok || !res.body) {
+        throw new Error(`Chat stream failed: ${res.status}`);
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = { response: '', conversation_id: conversationId };
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            const event = raw.match(/^event: (.*)$/m)?.[1];
+            const data = raw.match(/^data: (.*)$/m)?.[1];
+            if (!event || !data) continue;
+
+            const payload = JSON.parse(data);
+            if (event === 'meta') handlers.onMeta?.(payload.conversation_id);
+            if (event === 'token') handlers.onToken(payload.content);
+            if (event === 'done') result = payload;
+        }
+    }
+    return result;
+};
+
 export default api;
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import api from '../api/client';
+import { streamChat } from '../api/client';
 import { Send, Bot } from 'lucide-react';
 
 interface Message {
@@ -30,13 +30,22 @@ export default function Chat() {
         setIsLoading(true);
 
         try {
-            const res = await api.post('/stylist/chat', {
-                message: userMsg,
-                conversation_id: conversationId
+            let started = false;
+            await streamChat(userMsg, conversationId, {
+                onMeta: (id) => setConversationId(id),
+                onToken: (content) => {
+                    // First token starts a live assistant message
+                    if (!started) {
+                        started = true;
+                        setMessages(prev => [...prev, { role: 'assistant', content }]);
+                        return;
+                    }
+                    setMessages(prev => {
+                        const last = prev[prev.length - 1];
+                        return [...prev.slice(0, -1), { ...last, content: last.content + content }];
+                    });
+                },
             });
-
-            setConversationId(res.data.conversation_id);
-            setMessages(prev => [...prev, { role: 'assistant', content: res.data.response }]);
         } catch (err) {
             setMessages(prev => [...prev, { role: 'system', content: "Error connecting to stylist." }]);
         } finally {
@@ -86,7 +95,7 @@ export default function Chat() {
                         </div>
                     </div>
                 ))}
-                {isLoading && (
+                {isLoading && messages[messages.length - 1]?.role === 'user' && (
                     <div style={{ alignSelf: 'flex-start', marginLeft: '44px', color: 'var(--text-muted)' }}>
                         Stylist is thinking...
                     </div>
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import api from "../api/client";
+import api, { mediaUrl } from "../api/client";
 import { Sparkles, Loader, ShoppingBag } from "lucide-react";
 
 interface OutfitItem {
@@ -48,7 +48,7 @@ export default function Stylist() {
 
   const getImage = (id: number) => {
     const item = wardrobe.find(i => i.id === id);
-    return item ? `http://localhost:8000/${item.file_path}` : "";
+    return item ? mediaUrl(item.image_url || item.file_path) : "";
   };
 
   return (
@@ -1,11 +1,12 @@
 import React, { useEffect, useState } from "react";
-import api from "../api/client";
+import api, { mediaUrl } from "../api/client";
 import { Plus, Sparkles, Trash2 } from "lucide-react";
 import { useNavigate } from "react-router-dom";
 
 interface WardrobeItem {
     id: number;
     file_path: string;
+    image_url?: string;
     category: string;
     subcategory?: string;
     seasonality?: string[];
@@ -206,7 +207,7 @@ export default function Wardrobe() {
                             }}
                         >
                             <img
-                                src={`http://127.0.0.1:8000/${item.file_path}`}
+                                src={mediaUrl(item.image_url || item.file_path)}
                                 alt={item.category}
                                 style={{
                                     width: "100%",